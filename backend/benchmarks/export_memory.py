@@ -0,0 +1,90 @@
+"""Peak memory of the applications export per format and row count.
+
+Run from the backend directory:
+
+    python benchmarks/export_memory.py 10000 50000 100000 200000
+
+Rows come from an in-process stand-in for the Motor cursor, so the numbers
+reflect the export pipeline only. Flat peaks across row counts mean memory
+does not grow with the dataset.
+"""
+import asyncio
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.application_service import ApplicationService, EXPORT_FORMATS  # noqa: E402
+
+DESCRIPTION = "Build and operate backend services in Python. " * 20
+
+
+class _Cursor:
+    def __init__(self, rows: int):
+        self.rows = rows
+        self.index = 0
+        self.started = datetime(2025, 1, 1)
+
+    def sort(self, *args, **kwargs):
+        return self
+
+    def batch_size(self, *args, **kwargs):
+        return self
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.index >= self.rows:
+            raise StopAsyncIteration
+        self.index += 1
+        if self.index % 1000 == 0:
+            await asyncio.sleep(0)
+        return {"_id": self.index, "company_name": f"Company {self.index}", "position_title": "Backend Engineer",
+                "status": "applied", "application_date": self.started + timedelta(minutes=self.index),
+                "interview_date": None, "job_description": DESCRIPTION}
+
+
+class _Collection:
+    def __init__(self, rows: int):
+        self.rows = rows
+
+    def find(self, query, projection=None):
+        return _Cursor(self.rows)
+
+
+class _Database:
+    def __init__(self, rows: int):
+        self.applications = _Collection(rows)
+
+
+async def measure(export_format: str, rows: int):
+    tracemalloc.start()
+    started = time.perf_counter()
+    response = await ApplicationService().export_applications(_Database(rows), export_format=export_format)
+    first_byte = None
+    total_bytes = 0
+    async for chunk in response.body_iterator:
+        if first_byte is None:
+            first_byte = time.perf_counter() - started
+        total_bytes += len(chunk)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak, first_byte, elapsed, total_bytes
+
+
+async def main(row_counts):
+    print(f"{'format':<8}{'rows':>10}{'peak MiB':>12}{'first byte s':>14}{'total s':>10}{'output MiB':>12}")
+    for export_format in EXPORT_FORMATS:
+        for rows in row_counts:
+            peak, first_byte, elapsed, total_bytes = await measure(export_format, rows)
+            print(f"{export_format:<8}{rows:>10}{peak / 2 ** 20:>12.2f}{first_byte:>14.3f}{elapsed:>10.2f}"
+                  f"{total_bytes / 2 ** 20:>12.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main([int(arg) for arg in sys.argv[1:]] or [10_000, 50_000, 100_000]))
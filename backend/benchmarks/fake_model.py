@@ -0,0 +1,98 @@
+import asyncio
+import json
+import os
+import random
+from typing import List, Optional
+
+FAKE_ANALYSIS = {"optimization": {"missing_keywords": ["kubernetes"], "skill_gaps": ["Container orchestration"],
+                                  "suggestions": ["Quantify the impact of your backend work."],
+                                  "match_percentage": 72.5},
+                 "ats": {"score": 74, "feedback": ["Clear structure and relevant experience."],
+                         "keyword_matches": {"exact": ["python"], "partial": ["rest apis"]}, "formatting_issues": [],
+                         "recommendations": ["Add a skills section near the top."]}}
+
+FAKE_COVER_LETTER = ("Dear Hiring Manager,\n\nI am excited to apply for this role. My experience building reliable "
+                     "backend services maps closely to what your team needs.\n\nThank you for your time and "
+                     "consideration.\n\nSincerely,\nAlex Morgan")
+
+
+class FakeModelError(Exception):
+    def __init__(self, code: int, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.code = code
+        self.retry_after = retry_after
+
+
+class _Part:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class _Content:
+    def __init__(self, text: str):
+        self.parts = [_Part(text)]
+
+
+class _Candidate:
+    def __init__(self, text: str):
+        self.content = _Content(text)
+
+
+class _UsageMetadata:
+    def __init__(self, prompt: str, text: str):
+        self.prompt_token_count = len(prompt) // 4
+        self.candidates_token_count = len(text) // 4
+        self.total_token_count = self.prompt_token_count + self.candidates_token_count
+
+
+class FakeResponse:
+    def __init__(self, text: str, prompt: str = ""):
+        self.text = text
+        self.candidates = [_Candidate(text)]
+        self.usage_metadata = _UsageMetadata(prompt, text)
+
+
+class FakeGenerativeModel:
+    def __init__(self, latency: Optional[float] = None, jitter: Optional[float] = None,
+                 error_rate: Optional[float] = None, throttle_rate: Optional[float] = None,
+                 chunk_delay: Optional[float] = None):
+        self.latency = latency if latency is not None else float(os.getenv("FAKE_MODEL_LATENCY_MS", "200")) / 1000
+        self.jitter = jitter if jitter is not None else float(os.getenv("FAKE_MODEL_JITTER_MS", "50")) / 1000
+        self.error_rate = error_rate if error_rate is not None else float(os.getenv("FAKE_MODEL_ERROR_RATE", "0"))
+        self.throttle_rate = throttle_rate if throttle_rate is not None else float(
+            os.getenv("FAKE_MODEL_THROTTLE_RATE", "0"))
+        self.chunk_delay = chunk_delay if chunk_delay is not None else float(
+            os.getenv("FAKE_MODEL_CHUNK_DELAY_MS", "20")) / 1000
+        self.calls = 0
+
+    async def generate_content_async(self, prompt: str, generation_config=None, tool_config=None, stream=False):
+        self.calls += 1
+        await asyncio.sleep(max(0.0, self.latency + random.uniform(-self.jitter, self.jitter)))
+        roll = random.random()
+        if roll < self.throttle_rate:
+            raise FakeModelError(429, "Resource has been exhausted (e.g. check quota).", retry_after=1.0)
+        if roll < self.throttle_rate + self.error_rate:
+            raise FakeModelError(503, "The service is currently unavailable.")
+
+        text = self._respond(prompt)
+        if not stream:
+            return FakeResponse(text, prompt)
+        return self._stream(text, prompt)
+
+    async def _stream(self, text: str, prompt: str):
+        for chunk in self._chunks(text):
+            await asyncio.sleep(self.chunk_delay)
+            yield FakeResponse(chunk, prompt)
+
+    @staticmethod
+    def _chunks(text: str, size: int = 40) -> List[str]:
+        return [text[i:i + size] for i in range(0, len(text), size)]
+
+    @staticmethod
+    def _respond(prompt: str) -> str:
+        if '"results" array' in prompt:
+            count = prompt.count("Job Description #")
+            return json.dumps({"results": [FAKE_ANALYSIS] * count})
+        if "Output ONLY a JSON object" in prompt:
+            return "```json\n" + json.dumps(FAKE_ANALYSIS) + "\n```"
+        return FAKE_COVER_LETTER
@@ -0,0 +1,70 @@
+"""Import time of the API module, with a budget check.
+
+Run from the backend directory:
+
+    python benchmarks/import_time.py --runs 5 --budget-ms 1000
+
+Each run imports main in a fresh interpreter under `python -X importtime`
+with GEMINI_API_KEY unset. The script prints the median cumulative time,
+the slowest top-level imports, and any module in DEFERRED_MODULES that got
+imported. It exits 1 when the median exceeds the budget or a deferred
+module was imported.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFERRED_MODULES = ("google.generativeai", "PyPDF2", "docx", "pandas", "openpyxl", "xlsxwriter")
+
+
+def import_profile(module: str):
+    env = {key: value for key, value in os.environ.items() if key != "GEMINI_API_KEY"}
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], cwd=BACKEND_DIR, env=env,
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise SystemExit(f"import {module} failed:\n{result.stderr[-2000:]}")
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.rstrip(), int(cumulative_us), int(self_us)))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("IMPORT_BUDGET_MS", "1000")))
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    totals, profile = [], []
+    for _ in range(args.runs):
+        profile = import_profile(args.module)
+        totals.append(next(cumulative for name, cumulative, _ in profile if name.strip() == args.module) / 1000)
+    median = statistics.median(totals)
+
+    print(f"import {args.module}: median {median:.0f}ms over {args.runs} runs (min {min(totals):.0f}ms, "
+          f"max {max(totals):.0f}ms, budget {args.budget_ms:.0f}ms)")
+    print("slowest top-level imports:")
+    top_level = [(name.strip(), cumulative) for name, cumulative, _ in profile if name.startswith("   ") and
+                 not name.startswith("    ")]
+    for name, cumulative in sorted(top_level, key=lambda row: -row[1])[:args.top]:
+        print(f"  {cumulative / 1000:8.1f}ms  {name}")
+
+    loaded = {name.strip() for name, _, _ in profile}
+    eager = [module for module in DEFERRED_MODULES if module in loaded]
+    for module in eager:
+        print(f"FAIL  {module} is imported eagerly")
+    if median > args.budget_ms:
+        print(f"FAIL  median import time {median:.0f}ms exceeds the {args.budget_ms:.0f}ms budget")
+    return 1 if eager or median > args.budget_ms else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+"""Estimated prompt tokens before and after input compaction.
+
+Run from the backend directory, optionally with your own inputs:
+
+    python benchmarks/prompt_tokens.py [resume.txt job_description.txt]
+
+Without arguments a built-in resume and job posting are used. "raw" builds
+each prompt from the inputs as stored; "compacted" runs them through
+PromptCompactor first, exactly as AIService does.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.ai_service import AIService  # noqa: E402
+from services.ats_scorer import ATSScorer  # noqa: E402
+from services.prompt_compactor import PromptCompactor, estimate_tokens  # noqa: E402
+
+EXPERIENCE = "\n".join(
+    f"- Built and operated {area} services in Python and Go, cutting p95 latency by {10 + i}% for {i + 2}M users."
+    for i, area in enumerate(["payments", "search", "billing", "notifications", "identity", "reporting"] * 4))
+
+SAMPLE_RESUME = f"""JANE DOE
+jane.doe@example.com | +1 555 0100 | github.com/janedoe
+
+SUMMARY
+Backend engineer with eight years of experience building distributed systems.
+
+SKILLS
+Python, Go, PostgreSQL, MongoDB, Kafka, Kubernetes, AWS, Terraform, FastAPI, gRPC
+
+EXPERIENCE
+SENIOR BACKEND ENGINEER, ACME CORP (2019 - PRESENT)
+{EXPERIENCE}
+BACKEND ENGINEER, INITECH (2016 - 2019)
+{EXPERIENCE}
+
+PROJECTS
+- Open-source rate limiter for asyncio services with 2k GitHub stars.
+- Open-source rate limiter for asyncio services with 2k GitHub stars.
+
+EDUCATION
+B.Sc. Computer Science, State University, 2016
+
+VOLUNTEER
+- Mentor at a local coding bootcamp, teaching Python fundamentals to career changers every weekend.
+
+INTERESTS
+Trail running, chess, landscape photography, cooking, travel, science fiction novels.
+
+REFERENCES
+References available upon request.
+"""
+
+SAMPLE_JOB = """About Us
+We are a fast-growing fintech company on a mission to make payments simple for everyone. Our culture values
+ownership, curiosity and kindness. We have offices in three countries and a remote-first team of 400 people.
+We were named one of the best places to work three years in a row.
+
+The Role
+You will design, build and operate the backend services that move money for millions of customers.
+You will work closely with product, data and infrastructure teams.
+
+Requirements:
+- 5+ years of experience building backend services in Python or Go.
+- Strong knowledge of PostgreSQL and event streaming with Kafka.
+- Experience running services on Kubernetes in AWS.
+- 5+ years of experience building backend services in Python or Go.
+
+Nice to have:
+- Experience with payments, ledgers or PCI compliance.
+
+Benefits:
+- Competitive salary and equity.
+- 401(k) matching, medical, dental and vision insurance.
+- Unlimited paid time off and 16 weeks of parental leave.
+- Home office and wellness stipend.
+
+We are an equal opportunity employer and value diversity. All qualified applicants will receive consideration for
+employment without regard to race, color, religion, sex, sexual orientation, gender identity, national origin,
+disability or protected veteran status. If you need a reasonable accommodation during the application process,
+please contact us. Apply today!
+"""
+
+
+def row(label: str, raw: str, compacted: str):
+    before, after = estimate_tokens(raw), estimate_tokens(compacted)
+    print(f"{label:<28}{before:>8}{after:>12}{(1 - after / before) * 100 if before else 0:>9.1f}%")
+
+
+def main():
+    if len(sys.argv) == 3:
+        resume, job = (open(path, encoding="utf-8").read() for path in sys.argv[1:])
+    else:
+        resume, job = SAMPLE_RESUME, SAMPLE_JOB
+    compactor = PromptCompactor()
+    compact_resume, compact_job = compactor.resume(resume), compactor.job_description(job)
+    report = ATSScorer().score(resume, job)
+
+    print(f"{'tokens (estimated)':<28}{'raw':>8}{'compacted':>12}{'saved':>10}")
+    row("resume", resume, compact_resume)
+    row("job description", job, compact_job)
+    row("analysis prompt", AIService._build_analysis_prompt(resume, job),
+        AIService._build_analysis_prompt(compact_resume, compact_job))
+    row("hybrid analysis prompt", AIService._build_hybrid_analysis_prompt(resume, job, report),
+        AIService._build_hybrid_analysis_prompt(compact_resume, compact_job, report))
+    row("packed prompt (3 jobs)", AIService._build_packed_analysis_prompt(resume, [job] * 3),
+        AIService._build_packed_analysis_prompt(compact_resume, [compact_job] * 3))
+    row("cover letter prompt", AIService._build_cover_letter_prompt(job, "Acme", "Engineer", resume, "formal"),
+        AIService._build_cover_letter_prompt(compact_job, "Acme", "Engineer", compact_resume, "formal"))
+    if "-v" in os.environ.get("PROMPT_TOKENS_FLAGS", ""):
+        print("\n--- compacted resume ---\n" + compact_resume + "\n\n--- compacted job description ---\n" + compact_job)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Per-document cost of serializing list responses.
+
+Run from the backend directory:
+
+    python benchmarks/serialization.py 50 200 1000
+
+Times three ways of turning Motor documents into a JSON response body:
+
+- response_model: the previous path. Each document is built into a model,
+  then FastAPI validates the list again against response_model and encodes
+  it with JSONResponse.
+- validated: DocumentSerializer with TRUSTED_READS off. The list is
+  validated once and dumped by pydantic-core.
+- trusted: DocumentSerializer with TRUSTED_READS on. Projected documents
+  are shaped to the model's fields and encoded directly.
+"""
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+from bson import ObjectId
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_model_field  # noqa: E402
+
+from models import ApplicationSummary  # noqa: E402
+from services.serialization import DocumentSerializer, orjson  # noqa: E402
+
+
+def documents(count: int) -> List[dict]:
+    now = datetime.utcnow()
+    return [{"_id": str(ObjectId()), "company_name": f"Company {i}", "position_title": "Backend Engineer",
+             "application_url": f"https://jobs.example.com/{i}", "status": "applied", "location": "Remote",
+             "salary_range": "$120k-$150k", "application_date": now - timedelta(days=i % 90),
+             "created_at": now - timedelta(minutes=i), "updated_at": now} for i in range(count)]
+
+
+async def response_model_path(docs: List[dict], field) -> bytes:
+    content = await serialize_response(field=field, response_content=[ApplicationSummary(**doc) for doc in docs])
+    return JSONResponse(content).body
+
+
+async def measure(fn, docs: List[dict], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(docs)
+        if asyncio.iscoroutine(result):
+            await result
+        best = min(best, time.perf_counter() - started)
+    return best / len(docs) * 1e6
+
+
+async def main(counts: List[int]):
+    field = create_model_field(name="Response", type_=List[ApplicationSummary], mode="serialization")
+    validated = DocumentSerializer(ApplicationSummary, trusted=False)
+    trusted = DocumentSerializer(ApplicationSummary, trusted=True)
+    paths = {"response_model": lambda docs: response_model_path(docs, field), "validated": validated.dump_many,
+             "trusted": trusted.dump_many}
+    print(f"encoder: {'orjson' if orjson is not None else 'json'}")
+    print(f"{'docs':>6}" + "".join(f"{name + ' µs/doc':>24}" for name in paths) + f"{'speedup':>10}")
+    for count in counts:
+        docs = documents(count)
+        repeat = max(5, 20_000 // count)
+        costs = [await measure(fn, docs, repeat) for fn in paths.values()]
+        print(f"{count:>6}" + "".join(f"{cost:>24.2f}" for cost in costs) + f"{costs[0] / costs[-1]:>9.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main([int(arg) for arg in sys.argv[1:]] or [50, 200, 1000]))
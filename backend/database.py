@@ -1,5 +1,33 @@
+import logging
+from typing import Dict, List
+
 from fastapi import Request
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel
+
+logger = logging.getLogger(__name__)
+
+INDEXES: Dict[str, List[IndexModel]] = {
+    "resumes": [IndexModel([("content_hash", ASCENDING)], unique=True,
+                           partialFilterExpression={"content_hash": {"$exists": True}}),
+                IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)]),
+                IndexModel([("content", TEXT), ("filename", TEXT)], name="resumes_text",
+                           weights={"filename": 3, "content": 1}, language_override="text_language")],
+    "applications": [IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)]),
+                     IndexModel([("status", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)]),
+                     IndexModel([("company_name", ASCENDING), ("position_title", ASCENDING),
+                                 ("application_date", ASCENDING)]),
+                     IndexModel([("company_name", TEXT), ("position_title", TEXT), ("job_description", TEXT),
+                                 ("notes", TEXT)], name="applications_text",
+                                weights={"position_title": 10, "company_name": 5, "job_description": 2, "notes": 1},
+                                language_override="text_language")],
+    "analysis_cache": [IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0)],
+    "jobs": [IndexModel([("status", ASCENDING), ("priority", DESCENDING), ("run_after", ASCENDING),
+                         ("_id", ASCENDING)]),
+             IndexModel([("status", ASCENDING), ("lease_until", ASCENDING)]),
+             IndexModel([("status", ASCENDING), ("tenant", ASCENDING)]),
+             IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0)],
+}
 
 
 def get_database(request: Request) -> AsyncIOMotorDatabase:
@@ -7,9 +35,13 @@ def get_database(request: Request) -> AsyncIOMotorDatabase:
 
 
 async def create_indexes(db: AsyncIOMotorDatabase):
-    await db.resumes.create_index([("user_id", 1), ("created_at", -1)])
-    await db.applications.create_index([("user_id", 1), ("created_at", -1)])
-    await db.applications.create_index([("user_id", 1), ("status", 1)])
-    await db.applications.create_index([("user_id", 1), ("company_name", 1)])
-    await db.cover_letters.create_index([("user_id", 1), ("created_at", -1)])
-    await db.users.create_index([("email", 1)], unique=True)
+    for collection, indexes in INDEXES.items():
+        names = await db[collection].create_indexes(indexes)
+        logger.info("Ensured indexes on %s: %s", collection, ", ".join(names))
+
+
+async def create_indexes_in_background(db: AsyncIOMotorDatabase):
+    try:
+        await create_indexes(db)
+    except Exception:
+        logger.exception("Background index build failed")
@@ -1,45 +1,120 @@
+import asyncio
+import json
 import os
-from datetime import datetime
+from contextlib import aclosing, asynccontextmanager
+from datetime import date, datetime, time, timedelta
+from functools import partial
 from typing import List, Optional
 
 from bson import ObjectId
 from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException, UploadFile, File, Depends
+from fastapi import FastAPI, HTTPException, UploadFile, File, Depends, Request, Query, Header
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError, ExecutionTimeout, OperationFailure
 
-from database import get_database
+from database import get_database, create_indexes, create_indexes_in_background
 from models import (ResumeResponse, AnalyzeResumeResponse, OptimizationRequest, CoverLetterResponse, CoverLetterRequest,
-                    ApplicationResponse, ApplicationRequest, ApplicationUpdateRequest, DashboardResponse, )
+                    ApplicationResponse, ApplicationRequest, ApplicationUpdateRequest, DashboardResponse,
+                    BatchAnalyzeRequest, RankResumesRequest, ResumeSummary, ApplicationSummary, ImportSummary,
+                    AnalysisJobRequest, CoverLetterJobRequest, JobResponse, ResumeSimilarityRequest,
+                    ApplicationSimilarityRequest, SimilarityMatch, SimilarityRankResponse, SimilarityRankRequest,
+                    SearchResponse, )
 from services.ai_service import AIService
-from services.application_service import ApplicationService
-from services.resume_service import ResumeService
+from services.analysis_cache import AnalysisCache
+from services.application_import import (ApplicationImporter, ImportFileError, ImportFormatError,
+                                         detect_import_format, )
+from services.application_service import (ApplicationService, APPLICATION_SUMMARY_PROJECTION, EXPORT_COLUMNS,
+                                          EXPORT_FORMATS, status_filter, )
+from services.batch_service import BatchAnalysisService, BatchItem
+from services.job_queue import JobQueue, JobWorkerPool, TERMINAL_STATUSES
+from services.llm_client import LLMUnavailableError, LLMTimeoutError
+from services.metrics import (REGISTRY, MetricsMiddleware, MongoCommandMetrics, MongoPoolMetrics, TimedRoute, span, )
+from services.pagination import fetch_page
+from services.response_cache import CollectionVersions, ResponseCache
+from services.serialization import DocumentSerializer
+from services.search_service import SearchService, SearchQueryError
+from services.semantic_index import (SemanticIndex, VECTOR_FIELD, WITHOUT_VECTOR, APPLICATION_TEXT_FIELDS,
+                                     application_text, )
+from services.resume_service import (ResumeService, ResumeParseError, ResumeTooLargeError, ParserOverloadedError,
+                                     ParserUnavailableError, ParseTimeoutError, RESUME_SUMMARY_PROJECTION, )
 
 load_dotenv()
 
-app = FastAPI(title="AuraHire API", version="1.0.0")
+PAGE_SIZE = int(os.getenv("PAGE_SIZE", "50"))
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", "200"))
 
-app.add_middleware(CORSMiddleware, allow_origins=["http://localhost:3000"], allow_credentials=True, allow_methods=["*"],
-                   allow_headers=["*"], )
-
-ai_service = AIService()
+analysis_cache = AnalysisCache()
+ai_service = AIService(cache=analysis_cache)
+batch_service = BatchAnalysisService(ai_service)
 resume_service = ResumeService()
 application_service = ApplicationService()
-
-
-@app.on_event("startup")
-async def startup_event():
+semantic_index = SemanticIndex()
+resume_summaries = DocumentSerializer(ResumeSummary)
+application_summaries = DocumentSerializer(ApplicationSummary)
+dashboards = DocumentSerializer(DashboardResponse)
+resume_details = DocumentSerializer(ResumeResponse)
+application_details = DocumentSerializer(ApplicationResponse)
+search_results = DocumentSerializer(SearchResponse)
+search_service = SearchService()
+collection_versions = CollectionVersions()
+response_cache = ResponseCache(collection_versions)
+application_importer = ApplicationImporter(application_service.stats, semantic_index)
+job_queue = JobQueue()
+job_workers = JobWorkerPool(job_queue, ai_service)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
     mongodb_url = os.getenv("MONGO_URI")
     database_name = os.getenv("DATABASE_NAME")
     if not mongodb_url or not database_name:
         raise RuntimeError("MONGO_URI or DATABASE_NAME not set in .env")
-    app.mongodb_client = AsyncIOMotorClient(mongodb_url)
+    ai_service.start()
+    app.mongodb_client = AsyncIOMotorClient(mongodb_url, event_listeners=[MongoCommandMetrics(), MongoPoolMetrics()])
     app.mongodb = app.mongodb_client[database_name]
+    index_build = os.getenv("INDEX_BUILD_MODE", "blocking")
+    app.index_builder = None
+    if index_build == "background":
+        app.index_builder = asyncio.create_task(create_indexes_in_background(app.mongodb))
+    elif index_build != "off":
+        await create_indexes(app.mongodb)
+    analysis_cache.attach(app.mongodb)
+    resume_service.start()
+    await application_service.stats.ensure_initialized(app.mongodb)
+    reconcile_interval = float(os.getenv("ANALYTICS_RECONCILE_INTERVAL_SECONDS", "3600"))
+    app.stats_reconciler = None
+    if reconcile_interval > 0:
+        on_drift = partial(collection_versions.bump, app.mongodb, "applications")
+        app.stats_reconciler = asyncio.create_task(
+            application_service.stats.reconcile_periodically(app.mongodb, reconcile_interval, on_drift=on_drift))
+    job_workers.start(app.mongodb)
+    try:
+        yield
+    finally:
+        await job_workers.stop()
+        for task in (app.stats_reconciler, app.index_builder):
+            if task:
+                task.cancel()
+        app.mongodb_client.close()
+        resume_service.shutdown()
+
+
+app = FastAPI(title="AuraHire API", version="1.0.0", lifespan=lifespan)
+app.router.route_class = TimedRoute
 
+app.add_middleware(CORSMiddleware, allow_origins=["http://localhost:3000"], allow_credentials=True, allow_methods=["*"],
+                   allow_headers=["*"], expose_headers=["X-Next-Cursor", "ETag"], )
+app.add_middleware(MetricsMiddleware)
 
-@app.on_event("shutdown")
-async def shutdown_event():
-    app.mongodb_client.close()
+
+@app.exception_handler(LLMUnavailableError)
+async def llm_unavailable_handler(request: Request, exc: LLMUnavailableError):
+    status_code = 504 if isinstance(exc, LLMTimeoutError) else 503
+    headers = {"Retry-After": str(max(1, round(exc.retry_after)))} if exc.retry_after else None
+    return JSONResponse(status_code=status_code, content={"detail": str(exc)}, headers=headers)
 
 
 @app.get("/health")
@@ -47,26 +122,92 @@ async def health_check():
     return {"status": "healthy", "timestamp": datetime.utcnow()}
 
 
+def _ai_metrics() -> dict:
+    return {"client": ai_service.client.metrics(),
+            "single_flight": {"in_flight": ai_service.in_flight.in_flight, "started": ai_service.in_flight.started,
+                              "coalesced": ai_service.in_flight.coalesced},
+            "analysis_cache": {"hits": analysis_cache.hits, "misses": analysis_cache.misses}}
+
+
+REGISTRY.register_collector("ai", _ai_metrics)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return Response(REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@app.get("/api/ai/metrics")
+async def ai_metrics():
+    return _ai_metrics()
+
+
 @app.post("/api/resumes/upload", response_model=ResumeResponse)
 async def upload_resume(file: UploadFile = File(...), db=Depends(get_database)):
     if not file.filename.endswith(('.pdf', '.docx')):
         raise HTTPException(status_code=400, detail="Only PDF and DOCX files are supported")
-    content = await file.read()
-    parsed_content = await resume_service.parse_resume(content, file.filename)
-    resume_data = {"filename": file.filename, "content": parsed_content, "created_at": datetime.utcnow(),
+    content = await file.read(resume_service.max_bytes + 1)
+    content_hash = resume_service.content_hash(content)
+    existing = await db.resumes.find_one({"content_hash": content_hash}, WITHOUT_VECTOR)
+    if existing:
+        existing["_id"] = str(existing["_id"])
+        return ResumeResponse(**existing, duplicate=True)
+    try:
+        parsed_content = await resume_service.parse_resume(content, file.filename)
+    except ResumeTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ResumeParseError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except (ParserOverloadedError, ParserUnavailableError) as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    except ParseTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    resume_data = {"filename": file.filename, "content": parsed_content, "content_hash": content_hash,
+                   VECTOR_FIELD: semantic_index.vectorize(parsed_content), "created_at": datetime.utcnow(),
                    "updated_at": datetime.utcnow(), }
-    result = await db.resumes.insert_one(resume_data)
+    try:
+        result = await db.resumes.insert_one(resume_data)
+    except DuplicateKeyError:
+        existing = await db.resumes.find_one({"content_hash": content_hash}, WITHOUT_VECTOR)
+        existing["_id"] = str(existing["_id"])
+        return ResumeResponse(**existing, duplicate=True)
+    await collection_versions.bump(db, "resumes")
     resume_data["_id"] = str(result.inserted_id)
     return ResumeResponse(**resume_data)
 
 
-@app.get("/api/resumes", response_model=List[ResumeResponse])
-async def get_resumes(db=Depends(get_database)):
-    resumes = []
-    async for resume in db.resumes.find():
+async def _page(collection, query: dict, projection: dict, limit: Optional[int], cursor: Optional[str],
+                serializer: DocumentSerializer) -> Response:
+    try:
+        docs, next_cursor = await fetch_page(collection, query, projection, min(limit or PAGE_SIZE, MAX_PAGE_SIZE),
+                                             cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    for doc in docs:
+        doc["_id"] = str(doc["_id"])
+    return serializer.response(docs, headers={"X-Next-Cursor": next_cursor} if next_cursor else None)
+
+
+@app.get("/api/resumes", response_model=List[ResumeSummary])
+async def get_resumes(request: Request, limit: Optional[int] = Query(None, ge=1), cursor: Optional[str] = None,
+                      db=Depends(get_database)):
+    return await response_cache.respond(request, db, ["resumes"], lambda: _page(
+        db.resumes, {}, RESUME_SUMMARY_PROJECTION, limit, cursor, resume_summaries))
+
+
+@app.get("/api/resumes/{resume_id}", response_model=ResumeResponse)
+async def get_resume(resume_id: str, request: Request, db=Depends(get_database)):
+    if not ObjectId.is_valid(resume_id):
+        raise HTTPException(status_code=400, detail="Invalid resume ID format.")
+
+    async def build():
+        resume = await db.resumes.find_one({"_id": ObjectId(resume_id)}, WITHOUT_VECTOR)
+        if not resume:
+            raise HTTPException(status_code=404, detail="Resume not found")
         resume["_id"] = str(resume["_id"])
-        resumes.append(ResumeResponse(**resume))
-    return resumes
+        return resume_details.response_one(resume)
+
+    return await response_cache.respond(request, db, ["resumes"], build)
 
 
 @app.post("/api/analyze_resume", response_model=AnalyzeResumeResponse)
@@ -78,10 +219,130 @@ async def analyze_resume_for_job_no_path_id(request: OptimizationRequest, db=Dep
     if not resume or not resume.get("content"):
         raise HTTPException(status_code=404, detail="Resume not found or content empty.")
     result = await ai_service.analyze_resume(resume_content=resume["content"],
-                                             job_description=request.job_description, )
+                                             job_description=request.job_description,
+                                             use_cache=not request.no_cache, mode=request.mode.value, )
+    with span("validation"):
+        return AnalyzeResumeResponse(**result)
+
+
+async def _ndjson(lines):
+    async for line in lines:
+        yield json.dumps(line, default=str) + "\n"
+
+
+@app.post("/api/analyze_resume/batch")
+async def analyze_resume_batch(request: BatchAnalyzeRequest, db=Depends(get_database)):
+    if not ObjectId.is_valid(request.resume_id):
+        raise HTTPException(status_code=400, detail="Invalid resume ID format.")
+    if any(not ObjectId.is_valid(app_id) for app_id in request.application_ids):
+        raise HTTPException(status_code=400, detail="Invalid application ID format.")
+    resume = await db.resumes.find_one({"_id": ObjectId(request.resume_id)}, {"content": 1})
+    if not resume or not resume.get("content"):
+        raise HTTPException(status_code=404, detail="Resume not found or content empty.")
+
+    job_descriptions = [(jd.id, jd.job_description) for jd in request.job_descriptions]
+    if request.application_ids:
+        found = {}
+        async for application in db.applications.find(
+                {"_id": {"$in": [ObjectId(app_id) for app_id in request.application_ids]}}, {"job_description": 1}):
+            found[str(application["_id"])] = application.get("job_description")
+        job_descriptions += [(app_id, found.get(app_id)) for app_id in request.application_ids]
+    if not job_descriptions:
+        raise HTTPException(status_code=400, detail="Provide job_descriptions or application_ids.")
+
+    items = [BatchItem(i, item_id, resume["content"], jd) for i, (item_id, jd) in enumerate(job_descriptions) if jd]
+    missing = [{"index": i, "id": item_id, "status": "error",
+                "error": "Application not found or has no job description."} for i, (item_id, jd) in
+               enumerate(job_descriptions) if not jd]
+
+    async def lines():
+        for line in missing:
+            yield line
+        succeeded = 0
+        async for line in batch_service.analyze_many(items, mode=request.mode.value, use_cache=not request.no_cache,
+                                                     max_concurrency=request.max_concurrency,
+                                                     pack_size=request.pack_size):
+            succeeded += line["status"] == "ok"
+            yield line
+        yield {"status": "done", "succeeded": succeeded, "failed": len(job_descriptions) - succeeded}
+
+    return StreamingResponse(_ndjson(lines()), media_type="application/x-ndjson")
+
+
+@app.post("/api/rank_resumes")
+async def rank_resumes(request: RankResumesRequest, db=Depends(get_database)):
+    if any(not ObjectId.is_valid(resume_id) for resume_id in request.resume_ids):
+        raise HTTPException(status_code=400, detail="Invalid resume ID format.")
+    query = {"_id": {"$in": [ObjectId(resume_id) for resume_id in request.resume_ids]}} if request.resume_ids else {}
+    items = []
+    async for resume in db.resumes.find(query, {"content": 1}):
+        if resume.get("content"):
+            items.append(BatchItem(len(items), str(resume["_id"]), resume["content"], request.job_description))
+    if not items:
+        raise HTTPException(status_code=404, detail="No resumes with content found.")
+
+    async def lines():
+        scores = []
+        async for line in batch_service.analyze_many(items, mode=request.mode.value, use_cache=not request.no_cache,
+                                                     max_concurrency=request.max_concurrency):
+            if line["status"] == "ok":
+                scores.append((line["result"]["ats"]["score"], line["result"]["optimization"]["match_percentage"],
+                               line["id"]))
+            yield line
+        ranking = [{"id": resume_id, "score": score, "match_percentage": match} for score, match, resume_id in
+                   sorted(scores, reverse=True)]
+        yield {"status": "done", "ranking": ranking}
+
+    return StreamingResponse(_ndjson(lines()), media_type="application/x-ndjson")
+
+
+async def _analyze_top(db, resume_id: str, job_description: str, request: SimilarityRankRequest):
+    resume = await db.resumes.find_one({"_id": ObjectId(resume_id)}, {"content": 1})
+    if not resume or not resume.get("content") or not job_description:
+        return None
+    result = await ai_service.analyze_resume(resume_content=resume["content"], job_description=job_description,
+                                             use_cache=not request.no_cache, mode=request.mode.value, )
     return AnalyzeResumeResponse(**result)
 
 
+@app.post("/api/rank_resumes/similarity", response_model=SimilarityRankResponse)
+async def rank_resumes_by_similarity(request: ResumeSimilarityRequest, db=Depends(get_database)):
+    if any(not ObjectId.is_valid(resume_id) for resume_id in request.resume_ids):
+        raise HTTPException(status_code=400, detail="Invalid resume ID format.")
+    query = {"_id": {"$in": [ObjectId(resume_id) for resume_id in request.resume_ids]}} if request.resume_ids else {}
+    candidates = await semantic_index.candidates(db.resumes, query, {"filename": 1}, ("content",),
+                                                 lambda resume: resume.get("content") or "")
+    with span("similarity"):
+        ranked = await asyncio.to_thread(semantic_index.rank, request.job_description, candidates, request.limit)
+    response = SimilarityRankResponse(matches=[
+        SimilarityMatch(id=str(resume["_id"]), score=round(score, 4), filename=resume.get("filename"))
+        for resume, score in ranked], candidates=len(candidates))
+    if request.analyze_top and response.matches:
+        response.analyzed_id = response.matches[0].id
+        response.analysis = await _analyze_top(db, response.analyzed_id, request.job_description, request)
+    return response
+
+
+@app.post("/api/rank_applications/similarity", response_model=SimilarityRankResponse)
+async def rank_applications_by_similarity(request: ApplicationSimilarityRequest, db=Depends(get_database)):
+    if request.analyze_top and (not request.resume_id or not ObjectId.is_valid(request.resume_id)):
+        raise HTTPException(status_code=400, detail="Valid resume ID must be provided to analyze the top match.")
+    candidates = await semantic_index.candidates(db.applications, status_filter(request.status),
+                                                 {"company_name": 1, "position_title": 1, "status": 1},
+                                                 APPLICATION_TEXT_FIELDS, application_text)
+    with span("similarity"):
+        ranked = await asyncio.to_thread(semantic_index.rank, request.job_description, candidates, request.limit)
+    response = SimilarityRankResponse(matches=[
+        SimilarityMatch(id=str(application["_id"]), score=round(score, 4), company_name=application.get("company_name"),
+                        position_title=application.get("position_title"), status=application.get("status"))
+        for application, score in ranked], candidates=len(candidates))
+    if request.analyze_top and response.matches:
+        top = await db.applications.find_one({"_id": ObjectId(response.matches[0].id)}, {"job_description": 1})
+        response.analyzed_id = response.matches[0].id
+        response.analysis = await _analyze_top(db, request.resume_id, (top or {}).get("job_description"), request)
+    return response
+
+
 @app.post("/api/cover-letters/generate", response_model=CoverLetterResponse)
 async def generate_cover_letter(request: CoverLetterRequest, db=Depends(get_database)):
     if not request.resume_id or not ObjectId.is_valid(request.resume_id):
@@ -99,22 +360,139 @@ async def generate_cover_letter(request: CoverLetterRequest, db=Depends(get_data
                                tone=request.tone.value, created_at=datetime.utcnow(), )
 
 
+def _sse(event: str, data: str) -> str:
+    return f"event: {event}\ndata: {data}\n\n"
+
+
+@app.post("/api/cover-letters/generate/stream")
+async def stream_cover_letter(request: CoverLetterRequest, http_request: Request, db=Depends(get_database)):
+    if not request.resume_id or not ObjectId.is_valid(request.resume_id):
+        raise HTTPException(status_code=400, detail="Valid resume ID must be provided.")
+    resume = await db.resumes.find_one({"_id": ObjectId(request.resume_id)})
+    if not resume or not resume.get("content"):
+        raise HTTPException(status_code=404, detail="Resume not found or content empty.")
+
+    async def events():
+        chunks = []
+        stream = ai_service.stream_cover_letter(job_description=request.job_description,
+                                                company_name=request.company_name,
+                                                position_title=request.position_title,
+                                                resume_content=resume["content"], tone=request.tone.value, )
+        try:
+            async with aclosing(stream):
+                async for text in stream:
+                    if await http_request.is_disconnected():
+                        return
+                    chunks.append(text)
+                    yield _sse("chunk", json.dumps({"text": text}))
+        except Exception as e:
+            yield _sse("error", json.dumps({"detail": f"Error generating cover letter: {str(e)}"}))
+            return
+        cover_letter = CoverLetterResponse(resume_id=request.resume_id, company_name=request.company_name,
+                                           position_title=request.position_title, content="".join(chunks).strip(),
+                                           tone=request.tone.value, created_at=datetime.utcnow(), )
+        yield _sse("done", cover_letter.model_dump_json())
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+async def _submit_job(db, kind: str, request, tenant: str) -> JobResponse:
+    if not request.resume_id or not ObjectId.is_valid(request.resume_id):
+        raise HTTPException(status_code=400, detail="Valid resume ID must be provided.")
+    if not await db.resumes.count_documents({"_id": ObjectId(request.resume_id), "content": {"$nin": [None, ""]}},
+                                            limit=1):
+        raise HTTPException(status_code=404, detail="Resume not found or content empty.")
+    job = await job_queue.submit(db, kind, request.model_dump(mode="json", exclude={"priority"}), tenant=tenant,
+                                 priority=request.priority)
+    job["_id"] = str(job["_id"])
+    return JobResponse(**job)
+
+
+@app.post("/api/jobs/analyze", response_model=JobResponse, status_code=202)
+async def submit_analysis_job(request: AnalysisJobRequest, tenant: str = Header("default", alias="X-Tenant-ID"),
+                              db=Depends(get_database)):
+    return await _submit_job(db, "analysis", request, tenant)
+
+
+@app.post("/api/jobs/cover-letter", response_model=JobResponse, status_code=202)
+async def submit_cover_letter_job(request: CoverLetterJobRequest, tenant: str = Header("default", alias="X-Tenant-ID"),
+                                  db=Depends(get_database)):
+    return await _submit_job(db, "cover_letter", request, tenant)
+
+
+async def _get_job(db, job_id: str) -> dict:
+    if not ObjectId.is_valid(job_id):
+        raise HTTPException(status_code=400, detail="Invalid job ID format.")
+    job = await job_queue.get(db, ObjectId(job_id))
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    job["_id"] = str(job["_id"])
+    return job
+
+
+@app.get("/api/jobs/{job_id}", response_model=JobResponse)
+async def get_job(job_id: str, db=Depends(get_database)):
+    return JobResponse(**await _get_job(db, job_id))
+
+
+@app.get("/api/jobs/{job_id}/events")
+async def stream_job_events(job_id: str, http_request: Request, db=Depends(get_database)):
+    job = await _get_job(db, job_id)
+    poll_seconds = float(os.getenv("JOB_EVENTS_POLL_SECONDS", "2"))
+
+    async def events():
+        nonlocal job
+        status = None
+        while True:
+            if job["status"] != status:
+                status = job["status"]
+                yield _sse("status", json.dumps({"status": status, "attempts": job["attempts"]}))
+            if status in TERMINAL_STATUSES:
+                event = "done" if status == "succeeded" else "error"
+                yield _sse(event, JobResponse(**job).model_dump_json(by_alias=True))
+                return
+            await job_queue.wait_for_job(job_id, poll_seconds)
+            if await http_request.is_disconnected():
+                return
+            job = await _get_job(db, job_id)
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
 @app.post("/api/applications", response_model=ApplicationResponse)
 async def create_application(request: ApplicationRequest, db=Depends(get_database)):
     application_data = {**request.dict(), "created_at": datetime.utcnow(), "updated_at": datetime.utcnow(), }
+    application_data[VECTOR_FIELD] = semantic_index.vectorize(application_text(application_data))
     result = await db.applications.insert_one(application_data)
+    await application_service.stats.record_create(db, application_data["status"], application_data["created_at"])
+    await collection_versions.bump(db, "applications")
     application_data["_id"] = str(result.inserted_id)
     return ApplicationResponse(**application_data)
 
 
-@app.get("/api/applications", response_model=List[ApplicationResponse])
-async def get_applications(status: Optional[str] = None, db=Depends(get_database)):
-    query = {"status": status} if status else {}
-    applications = []
-    async for app in db.applications.find(query):
-        app["_id"] = str(app["_id"])
-        applications.append(ApplicationResponse(**app))
-    return applications
+@app.post("/api/applications/import", response_model=ImportSummary)
+async def import_applications(file: UploadFile = File(...), import_format: Optional[str] = Query(None, alias="format"),
+                              dedupe: bool = False, db=Depends(get_database)):
+    try:
+        import_format = detect_import_format(file.filename, import_format)
+    except ImportFormatError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        summary = await application_importer.import_file(db, file.file, import_format, dedupe=dedupe)
+    except ImportFileError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    finally:
+        await collection_versions.bump(db, "applications")
+    return summary
+
+
+@app.get("/api/applications", response_model=List[ApplicationSummary])
+async def get_applications(request: Request, status: Optional[str] = None, limit: Optional[int] = Query(None, ge=1),
+                           cursor: Optional[str] = None, db=Depends(get_database)):
+    return await response_cache.respond(request, db, ["applications"], lambda: _page(
+        db.applications, status_filter(status), APPLICATION_SUMMARY_PROJECTION, limit, cursor, application_summaries))
 
 
 @app.put("/api/applications/{application_id}", response_model=ApplicationResponse)
@@ -123,11 +501,19 @@ async def update_application(application_id: str, request: ApplicationUpdateRequ
         raise HTTPException(status_code=400, detail="Invalid application ID format.")
     update_data = {k: v for k, v in request.dict().items() if v is not None}
     update_data["updated_at"] = datetime.utcnow()
-    result = await db.applications.update_one({"_id": ObjectId(application_id)}, {"$set": update_data})
-    if result.matched_count == 0:
+    previous = await db.applications.find_one_and_update({"_id": ObjectId(application_id)}, {"$set": update_data},
+                                                         projection=WITHOUT_VECTOR,
+                                                         return_document=ReturnDocument.BEFORE)
+    if previous is None:
         raise HTTPException(status_code=404, detail="Application not found")
-    app_data = await db.applications.find_one({"_id": ObjectId(application_id)})
-    app_data["_id"] = str(app_data["_id"])
+    if any(field in update_data for field in APPLICATION_TEXT_FIELDS):
+        vector = semantic_index.vectorize(application_text({**previous, **update_data}))
+        await db.applications.update_one({"_id": previous["_id"]}, {"$set": {VECTOR_FIELD: vector}})
+    if "status" in update_data:
+        await application_service.stats.record_status_change(db, previous.get("status"), update_data["status"],
+                                                             update_data["updated_at"])
+    await collection_versions.bump(db, "applications")
+    app_data = {**previous, **update_data, "_id": str(previous["_id"])}
     return ApplicationResponse(**app_data)
 
 
@@ -135,21 +521,91 @@ async def update_application(application_id: str, request: ApplicationUpdateRequ
 async def delete_application(application_id: str, db=Depends(get_database)):
     if not ObjectId.is_valid(application_id):
         raise HTTPException(status_code=400, detail="Invalid application ID format.")
-    result = await db.applications.delete_one({"_id": ObjectId(application_id)})
-    if result.deleted_count == 0:
+    deleted = await db.applications.find_one_and_delete({"_id": ObjectId(application_id)},
+                                                        projection={"status": 1, "created_at": 1})
+    if deleted is None:
         raise HTTPException(status_code=404, detail="Application not found")
+    await application_service.stats.record_delete(db, deleted.get("status"), deleted.get("created_at"),
+                                                  datetime.utcnow())
+    await collection_versions.bump(db, "applications")
     return {"message": "Application deleted successfully"}
 
 
 @app.get("/api/analytics/dashboard", response_model=DashboardResponse)
-async def get_dashboard_analytics(db=Depends(get_database)):
-    analytics = await application_service.get_analytics(db=db)
-    return DashboardResponse(**analytics)
+async def get_dashboard_analytics(request: Request, db=Depends(get_database)):
+    async def build():
+        return dashboards.response_one(await application_service.get_analytics(db=db))
+
+    return await response_cache.respond(request, db, ["applications"], build,
+                                        vary=datetime.utcnow().strftime("%Y-%m-%d"))
+
+
+@app.get("/api/analytics/timeseries")
+async def get_analytics_timeseries(days: int = Query(30, ge=1, le=366), db=Depends(get_database)):
+    buckets = await application_service.stats.get_daily(db, days)
+    return [{"date": bucket["_id"], "created": bucket.get("created", 0), "deleted": bucket.get("deleted", 0),
+             "entered": bucket.get("entered", {})} for bucket in buckets]
+
+
+@app.post("/api/analytics/reconcile")
+async def reconcile_analytics(db=Depends(get_database)):
+    report = await application_service.stats.reconcile(db)
+    if report["drifted"]:
+        await collection_versions.bump(db, "applications")
+    return report
+
+
+@app.get("/api/search", response_model=SearchResponse)
+async def search(request: Request, q: str = Query(..., min_length=1, max_length=200), scope: str = "all",
+                 status: Optional[str] = None, date_from: Optional[date] = None, date_to: Optional[date] = None,
+                 location: Optional[str] = None, limit: int = Query(20, ge=1, le=50), offset: int = Query(0, ge=0),
+                 db=Depends(get_database)):
+    start = datetime.combine(date_from, time.min) if date_from else None
+    end = datetime.combine(date_to + timedelta(days=1), time.min) if date_to else None
+
+    async def build():
+        try:
+            result = await search_service.search(db, q, scope=scope, status=status, start=start, end=end,
+                                                 location=location, limit=limit, offset=offset)
+        except SearchQueryError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except ExecutionTimeout:
+            raise HTTPException(status_code=504, detail="Search took too long; narrow the query or add filters.")
+        except OperationFailure as e:
+            if e.code != 27:
+                raise
+            raise HTTPException(status_code=503, detail="Search index is not ready yet.", headers={"Retry-After": "30"})
+        return search_results.response_one(result)
+
+    return await response_cache.respond(request, db, ["applications", "resumes"], build)
 
 
 @app.get("/api/applications/download")
-async def download_applications(status: Optional[str] = None, db=Depends(get_database)):
-    return await application_service.export_applications_to_excel(db=db, status=status)
+async def download_applications(status: Optional[str] = None, export_format: str = Query("xlsx", alias="format"),
+                                columns: Optional[str] = None, db=Depends(get_database)):
+    if export_format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported format. Choose one of: {', '.join(EXPORT_FORMATS)}")
+    selected = [column.strip() for column in columns.split(",") if column.strip()] if columns else None
+    unknown = [column for column in selected or [] if column not in EXPORT_COLUMNS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown columns: {', '.join(unknown)}")
+    return await application_service.export_applications(db=db, status=status, export_format=export_format,
+                                                     columns=selected)
+
+
+@app.get("/api/applications/{application_id}", response_model=ApplicationResponse)
+async def get_application(application_id: str, request: Request, db=Depends(get_database)):
+    if not ObjectId.is_valid(application_id):
+        raise HTTPException(status_code=400, detail="Invalid application ID format.")
+
+    async def build():
+        app_data = await db.applications.find_one({"_id": ObjectId(application_id)}, WITHOUT_VECTOR)
+        if not app_data:
+            raise HTTPException(status_code=404, detail="Application not found")
+        app_data["_id"] = str(app_data["_id"])
+        return application_details.response_one(app_data)
+
+    return await response_cache.respond(request, db, ["applications"], build)
 
 
 if __name__ == "__main__":
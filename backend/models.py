@@ -21,16 +21,84 @@ class CoverLetterTone(str, Enum):
     PROFESSIONAL = "professional"
 
 
-class ResumeResponse(BaseModel):
+class AnalysisMode(str, Enum):
+    FULL = "full"
+    FAST = "fast"
+    HYBRID = "hybrid"
+
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class ResumeSummary(BaseModel):
     id: str = Field(alias="_id")
     filename: str
-    content: str
     created_at: datetime
 
 
+class ResumeResponse(ResumeSummary):
+    content: str
+    duplicate: bool = False
+
+
 class OptimizationRequest(BaseModel):
     resume_id: str
     job_description: str
+    no_cache: bool = False
+    mode: AnalysisMode = AnalysisMode.FULL
+
+
+class BatchJobDescription(BaseModel):
+    id: Optional[str] = None
+    job_description: str
+
+
+class BatchAnalyzeRequest(BaseModel):
+    resume_id: str
+    job_descriptions: List[BatchJobDescription] = []
+    application_ids: List[str] = []
+    mode: AnalysisMode = AnalysisMode.FULL
+    no_cache: bool = False
+    max_concurrency: int = Field(4, ge=1, le=16)
+    pack_size: int = Field(1, ge=1, le=10)
+
+
+class RankResumesRequest(BaseModel):
+    job_description: str
+    resume_ids: List[str] = []
+    mode: AnalysisMode = AnalysisMode.FULL
+    no_cache: bool = False
+    max_concurrency: int = Field(4, ge=1, le=16)
+
+
+class SimilarityRankRequest(BaseModel):
+    job_description: str
+    limit: int = Field(10, ge=1, le=100)
+    analyze_top: bool = False
+    mode: AnalysisMode = AnalysisMode.FULL
+    no_cache: bool = False
+
+
+class ResumeSimilarityRequest(SimilarityRankRequest):
+    resume_ids: List[str] = []
+
+
+class ApplicationSimilarityRequest(SimilarityRankRequest):
+    status: Optional[str] = None
+    resume_id: Optional[str] = None
+
+
+class SimilarityMatch(BaseModel):
+    id: str
+    score: float
+    filename: Optional[str] = None
+    company_name: Optional[str] = None
+    position_title: Optional[str] = None
+    status: Optional[str] = None
 
 
 class OptimizationResult(BaseModel):
@@ -52,6 +120,14 @@ class ATSResult(BaseModel):
 class AnalyzeResumeResponse(BaseModel):
     optimization: OptimizationResult
     ats: ATSResult
+    cache: Optional[str] = None
+
+
+class SimilarityRankResponse(BaseModel):
+    matches: List[SimilarityMatch]
+    candidates: int
+    analyzed_id: Optional[str] = None
+    analysis: Optional[AnalyzeResumeResponse] = None
 
 
 class CoverLetterRequest(BaseModel):
@@ -71,6 +147,28 @@ class CoverLetterResponse(BaseModel):
     created_at: datetime
 
 
+class AnalysisJobRequest(OptimizationRequest):
+    priority: int = Field(0, ge=-10, le=10)
+
+
+class CoverLetterJobRequest(CoverLetterRequest):
+    priority: int = Field(0, ge=-10, le=10)
+
+
+class JobResponse(BaseModel):
+    id: str = Field(alias="_id")
+    kind: str
+    status: JobStatus
+    tenant: str
+    priority: int
+    attempts: int
+    error: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
 class ApplicationRequest(BaseModel):
     company_name: str
     position_title: str
@@ -100,25 +198,63 @@ class ApplicationUpdateRequest(BaseModel):
     follow_up_date: Optional[datetime] = None
 
 
-class ApplicationResponse(BaseModel):
+class ApplicationSummary(BaseModel):
     id: str = Field(alias="_id")
     company_name: str
     position_title: str
-    job_description: Optional[str]
-    application_url: Optional[str]
-    resume_id: Optional[str]
-    cover_letter_id: Optional[str]
+    application_url: Optional[str] = None
+    resume_id: Optional[str] = None
+    cover_letter_id: Optional[str] = None
     status: str
-    notes: Optional[str]
-    salary_range: Optional[str]
-    location: Optional[str]
-    application_date: Optional[datetime]
-    interview_date: Optional[datetime]
-    follow_up_date: Optional[datetime]
+    salary_range: Optional[str] = None
+    location: Optional[str] = None
+    application_date: Optional[datetime] = None
+    interview_date: Optional[datetime] = None
+    follow_up_date: Optional[datetime] = None
     created_at: datetime
     updated_at: datetime
 
 
+class ApplicationResponse(ApplicationSummary):
+    job_description: Optional[str] = None
+    notes: Optional[str] = None
+
+
+class ImportRowError(BaseModel):
+    row: int
+    errors: List[str]
+
+
+class ImportSummary(BaseModel):
+    format: str
+    total_rows: int
+    inserted: int
+    duplicates: int
+    failed: int
+    truncated: bool = False
+    errors: List[ImportRowError] = []
+
+
+class SearchHit(BaseModel):
+    id: str
+    kind: str
+    score: float
+    title: Optional[str] = None
+    subtitle: Optional[str] = None
+    status: Optional[str] = None
+    location: Optional[str] = None
+    date: Optional[datetime] = None
+    snippets: List[str] = []
+
+
+class SearchResponse(BaseModel):
+    query: str
+    hits: List[SearchHit]
+    offset: int
+    limit: int
+    next_offset: Optional[int] = None
+
+
 class StatusCount(BaseModel):
     status: str
     count: int
@@ -127,7 +263,7 @@ class StatusCount(BaseModel):
 class DashboardResponse(BaseModel):
     total_applications: int
     status_breakdown: List[StatusCount]
-    recent_applications: List[ApplicationResponse]
+    recent_applications: List[ApplicationSummary]
     avg_response_time: Optional[float] = None
     interview_rate: float
     success_metrics: Dict[str, Any]
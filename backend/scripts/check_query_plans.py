@@ -0,0 +1,189 @@
+"""Explain every query shape the API issues and fail on collection scans.
+
+Run from the backend directory against a MongoDB server:
+
+    MONGO_URI=mongodb://localhost:27017 python scripts/check_query_plans.py
+
+A scratch database is created, indexed with database.create_indexes,
+seeded, explained and dropped again. The exit status is 1 when any plan
+contains a COLLSCAN. Blocking in-memory SORT stages are reported as
+warnings. Queries that scan a whole collection on purpose are listed in
+INTENTIONAL_SCANS and not explained. The shapes are built with the same
+query helpers the endpoints call, and tests/test_query_plans.py runs the
+same check under pytest, skipping when no server is reachable.
+"""
+import asyncio
+import hashlib
+import os
+import random
+import sys
+import uuid
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bson import ObjectId  # noqa: E402
+from motor.motor_asyncio import AsyncIOMotorClient  # noqa: E402
+
+from database import create_indexes  # noqa: E402
+from services.analysis_cache import AnalysisCache  # noqa: E402
+from services.application_import import DEDUPE_FIELDS, DEDUPE_PROJECTION, dedupe_query  # noqa: E402
+from services.application_service import (APPLICATION_SUMMARY_PROJECTION, EXPORT_COLUMNS,  # noqa: E402
+                                          export_projection, recent_applications_query, status_filter, )
+from services.application_stats import ApplicationStats, STATS_ID, daily_query  # noqa: E402
+from services.job_queue import (CLAIM_SORT, EXPIRED_PROJECTION, RUNNING_BY_TENANT, claim_query,  # noqa: E402
+                                expired_query, )
+from services.pagination import KEYSET_SORT, encode_cursor, keyset_query  # noqa: E402
+from services.resume_service import RESUME_SUMMARY_PROJECTION  # noqa: E402
+from services.search_service import (APPLICATION_SEARCH_PROJECTION, RESUME_SEARCH_PROJECTION, TEXT_SCORE,  # noqa: E402
+                                     SearchService, )
+from services.semantic_index import VECTOR_FIELD  # noqa: E402
+
+STATUSES = ["applied", "interview_scheduled", "interview_completed", "offer", "rejected", "withdrawn"]
+INTENTIONAL_SCANS = ["applications.aggregate (stats reconcile)", "resumes.find {} (rank every resume)",
+                     "application_daily_stats.find {} (stats reconcile)", "resumes.find {} (similarity rank)",
+                     "applications.find {} (similarity rank)", "job_tenants.find (saturated tenants)",
+                     "job_tenants.find {} (tenant reconcile)"]
+
+
+async def seed(db):
+    now = datetime.utcnow()
+    applications = [{"company_name": f"Company {i % 150}", "position_title": f"Role {i % 7}",
+                     "status": random.choice(STATUSES), "application_date": now - timedelta(days=i % 90),
+                     "job_description": "Python, MongoDB", "notes": "", "created_at": now - timedelta(minutes=i),
+                     "updated_at": now} for i in range(2000)]
+    await db.applications.insert_many(applications)
+    resumes = [{"filename": f"resume-{i}.pdf", "content": "Python engineer",
+                "content_hash": hashlib.sha256(str(i).encode()).hexdigest(), "created_at": now - timedelta(hours=i),
+                "updated_at": now} for i in range(300)]
+    await db.resumes.insert_many(resumes)
+    await db.analysis_cache.insert_many([{"_id": hashlib.sha256(f"k{i}".encode()).hexdigest(), "value": {},
+                                          "expires_at": now + timedelta(days=1)} for i in range(300)])
+    await db.jobs.insert_many([{"kind": "analysis", "payload": {}, "tenant": f"tenant-{i % 5}", "priority": i % 3,
+                                "status": random.choice(["queued", "running", "succeeded", "failed"]), "attempts": 0,
+                                "run_after": now - timedelta(seconds=i), "lease_until": now + timedelta(seconds=i),
+                                "created_at": now, "updated_at": now} for i in range(500)])
+    await ApplicationStats().reconcile(db)
+    return applications, resumes
+
+
+def query_shapes(applications, resumes):
+    now = datetime.utcnow()
+    page_cursor = encode_cursor(applications[49])
+    resume_cursor = encode_cursor(resumes[49])
+    dedupe_keys = [tuple(application[field] for field in DEDUPE_FIELDS) for application in applications[:50]]
+    return [
+        ("upload dedupe", "resumes", {"content_hash": resumes[3]["content_hash"]}, None, None, 1),
+        ("resume detail", "resumes", {"_id": resumes[3]["_id"]}, None, None, 1),
+        ("resume list", "resumes", keyset_query({}, None), RESUME_SUMMARY_PROJECTION, KEYSET_SORT, 51),
+        ("resume list next page", "resumes", keyset_query({}, resume_cursor), RESUME_SUMMARY_PROJECTION, KEYSET_SORT,
+         51),
+        ("rank selected resumes", "resumes", {"_id": {"$in": [resume["_id"] for resume in resumes[:10]]}},
+         {"content": 1}, None, 0),
+        ("application list", "applications", keyset_query(status_filter(None), None), APPLICATION_SUMMARY_PROJECTION,
+         KEYSET_SORT, 51),
+        ("application list by status", "applications", keyset_query(status_filter("offer"), None),
+         APPLICATION_SUMMARY_PROJECTION, KEYSET_SORT, 51),
+        ("application list next page", "applications", keyset_query(status_filter(None), page_cursor),
+         APPLICATION_SUMMARY_PROJECTION, KEYSET_SORT, 51),
+        ("application list by status next page", "applications", keyset_query(status_filter("applied"), page_cursor),
+         APPLICATION_SUMMARY_PROJECTION, KEYSET_SORT, 51),
+        ("application detail / update / delete", "applications", {"_id": applications[3]["_id"]}, None, None, 1),
+        ("batch analysis job descriptions", "applications",
+         {"_id": {"$in": [application["_id"] for application in applications[:10]]}}, {"job_description": 1}, None,
+         0),
+        ("similarity rank by status", "applications", status_filter("offer"),
+         {"company_name": 1, "position_title": 1, "status": 1, VECTOR_FIELD: 1}, None, 0),
+        ("dashboard recent applications", "applications", recent_applications_query(now),
+         APPLICATION_SUMMARY_PROJECTION, KEYSET_SORT, 10),
+        ("export", "applications", status_filter(None), export_projection(list(EXPORT_COLUMNS)), KEYSET_SORT, 0),
+        ("export by status", "applications", status_filter("rejected"), export_projection(), KEYSET_SORT, 0),
+        ("import dedupe", "applications", dedupe_query(dedupe_keys), DEDUPE_PROJECTION, None, 0),
+        ("analysis cache lookup", "analysis_cache", AnalysisCache.lookup_query(hashlib.sha256(b"k1").hexdigest()),
+         None, None, 1),
+        ("job claim", "jobs", claim_query(now, {"tenant-1"}), {"tenant": 1}, CLAIM_SORT, 1),
+        ("job expired leases", "jobs", expired_query(now), EXPIRED_PROJECTION, None, 0),
+        ("job detail", "jobs", {"_id": ObjectId()}, {"payload": 0}, None, 1),
+        ("search applications", "applications", SearchService.application_query("python", None, None, None, None),
+         APPLICATION_SEARCH_PROJECTION, [("score", TEXT_SCORE)], 21),
+        ("search applications with filters", "applications", SearchService.application_query(
+            "python mongodb", "offer", now - timedelta(days=60), now, "remote"), APPLICATION_SEARCH_PROJECTION,
+         [("score", TEXT_SCORE)], 21),
+        ("search resumes", "resumes", SearchService.resume_query("python engineer", now - timedelta(days=60), None),
+         RESUME_SEARCH_PROJECTION, [("score", TEXT_SCORE)], 21),
+        ("collection versions", "collection_versions", {"_id": {"$in": ["applications"]}}, None, None, 0),
+        ("stats totals", "application_stats", {"_id": STATS_ID}, None, None, 1),
+        ("stats timeseries", "application_daily_stats", daily_query(30), None, [("_id", 1)], 30),
+    ]
+
+
+def pipeline_shapes():
+    return [("job running per tenant", "jobs", RUNNING_BY_TENANT)]
+
+
+def winning_plans(explanation):
+    if isinstance(explanation, dict):
+        for key, value in explanation.items():
+            if key == "winningPlan":
+                yield value
+            else:
+                yield from winning_plans(value)
+    elif isinstance(explanation, list):
+        for value in explanation:
+            yield from winning_plans(value)
+
+
+def plan_stages(plan):
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            yield plan["stage"]
+        for value in plan.values():
+            yield from plan_stages(value)
+    elif isinstance(plan, list):
+        for value in plan:
+            yield from plan_stages(value)
+
+
+async def explain_all(db):
+    applications, resumes = await seed(db)
+    explanations = []
+    for name, collection, query, projection, sort, limit in query_shapes(applications, resumes):
+        cursor = db[collection].find(query, projection)
+        if sort:
+            cursor = cursor.sort(sort)
+        if limit:
+            cursor = cursor.limit(limit)
+        explanations.append((name, collection, await cursor.explain()))
+    for name, collection, pipeline in pipeline_shapes():
+        explanations.append((name, collection, await db.command("aggregate", collection, pipeline=pipeline,
+                                                                explain=True)))
+    return [(name, collection, {stage for plan in winning_plans(explanation) for stage in plan_stages(plan)})
+            for name, collection, explanation in explanations]
+
+
+async def main():
+    mongodb_url = os.getenv("MONGO_URI", "mongodb://localhost:27017")
+    client = AsyncIOMotorClient(mongodb_url)
+    db = client[f"query_plans_{uuid.uuid4().hex[:8]}"]
+    failures = 0
+    try:
+        await create_indexes(db)
+        for name, collection, stages in await explain_all(db):
+            if "COLLSCAN" in stages:
+                failures += 1
+                print(f"FAIL  {name}: COLLSCAN on {collection}")
+            elif "SORT" in stages:
+                print(f"WARN  {name}: in-memory SORT on {collection}")
+            else:
+                print(f"ok    {name}: {', '.join(sorted(stages))}")
+        for name in INTENTIONAL_SCANS:
+            print(f"skip  {name}")
+    finally:
+        await client.drop_database(db.name)
+        client.close()
+    print(f"{failures} query shape(s) with a collection scan")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
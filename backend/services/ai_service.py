@@ -1,37 +1,204 @@
+import asyncio
 import datetime
+import hashlib
 import json
 import os
-from typing import Dict, Optional
+from contextlib import aclosing
+from typing import AsyncIterator, Dict, List, Optional
 
-import google.generativeai as genai
 from dotenv import load_dotenv
+from pydantic import ValidationError
 
-load_dotenv()
+from models import AnalyzeResumeResponse
+from services.analysis_cache import AnalysisCache
+from services.ats_scorer import ATSScorer
+from services.llm_client import LLMUnavailableError, ResilientModelClient
+from services.metrics import record_llm_call, span
+from services.prompt_compactor import PromptCompactor
+from services.single_flight import SingleFlight
 
-API_KEY = os.getenv("GEMINI_API_KEY")
-if not API_KEY:
-    raise ValueError("GEMINI_API_KEY not found in environment variables or .env file. Please set it.")
+load_dotenv()
 
 MODEL_NAME = "gemini-1.5-flash"
-genai.configure(api_key=API_KEY)
+COVER_LETTER_TEMPERATURE = 0.7
+ANALYSIS_TEMPERATURE = 0.3
+ANALYSIS_PROMPT_VERSION = "2"
+
+
+def create_model():
+    api_key = os.getenv("GEMINI_API_KEY")
+    if not api_key:
+        raise ValueError("GEMINI_API_KEY not found in environment variables or .env file. Please set it.")
+    import google.generativeai as genai
+
+    genai.configure(api_key=api_key)
+    return genai.GenerativeModel(MODEL_NAME)
 
 
 class AIService:
-    def __init__(self):
-        self.model = genai.GenerativeModel(MODEL_NAME)
+    def __init__(self, cache: Optional[AnalysisCache] = None, model=None):
+        self.client = ResilientModelClient(model)
+        self.cache = cache
+        self.scorer = ATSScorer()
+        self.compactor = PromptCompactor()
+        self.in_flight = SingleFlight()
+
+    @property
+    def model(self):
+        if self.client.model is None:
+            self.client.model = create_model()
+        return self.client.model
+
+    @model.setter
+    def model(self, model):
+        self.client.model = model
+
+    def start(self):
+        return self.model
 
     async def _make_request(self, prompt: str, temperature: float) -> str:
-        generation_config = {"temperature": temperature, "top_p": 1, "top_k": 0, }
+        fingerprint = hashlib.sha256(f"{MODEL_NAME}:{temperature}:{prompt}".encode("utf-8")).hexdigest()
+        with span("llm"):
+            return await self.in_flight.do(fingerprint, lambda: self._generate(prompt, temperature))
+
+    @staticmethod
+    def _generation_config(temperature: float) -> Dict:
+        return {"temperature": temperature, "top_p": 1, "top_k": 0, }
+
+    async def _generate(self, prompt: str, temperature: float) -> str:
+        self.start()
+        response = await self.client.generate(prompt, generation_config=self._generation_config(temperature),
+                                              tool_config=None)
+
+        text = response.candidates[0].content.parts[0].text if response.candidates else ""
+        record_llm_call("generate", len(prompt), len(text), getattr(response, "usage_metadata", None))
+        return text
+
+    async def analyze_resume(self, resume_content: str, job_description: str, use_cache: bool = True,
+                             mode: str = "full") -> Dict:
+        if mode == "fast":
+            return await asyncio.to_thread(self.scorer.analyze, resume_content, job_description)
+        if self.cache is None:
+            result = await self._analyze_resume(resume_content, job_description, mode)
+            result.pop("_fallback", None)
+            return result
+        key = self._cache_key(resume_content, job_description, mode)
+        if use_cache:
+            cached = await self.cache.get(key)
+            if cached is not None:
+                return {**cached, "cache": "hit"}
+        result = await self._analyze_resume(resume_content, job_description, mode)
+        if not result.pop("_fallback", False) and self._is_valid_analysis(result):
+            await self.cache.set(key, result)
+        return {**result, "cache": "miss" if use_cache else "refresh"}
+
+    async def analyze_resume_packed(self, resume_content: str, job_descriptions: List[str],
+                                    use_cache: bool = True) -> List[Dict]:
+        results: List[Optional[Dict]] = [None] * len(job_descriptions)
+        keys = [self._cache_key(resume_content, jd, "full") if self.cache else None for jd in job_descriptions]
+        if self.cache is not None and use_cache:
+            for i, key in enumerate(keys):
+                cached = await self.cache.get(key)
+                if cached is not None:
+                    results[i] = {**cached, "cache": "hit"}
+
+        pending = [i for i, result in enumerate(results) if result is None]
+        if not pending:
+            return results
+        with span("prompt_build"):
+            prompt = self._build_packed_analysis_prompt(self.compactor.resume(resume_content),
+                                                        [self.compactor.job_description(job_descriptions[i]) for i in
+                                                         pending])
+        raw_response = await self._make_request(prompt, temperature=ANALYSIS_TEMPERATURE)
+        with span("json_parse"):
+            parsed = self._parse_json_response(raw_response).get("results")
+        if not isinstance(parsed, list) or len(parsed) != len(pending):
+            parsed = [None] * len(pending)
+
+        retry = [i for i, result in zip(pending, parsed) if not self._is_valid_analysis(result)]
+        retried = dict(zip(retry, await asyncio.gather(
+            *(self._analyze_resume(resume_content, job_descriptions[i], "full") for i in retry))))
+        for i, result in zip(pending, parsed):
+            if i in retried:
+                result = retried[i]
+                if result.pop("_fallback", False) or not self._is_valid_analysis(result):
+                    results[i] = result
+                    continue
+            if self.cache is not None:
+                await self.cache.set(keys[i], result)
+                result = {**result, "cache": "miss" if use_cache else "refresh"}
+            results[i] = result
+        return results
+
+    @staticmethod
+    def _is_valid_analysis(result) -> bool:
+        try:
+            AnalyzeResumeResponse.model_validate(result)
+        except ValidationError:
+            return False
+        return True
+
+    def _cache_key(self, resume_content: str, job_description: str, mode: str) -> str:
+        return self.cache.make_key(resume_content, job_description, MODEL_NAME, ANALYSIS_TEMPERATURE,
+                                   f"{ANALYSIS_PROMPT_VERSION}:{self.compactor.fingerprint}:{mode}")
+
+    async def _analyze_resume(self, resume_content: str, job_description: str, mode: str) -> Dict:
+        with span("prompt_build"):
+            compact_resume = self.compactor.resume(resume_content)
+            compact_job = self.compactor.job_description(job_description)
+            if mode == "hybrid":
+                report = await asyncio.to_thread(self.scorer.score, resume_content, job_description)
+                prompt = self._build_hybrid_analysis_prompt(compact_resume, compact_job, report)
+            else:
+                report = None
+                prompt = self._build_analysis_prompt(compact_resume, compact_job)
+        raw_response = await self._make_request(prompt, temperature=ANALYSIS_TEMPERATURE)
+
+        try:
+            with span("json_parse"):
+                result = self._parse_json_response(raw_response)
+        except json.JSONDecodeError as e:
+            return {"optimization": {"missing_keywords": [f"Failed to parse JSON response: {e}"], "skill_gaps": [],
+                                     "suggestions": ["Ensure the model outputs valid JSON."], "match_percentage": 0.0},
+                    "ats": {"score": 0, "feedback": [f"Failed to parse JSON response: {e}"], "keyword_matches": {},
+                            "formatting_issues": [], "recommendations": ["Check prompt and output formatting."]},
+                    "_fallback": True}
+
+        if report is not None:
+            result.setdefault("optimization", {})
+            result.setdefault("ats", {})
+            result["optimization"]["missing_keywords"] = report["missing"]
+            result["optimization"]["match_percentage"] = report["match_percentage"]
+            result["ats"]["keyword_matches"] = {"exact": report["exact"], "partial": report["partial"]}
+        return result
+
+    @staticmethod
+    def _parse_json_response(raw_response: str) -> Dict:
+        json_str = raw_response.strip()
 
-        response = await self.model.generate_content_async(prompt, generation_config=generation_config,
-                                                           tool_config=None)
+        if "```json" in json_str:
+            start = json_str.find("```json") + len("```json")
+            end = json_str.rfind("```")
+            if start != -1 and end != -1 and end > start:
+                json_str = json_str[start:end].strip()
+            else:
+                json_str = json_str.replace("```json", "").replace("```", "").strip()
+        elif "```" in json_str:
+            start = json_str.find("```") + len("```")
+            end = json_str.rfind("```")
+            if start != -1 and end != -1 and end > start:
+                json_str = json_str[start:end].strip()
+            else:
+                json_str = json_str.replace("```", "").strip()
+
+        if not json_str or not json_str.startswith("{") or not json_str.endswith("}"):
+            raise ValueError("Model response is not a valid JSON object.")
 
-        if response.candidates:
-            return response.candidates[0].content.parts[0].text
-        return ""
+        return json.loads(json_str)
 
-    async def analyze_resume(self, resume_content: str, job_description: str) -> Dict[str, Dict]:
-        prompt = f"""
+    @staticmethod
+    def _build_analysis_prompt(resume_content: str, job_description: str) -> str:
+        return f"""
 You are an expert resume analyst and ATS (Applicant Tracking System) compatibility checker.
 Analyze the given resume against the job description.
 Identify missing keywords, skill gaps, and provide actionable suggestions to optimize the resume for ATS and recruiters.
@@ -69,37 +236,130 @@ Resume Content:
 
 Strictly follow the JSON format.
 """
-        raw_response = await self._make_request(prompt, temperature=0.3)
-        json_str = raw_response.strip()
 
-        if "```json" in json_str:
-            start = json_str.find("```json") + len("```json")
-            end = json_str.rfind("```")
-            if start != -1 and end != -1 and end > start:
-                json_str = json_str[start:end].strip()
-            else:
-                json_str = json_str.replace("```json", "").replace("```", "").strip()
-        elif "```" in json_str:
-            start = json_str.find("```") + len("```")
-            end = json_str.rfind("```")
-            if start != -1 and end != -1 and end > start:
-                json_str = json_str[start:end].strip()
-            else:
-                json_str = json_str.replace("```", "").strip()
+    @staticmethod
+    def _build_packed_analysis_prompt(resume_content: str, job_descriptions: List[str]) -> str:
+        job_sections = "\n\n".join(
+            f"Job Description #{i + 1}:\n---\n{jd}\n---" for i, jd in enumerate(job_descriptions))
+        return f"""
+You are an expert resume analyst and ATS (Applicant Tracking System) compatibility checker.
+Analyze the given resume separately against each of the {len(job_descriptions)} job descriptions below.
+Identify missing keywords, skill gaps, and provide actionable suggestions to optimize the resume for ATS and recruiters.
 
-        if not json_str or not json_str.startswith("{") or not json_str.endswith("}"):
-            raise ValueError("Model response is not a valid JSON object.")
+Output ONLY a JSON object with a "results" array holding exactly one entry per job description, in the same order,
+each entry in this format:
 
-        try:
-            return json.loads(json_str)
-        except json.JSONDecodeError as e:
-            return {"optimization": {"missing_keywords": [f"Failed to parse JSON response: {e}"], "skill_gaps": [],
-                                     "suggestions": ["Ensure the model outputs valid JSON."], "match_percentage": 0.0},
-                    "ats": {"score": 0, "feedback": [f"Failed to parse JSON response: {e}"], "keyword_matches": {},
-                            "formatting_issues": [], "recommendations": ["Check prompt and output formatting."]}}
+{{
+    "optimization": {{
+        "missing_keywords": [],
+        "skill_gaps": [],
+        "suggestions": [],
+        "match_percentage": 0.0
+    }},
+    "ats": {{
+        "score": 0,
+        "feedback": [],
+        "keyword_matches": {{
+            "exact": [],
+            "partial": []
+        }},
+        "formatting_issues": [],
+        "recommendations": []
+    }}
+}}
+
+{job_sections}
+
+Resume Content:
+---
+{resume_content}
+---
+
+Strictly follow the JSON format.
+"""
+
+    @staticmethod
+    def _build_hybrid_analysis_prompt(resume_content: str, job_description: str, report: Dict) -> str:
+        terms = set(report["terms"])
+        requirement_lines = [line.strip() for line in job_description.splitlines() if
+                             line.strip() and any(term in line.lower() for term in terms)]
+        return f"""
+You are an expert resume analyst and ATS (Applicant Tracking System) compatibility checker.
+Keyword matching has already been done. Do not repeat it; focus on skill gaps, suggestions and overall ATS fit.
+
+Output ONLY a JSON object in this format:
+
+{{
+    "optimization": {{
+        "skill_gaps": [],
+        "suggestions": []
+    }},
+    "ats": {{
+        "score": 0,
+        "feedback": [],
+        "formatting_issues": [],
+        "recommendations": []
+    }}
+}}
+
+Key requirements from the job description:
+---
+{chr(10).join(requirement_lines)}
+---
+
+Keywords found in the resume: {", ".join(report["exact"] + report["partial"]) or "none"}
+Keywords missing from the resume: {", ".join(report["missing"]) or "none"}
+
+Resume Content:
+---
+{resume_content}
+---
+
+Strictly follow the JSON format.
+"""
 
     async def generate_cover_letter(self, job_description: str, company_name: str, position_title: str,
                                     resume_content: Optional[str] = None, tone: str = "professional") -> Dict:
+        with span("prompt_build"):
+            prompt = self._build_cover_letter_prompt(self.compactor.job_description(job_description), company_name,
+                                                     position_title,
+                                                     self.compactor.resume(resume_content) if resume_content else None,
+                                                     tone)
+        try:
+            content = await self._make_request(prompt, temperature=COVER_LETTER_TEMPERATURE)
+            return {"content": content.strip()}
+        except LLMUnavailableError:
+            raise
+        except Exception as e:
+            return {"content": f"Error generating cover letter: {str(e)}", "error": str(e) or e.__class__.__name__}
+
+    async def stream_cover_letter(self, job_description: str, company_name: str, position_title: str,
+                                  resume_content: Optional[str] = None,
+                                  tone: str = "professional") -> AsyncIterator[str]:
+        with span("prompt_build"):
+            prompt = self._build_cover_letter_prompt(self.compactor.job_description(job_description), company_name,
+                                                     position_title,
+                                                     self.compactor.resume(resume_content) if resume_content else None,
+                                                     tone)
+        self.start()
+        stream = self.client.stream(prompt, generation_config=self._generation_config(COVER_LETTER_TEMPERATURE),
+                                    tool_config=None)
+        response_chars, usage = 0, None
+        try:
+            with span("llm"):
+                async with aclosing(stream):
+                    async for chunk in stream:
+                        usage = getattr(chunk, "usage_metadata", None) or usage
+                        if chunk.candidates and chunk.candidates[0].content.parts:
+                            text = chunk.candidates[0].content.parts[0].text
+                            response_chars += len(text)
+                            yield text
+        finally:
+            record_llm_call("stream", len(prompt), response_chars, usage)
+
+    @staticmethod
+    def _build_cover_letter_prompt(job_description: str, company_name: str, position_title: str,
+                                   resume_content: Optional[str], tone: str) -> str:
         today_str = datetime.datetime.now().strftime("%B %d, %Y")
 
         tone_instructions = {"formal": "Use formal, traditional business language.",
@@ -141,36 +401,18 @@ Cover Letter Structure:
 - Specify why you are interested in the position **{position_title}** at **{company_name}**.
 - Highlight your main strengths and skills relevant to the role.
 
-Example: 
-"I am a second year master’s student in MIT’s Technology and Policy Program (TPP) writing to apply for a consulting position in Navigant’s Emerging Technology & Business Strategy group. After speaking with John Smith at the MIT career fair, I realized that Navigant’s values of excellence, continuous development, entrepreneurial spirit, and integrity align with my principles. Moreover, I believe my knowledge of the energy sector, passion for data analysis, polished communication skills, and four years of consulting experience will enable me to deliver superior value for Navigant’s clients."
-
 2. Body (2-3 paragraphs):
 - Provide 2-3 concrete examples supporting your suitability.
 - Do not merely repeat your resume; add context and detail.
 - Link your skills directly to the role.
 
-Example:
-"As a graduate student in MIT’s Technology and Policy Program, I conduct research at the cutting edge of the energy sector, using statistical analysis to investigate trends in public acceptance of emerging technologies. Graduate classes and hands-on projects have prepared me to help Navigant excel. My leadership roles in student initiatives further demonstrate my ability to manage projects and collaborate effectively."
-
-"Before MIT, my consulting experience at LMN Research Group and XYZ Consulting honed my technical writing, visual communication, and client engagement skills. These experiences align well with Navigant’s requirements for this role."
-
 3. Closing (final paragraph):
 - Reaffirm your enthusiasm and fit.
 - Thank the reader and express interest in further discussion.
 
-Example:
-"I take pride in my critical thinking, communication, and leadership skills. These align well with Navigant’s values, and I look forward to contributing to your team. Thank you for your time and consideration, and I welcome the opportunity to discuss my qualifications further."
-
 JOB DESCRIPTION:
-{job_description}
-
-RESUME (for reference):
-{resume_section}
+{job_description}{resume_section}
 
 Write the full cover letter with appropriate greetings and closing, do NOT include placeholders like "[Your Name]". Generate plausible professional names and contact info if needed.
 '''
-        try:
-            content = await self._make_request(prompt, temperature=0.7)
-            return {"content": content.strip()}
-        except Exception as e:
-            return {"content": f"Error generating cover letter: {str(e)}"}
+        return prompt
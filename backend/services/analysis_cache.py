@@ -0,0 +1,96 @@
+import copy
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import PyMongoError
+
+logger = logging.getLogger(__name__)
+
+
+class AnalysisCache:
+    def __init__(self):
+        self.ttl = int(os.getenv("ANALYSIS_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+        self.max_entries = int(os.getenv("ANALYSIS_CACHE_MAX_ENTRIES", "1024"))
+        self.max_bytes = int(os.getenv("ANALYSIS_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+        self.db: Optional[AsyncIOMotorDatabase] = None
+        self._entries: "OrderedDict[str, Tuple[float, int, Dict]]" = OrderedDict()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def attach(self, db: AsyncIOMotorDatabase):
+        self.db = db
+
+    @staticmethod
+    def make_key(resume_content: str, job_description: str, model_name: str, temperature: float,
+                 prompt_version: str) -> str:
+        resume_hash = hashlib.sha256(resume_content.encode("utf-8")).hexdigest()
+        normalized_jd = re.sub(r"\s+", " ", job_description).strip()
+        jd_hash = hashlib.sha256(normalized_jd.encode("utf-8")).hexdigest()
+        raw_key = f"{resume_hash}:{jd_hash}:{model_name}:{temperature}:{prompt_version}"
+        return hashlib.sha256(raw_key.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def lookup_query(key: str) -> Dict:
+        return {"_id": key, "expires_at": {"$gt": datetime.utcnow()}}
+
+    async def get(self, key: str) -> Optional[Dict]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, _, value = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(value)
+            self._evict(key)
+
+        if self.db is not None:
+            try:
+                doc = await self.db.analysis_cache.find_one(self.lookup_query(key))
+            except PyMongoError as e:
+                logger.warning("Analysis cache lookup failed: %s", e)
+                doc = None
+            if doc:
+                remaining = (doc["expires_at"] - datetime.utcnow()).total_seconds()
+                self._store_local(key, doc["result"], remaining)
+                self.hits += 1
+                return doc["result"]
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, value: Dict):
+        self._store_local(key, value, self.ttl)
+        if self.db is None:
+            return
+        now = datetime.utcnow()
+        try:
+            await self.db.analysis_cache.replace_one({"_id": key}, {"result": value, "created_at": now,
+                                                                    "expires_at": now + timedelta(seconds=self.ttl)},
+                                                     upsert=True)
+        except PyMongoError as e:
+            logger.warning("Analysis cache write failed: %s", e)
+
+    def _store_local(self, key: str, value: Dict, ttl: float):
+        size = len(json.dumps(value, default=str))
+        if size > self.max_bytes:
+            return
+        self._evict(key)
+        self._entries[key] = (time.monotonic() + ttl, size, copy.deepcopy(value))
+        self._size += size
+        while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._evict(oldest)
+
+    def _evict(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry[1]
@@ -0,0 +1,200 @@
+import asyncio
+import codecs
+import csv
+import json
+import os
+from datetime import datetime, timezone
+from itertools import islice
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pydantic import ValidationError
+from pymongo.errors import BulkWriteError
+
+from models import ApplicationRequest
+from services.application_service import EXPORT_COLUMNS
+from services.application_stats import ApplicationStats
+from services.semantic_index import VECTOR_FIELD, SemanticIndex, application_text
+
+IMPORT_FORMATS = ("csv", "xlsx", "ndjson")
+IMPORT_FIELDS = set(ApplicationRequest.model_fields)
+IMPORT_HEADERS = {**{field: field for field in IMPORT_FIELDS},
+                  **{header.lower(): field for header, field in EXPORT_COLUMNS.values() if field in IMPORT_FIELDS}}
+DEDUPE_FIELDS = ("company_name", "position_title", "application_date")
+DEDUPE_PROJECTION = dict.fromkeys(DEDUPE_FIELDS, 1)
+
+
+class ImportFormatError(Exception):
+    pass
+
+
+class ImportFileError(Exception):
+    pass
+
+
+def detect_import_format(filename: Optional[str], requested: Optional[str] = None) -> str:
+    import_format = (requested or os.path.splitext(filename or "")[1].lstrip(".")).lower()
+    if import_format in ("jsonl", "json"):
+        import_format = "ndjson"
+    if import_format not in IMPORT_FORMATS:
+        raise ImportFormatError(f"Unsupported import format. Choose one of: {', '.join(IMPORT_FORMATS)}")
+    return import_format
+
+
+def _field_name(header) -> Optional[str]:
+    if header is None:
+        return None
+    header = str(header).strip().lower()
+    return IMPORT_HEADERS.get(header) or IMPORT_HEADERS.get(header.replace(" ", "_"))
+
+
+def _clean_row(raw: Dict) -> Dict:
+    row = {}
+    for header, value in raw.items():
+        field = _field_name(header)
+        if field is None:
+            continue
+        if isinstance(value, str):
+            value = value.strip()
+        if value in ("", None):
+            continue
+        if field == "status" and isinstance(value, str):
+            value = value.lower().replace(" ", "_")
+        row[field] = value
+    return row
+
+
+def dedupe_query(keys: List[Tuple]) -> Dict:
+    return {"$or": [dict(zip(DEDUPE_FIELDS, key)) for key in set(keys)]}
+
+
+def _naive_utc(value):
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _csv_rows(file: BinaryIO) -> Iterator[Tuple[int, Dict]]:
+    reader = csv.DictReader(codecs.getreader("utf-8-sig")(file))
+    for row in reader:
+        yield reader.line_num, row
+
+
+def _ndjson_rows(file: BinaryIO) -> Iterator[Tuple[int, Dict]]:
+    for line_number, line in enumerate(codecs.getreader("utf-8-sig")(file), start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_number, ValueError(f"Invalid JSON: {e.msg}")
+            continue
+        yield line_number, row if isinstance(row, dict) else ValueError("Expected a JSON object")
+
+
+def _xlsx_rows(file: BinaryIO) -> Iterator[Tuple[int, Dict]]:
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        headers = next(rows, ())
+        for row_number, values in enumerate(rows, start=2):
+            if any(value not in (None, "") for value in values):
+                yield row_number, dict(zip(headers, values))
+    finally:
+        workbook.close()
+
+
+ROW_READERS = {"csv": _csv_rows, "ndjson": _ndjson_rows, "xlsx": _xlsx_rows}
+
+
+class ApplicationImporter:
+    def __init__(self, stats: ApplicationStats, semantic_index: SemanticIndex):
+        self.stats = stats
+        self.semantic_index = semantic_index
+        self.batch_size = int(os.getenv("IMPORT_BATCH_SIZE", "1000"))
+        self.max_rows = int(os.getenv("IMPORT_MAX_ROWS", "100000"))
+        self.max_errors = int(os.getenv("IMPORT_MAX_ERRORS", "500"))
+
+    async def import_file(self, db: AsyncIOMotorDatabase, file: BinaryIO, import_format: str,
+                          dedupe: bool = False) -> dict:
+        summary = {"format": import_format, "total_rows": 0, "inserted": 0, "duplicates": 0, "failed": 0,
+                   "truncated": False, "errors": []}
+        rows = ROW_READERS[import_format](file)
+        seen = set()
+        while batch := await self._next_batch(rows, summary):
+            if summary["total_rows"] + len(batch) > self.max_rows:
+                batch = batch[:self.max_rows - summary["total_rows"]]
+                summary["truncated"] = True
+            summary["total_rows"] += len(batch)
+            documents, row_numbers = await asyncio.to_thread(self._validate, batch, summary)
+            if dedupe:
+                documents, row_numbers = await self._drop_duplicates(db, documents, row_numbers, seen, summary)
+            await self._insert(db, documents, row_numbers, summary)
+            if summary["truncated"]:
+                break
+        return summary
+
+    async def _next_batch(self, rows: Iterator[Tuple[int, Dict]], summary: dict) -> List[Tuple[int, Dict]]:
+        try:
+            return await asyncio.to_thread(lambda: list(islice(rows, self.batch_size)))
+        except Exception as e:
+            raise ImportFileError(f"Could not read {summary['format']} file after {summary['inserted']} inserted rows: "
+                                  f"{e}")
+
+    def _validate(self, batch: List[Tuple[int, Dict]], summary: dict) -> Tuple[List[Dict], List[int]]:
+        documents, row_numbers = [], []
+        now = datetime.utcnow()
+        for row_number, raw in batch:
+            if isinstance(raw, Exception):
+                self._fail(summary, row_number, [str(raw)])
+                continue
+            try:
+                application = ApplicationRequest.model_validate(_clean_row(raw))
+            except ValidationError as e:
+                self._fail(summary, row_number, [f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+                                                 for error in e.errors()])
+                continue
+            document = {**{field: _naive_utc(value) for field, value in application.model_dump().items()},
+                        "status": application.status.value, "created_at": now, "updated_at": now}
+            document[VECTOR_FIELD] = self.semantic_index.vectorize(application_text(document))
+            documents.append(document)
+            row_numbers.append(row_number)
+        return documents, row_numbers
+
+    async def _drop_duplicates(self, db: AsyncIOMotorDatabase, documents: List[Dict], row_numbers: List[int],
+                               seen: set, summary: dict) -> Tuple[List[Dict], List[int]]:
+        keys = [tuple(document[field] for field in DEDUPE_FIELDS) for document in documents]
+        existing = set()
+        if keys:
+            async for document in db.applications.find(dedupe_query(keys), DEDUPE_PROJECTION):
+                existing.add(tuple(document.get(field) for field in DEDUPE_FIELDS))
+        kept_documents, kept_rows = [], []
+        for document, row_number, key in zip(documents, row_numbers, keys):
+            if key in existing or key in seen:
+                summary["duplicates"] += 1
+                continue
+            seen.add(key)
+            kept_documents.append(document)
+            kept_rows.append(row_number)
+        return kept_documents, kept_rows
+
+    async def _insert(self, db: AsyncIOMotorDatabase, documents: List[Dict], row_numbers: List[int], summary: dict):
+        if not documents:
+            return
+        failed = {}
+        try:
+            await db.applications.insert_many(documents, ordered=False)
+        except BulkWriteError as e:
+            failed = {error["index"]: error.get("errmsg", "Write failed") for error in e.details.get("writeErrors", [])}
+        for index, message in failed.items():
+            self._fail(summary, row_numbers[index], [message])
+        inserted = [document for index, document in enumerate(documents) if index not in failed]
+        summary["inserted"] += len(inserted)
+        await self.stats.record_bulk_create(db, [(document["status"], document["created_at"]) for document in inserted])
+
+    def _fail(self, summary: dict, row_number: int, errors: List[str]):
+        summary["failed"] += 1
+        if len(summary["errors"]) < self.max_errors:
+            summary["errors"].append({"row": row_number, "errors": errors})
@@ -1,81 +1,169 @@
+import asyncio
+import csv
 import io
+import json
+import os
+import tempfile
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import AsyncIterator, List, Optional
 
-import pandas as pd
 from fastapi.responses import StreamingResponse
-from models import StatusCount, ApplicationResponse
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from services.application_stats import ApplicationStats
+from services.pagination import KEYSET_SORT
+from services.semantic_index import VECTOR_FIELD
+
+APPLICATION_SUMMARY_PROJECTION = {"job_description": 0, "notes": 0, VECTOR_FIELD: 0}
+
+EXPORT_COLUMNS = {"company_name": ("Company", "company_name"), "position_title": ("Position", "position_title"),
+                  "status": ("Status", "status"), "location": ("Location", "location"),
+                  "salary_range": ("Salary Range", "salary_range"),
+                  "application_url": ("Application URL", "application_url"),
+                  "application_date": ("Application Date", "application_date"),
+                  "interview_date": ("Interview Date", "interview_date"),
+                  "follow_up_date": ("Follow Up Date", "follow_up_date"), "notes": ("Notes", "notes"),
+                  "job_description": ("Description", "job_description"), "created_at": ("Created At", "created_at"),
+                  "updated_at": ("Updated At", "updated_at")}
+DEFAULT_EXPORT_COLUMNS = ["position_title", "status", "application_date", "interview_date", "job_description"]
+EXPORT_FORMATS = ("xlsx", "csv", "ndjson")
+EXPORT_BATCH_SIZE = 1000
+EXPORT_CHUNK_BYTES = 64 * 1024
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+def _export_cell(value) -> str:
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d")
+    return "" if value is None else str(getattr(value, "value", value))
+
+
+def status_filter(status: Optional[str]) -> dict:
+    return {"status": status} if status else {}
+
+
+def recent_applications_query(now: datetime) -> dict:
+    return {"created_at": {"$gt": now - timedelta(days=30)}}
+
+
+def export_projection(columns: Optional[List[str]] = None) -> dict:
+    return {EXPORT_COLUMNS[column][1]: 1 for column in columns or DEFAULT_EXPORT_COLUMNS}
 
 
 class ApplicationService:
-    async def get_analytics(self, db: AsyncIOMotorDatabase) -> dict:
-        applications = []
-        async for app in db.applications.find({}):
-            app["_id"] = str(app["_id"])
-            applications.append(app)
+    def __init__(self):
+        self.stats = ApplicationStats()
 
-        total_applications = len(applications)
+    async def get_analytics(self, db: AsyncIOMotorDatabase) -> dict:
+        totals = await self.stats.get_totals(db)
+        status_counts = {status: count for status, count in totals.get("status", {}).items() if count > 0}
+        total_applications = totals.get("total", 0)
 
-        if total_applications == 0:
+        if total_applications <= 0:
             return {"total_applications": 0, "status_breakdown": [], "recent_applications": [], "interview_rate": 0.0,
                     "success_metrics": {}}
 
-        status_counts = {}
-        for app in applications:
-            status = app.get("status", "applied")
-            status_counts[status] = status_counts.get(status, 0) + 1
-
-        status_breakdown = [StatusCount(status=status, count=count) for status, count in status_counts.items()]
+        status_breakdown = [{"status": status, "count": count} for status, count in status_counts.items()]
 
-        thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-        recent_applications = [ApplicationResponse(**app) for app in applications if
-                               app.get("created_at", datetime.min) > thirty_days_ago]
-        recent_applications.sort(key=lambda x: x.created_at, reverse=True)
-        recent_applications = recent_applications[:10]
+        recent_applications = []
+        async for app in db.applications.find(recent_applications_query(datetime.utcnow()),
+                                              APPLICATION_SUMMARY_PROJECTION).sort(KEYSET_SORT).limit(10):
+            app["_id"] = str(app["_id"])
+            recent_applications.append(app)
 
         interview_statuses = {"interview_scheduled", "interview_completed", "offer"}
-        interview_count = sum(1 for app in applications if app.get("status") in interview_statuses)
+        interview_count = sum(count for status, count in status_counts.items() if status in interview_statuses)
         interview_rate = (interview_count / total_applications) * 100
 
         offers_count = status_counts.get("offer", 0)
         rejections_count = status_counts.get("rejected", 0)
+        applications_this_month = await self.stats.count_created_since(db, days=30)
 
         success_metrics = {"offer_rate": (offers_count / total_applications) * 100,
                            "rejection_rate": (rejections_count / total_applications) * 100,
                            "pending_applications": status_counts.get("applied", 0), "total_interviews": interview_count,
-                           "applications_this_month": sum(
-                               1 for app in applications if app.get("created_at", datetime.min) > thirty_days_ago)}
+                           "applications_this_month": applications_this_month}
 
         return {"total_applications": total_applications, "status_breakdown": status_breakdown,
                 "recent_applications": recent_applications, "interview_rate": interview_rate,
                 "success_metrics": success_metrics}
 
-    async def export_applications_to_excel(self, db, status: Optional[str] = None):
-        query = {}
-        if status:
-            query["status"] = status
-
-        applications = []
-        async for app in db.applications.find(query):
-            filtered_app = {"Position": app.get("position_title") or "", "Status": app.get("status") or "",
-                            "Application Date": app.get("application_date").strftime("%Y-%m-%d") if isinstance(
-                                app.get("application_date"), datetime) else (app.get("application_date") or ""),
-                            "Interview Date": app.get("interview_date").strftime("%Y-%m-%d") if isinstance(
-                                app.get("interview_date"), datetime) else (app.get("interview_date") or ""),
-                            "Description": app.get("job_description") or "", }
-            applications.append(filtered_app)
-
-        if not applications:
+    async def export_applications(self, db, status: Optional[str] = None, export_format: str = "xlsx",
+                                  columns: Optional[List[str]] = None):
+        columns = columns or DEFAULT_EXPORT_COLUMNS
+        cursor = db.applications.find(status_filter(status), export_projection(columns)).sort(KEYSET_SORT).batch_size(
+            EXPORT_BATCH_SIZE)
+
+        first = await anext(cursor, None)
+        if first is None:
             return StreamingResponse(io.BytesIO(b"No applications found."), media_type="text/plain",
                                      headers={"Content-Disposition": "attachment; filename=empty.txt"})
 
-        df = pd.DataFrame(applications)
-
-        output = io.BytesIO()
-        with pd.ExcelWriter(output, engine="xlsxwriter") as writer:
-            df.to_excel(writer, index=False, sheet_name="Applications")
-        output.seek(0)
-
-        return StreamingResponse(output, media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                                 headers={"Content-Disposition": "attachment; filename=applications.xlsx"})
+        rows = self._export_rows(first, cursor, columns)
+        if export_format == "csv":
+            body, media_type = self._stream_csv(rows, columns), "text/csv; charset=utf-8"
+        elif export_format == "ndjson":
+            body, media_type = self._stream_ndjson(rows, columns), "application/x-ndjson"
+        else:
+            body, media_type = self._stream_xlsx(rows, columns), XLSX_MEDIA_TYPE
+        return StreamingResponse(body, media_type=media_type,
+                                 headers={"Content-Disposition": f"attachment; filename=applications.{export_format}"})
+
+    @staticmethod
+    async def _export_rows(first: dict, cursor, columns: List[str]) -> AsyncIterator[List[str]]:
+        fields = [EXPORT_COLUMNS[column][1] for column in columns]
+        yield [_export_cell(first.get(field)) for field in fields]
+        async for app in cursor:
+            yield [_export_cell(app.get(field)) for field in fields]
+
+    @staticmethod
+    async def _stream_csv(rows: AsyncIterator[List[str]], columns: List[str]) -> AsyncIterator[bytes]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow([EXPORT_COLUMNS[column][0] for column in columns])
+        async for row in rows:
+            writer.writerow(row)
+            if buffer.tell() >= EXPORT_CHUNK_BYTES:
+                yield buffer.getvalue().encode("utf-8")
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue().encode("utf-8")
+
+    @staticmethod
+    async def _stream_ndjson(rows: AsyncIterator[List[str]], columns: List[str]) -> AsyncIterator[bytes]:
+        chunk = []
+        size = 0
+        async for row in rows:
+            line = json.dumps(dict(zip(columns, row)), ensure_ascii=False) + "\n"
+            chunk.append(line)
+            size += len(line)
+            if size >= EXPORT_CHUNK_BYTES:
+                yield "".join(chunk).encode("utf-8")
+                chunk, size = [], 0
+        yield "".join(chunk).encode("utf-8")
+
+    @staticmethod
+    async def _stream_xlsx(rows: AsyncIterator[List[str]], columns: List[str]) -> AsyncIterator[bytes]:
+        import xlsxwriter
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "applications.xlsx")
+            workbook = xlsxwriter.Workbook(path, {"constant_memory": True})
+            worksheet = workbook.add_worksheet("Applications")
+            worksheet.write_row(0, 0, [EXPORT_COLUMNS[column][0] for column in columns])
+
+            def write_batch(start_row: int, batch: List[List[str]]):
+                for offset, row in enumerate(batch):
+                    worksheet.write_row(start_row + offset, 0, row)
+
+            row_number, batch = 1, []
+            async for row in rows:
+                batch.append(row)
+                if len(batch) >= EXPORT_BATCH_SIZE:
+                    await asyncio.to_thread(write_batch, row_number, batch)
+                    row_number, batch = row_number + len(batch), []
+            await asyncio.to_thread(write_batch, row_number, batch)
+            await asyncio.to_thread(workbook.close)
+
+            with open(path, "rb") as workbook_file:
+                while chunk := await asyncio.to_thread(workbook_file.read, EXPORT_CHUNK_BYTES):
+                    yield chunk
@@ -0,0 +1,140 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, Iterable, Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+logger = logging.getLogger(__name__)
+
+STATS_ID = "applications"
+DAY_FORMAT = "%Y-%m-%d"
+
+
+def _status_key(status) -> str:
+    return getattr(status, "value", status) or "applied"
+
+
+def _day(moment: Optional[datetime]) -> str:
+    return (moment or datetime.utcnow()).strftime(DAY_FORMAT)
+
+
+def daily_query(days: int) -> Dict:
+    return {"_id": {"$gte": _day(datetime.utcnow() - timedelta(days=days - 1))}}
+
+
+class ApplicationStats:
+    async def record_create(self, db: AsyncIOMotorDatabase, status, created_at: datetime):
+        await self.record_bulk_create(db, [(status, created_at)])
+
+    async def record_bulk_create(self, db: AsyncIOMotorDatabase, rows: Iterable):
+        totals: Dict[str, int] = {}
+        days: Dict[str, Dict[str, int]] = {}
+        for status, created_at in rows:
+            status = _status_key(status)
+            totals[f"status.{status}"] = totals.get(f"status.{status}", 0) + 1
+            bucket = days.setdefault(_day(created_at), {})
+            bucket["created"] = bucket.get("created", 0) + 1
+            bucket[f"entered.{status}"] = bucket.get(f"entered.{status}", 0) + 1
+        if not totals:
+            return
+        await self._inc_totals(db, {"total": sum(totals.values()), **totals})
+        for day, increments in days.items():
+            await self._inc_day(db, day, increments)
+
+    async def record_status_change(self, db: AsyncIOMotorDatabase, old_status, new_status, changed_at: datetime):
+        old_status, new_status = _status_key(old_status), _status_key(new_status)
+        if old_status == new_status:
+            return
+        await self._inc_totals(db, {f"status.{old_status}": -1, f"status.{new_status}": 1})
+        await self._inc_day(db, _day(changed_at), {f"entered.{new_status}": 1})
+
+    async def record_delete(self, db: AsyncIOMotorDatabase, status, created_at: Optional[datetime],
+                            deleted_at: datetime):
+        status = _status_key(status)
+        await self._inc_totals(db, {"total": -1, f"status.{status}": -1})
+        if created_at is not None:
+            await self._inc_day(db, _day(created_at), {"created": -1})
+        await self._inc_day(db, _day(deleted_at), {"deleted": 1})
+
+    async def ensure_initialized(self, db: AsyncIOMotorDatabase):
+        if await db.application_stats.find_one({"_id": STATS_ID}, {"_id": 1}) is None:
+            await self.reconcile(db)
+
+    async def get_totals(self, db: AsyncIOMotorDatabase) -> dict:
+        stats = await db.application_stats.find_one({"_id": STATS_ID})
+        if stats is None:
+            await self.reconcile(db)
+            stats = await db.application_stats.find_one({"_id": STATS_ID})
+        return stats
+
+    async def get_daily(self, db: AsyncIOMotorDatabase, days: int) -> list:
+        return await db.application_daily_stats.find(daily_query(days)).sort("_id", 1).to_list(length=days)
+
+    async def count_created_since(self, db: AsyncIOMotorDatabase, days: int) -> int:
+        return sum(bucket.get("created", 0) for bucket in await self.get_daily(db, days))
+
+    async def reconcile(self, db: AsyncIOMotorDatabase) -> dict:
+        pipeline = [{"$project": {"status": {"$ifNull": ["$status", "applied"]}, "created_at": 1}},
+                    {"$facet": {"status_counts": [{"$group": {"_id": "$status", "count": {"$sum": 1}}}],
+                                "daily": [{"$match": {"created_at": {"$type": "date"}}},
+                                          {"$group": {"_id": {"day": {"$dateToString": {"format": DAY_FORMAT,
+                                                                                        "date": "$created_at"}},
+                                                              "status": "$status"},
+                                                      "count": {"$sum": 1}}}]}}]
+        facets = (await db.applications.aggregate(pipeline).to_list(length=1))[0]
+
+        actual_status = {row["_id"]: row["count"] for row in facets["status_counts"]}
+        actual_daily: Dict[str, Dict[str, int]] = {}
+        for row in facets["daily"]:
+            bucket = actual_daily.setdefault(row["_id"]["day"], {})
+            bucket[row["_id"]["status"]] = row["count"]
+
+        stored = await db.application_stats.find_one({"_id": STATS_ID}) or {}
+        stored_status = {status: count for status, count in stored.get("status", {}).items() if count}
+        drift = {"total": stored.get("total", 0) - sum(actual_status.values()),
+                 "status": {status: stored_status.get(status, 0) - actual_status.get(status, 0) for status in
+                            set(stored_status) | set(actual_status) if
+                            stored_status.get(status, 0) != actual_status.get(status, 0)},
+                 "daily_created": {}}
+        async for bucket in db.application_daily_stats.find({}, {"created": 1}):
+            actual_created = sum(actual_daily.get(bucket["_id"], {}).values())
+            if bucket.get("created", 0) != actual_created:
+                drift["daily_created"][bucket["_id"]] = bucket.get("created", 0) - actual_created
+
+        now = datetime.utcnow()
+        await db.application_stats.replace_one({"_id": STATS_ID}, {"total": sum(actual_status.values()),
+                                                                  "status": actual_status, "updated_at": now,
+                                                                  "reconciled_at": now}, upsert=True)
+        for day, statuses in actual_daily.items():
+            await db.application_daily_stats.update_one({"_id": day}, {
+                "$set": {"created": sum(statuses.values()), "date": datetime.strptime(day, DAY_FORMAT)}},
+                                                        upsert=True)
+        await db.application_daily_stats.update_many({"_id": {"$nin": list(actual_daily)}}, {"$set": {"created": 0}})
+
+        drifted = bool(drift["total"] or drift["status"] or drift["daily_created"])
+        return {"drifted": drifted, "drift": drift, "total_applications": sum(actual_status.values()),
+                "reconciled_at": now}
+
+    async def reconcile_periodically(self, db: AsyncIOMotorDatabase, interval: float,
+                                     on_drift: Optional[Callable[[], Awaitable]] = None):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                report = await self.reconcile(db)
+                if report["drifted"] and on_drift is not None:
+                    await on_drift()
+            except Exception:
+                logger.exception("Application stats reconciliation failed")
+                continue
+            if report["drifted"]:
+                logger.warning("Application stats drift corrected: %s", report["drift"])
+
+    async def _inc_totals(self, db: AsyncIOMotorDatabase, increments: Dict[str, int]):
+        await db.application_stats.update_one({"_id": STATS_ID},
+                                              {"$inc": increments, "$set": {"updated_at": datetime.utcnow()}},
+                                              upsert=True)
+
+    async def _inc_day(self, db: AsyncIOMotorDatabase, day: str, increments: Dict[str, int]):
+        await db.application_daily_stats.update_one({"_id": day}, {
+            "$inc": increments, "$setOnInsert": {"date": datetime.strptime(day, DAY_FORMAT)}}, upsert=True)
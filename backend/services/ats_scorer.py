@@ -0,0 +1,214 @@
+import difflib
+import re
+from collections import Counter
+from typing import Dict, List, Set, Tuple
+
+import numpy as np
+
+STOPWORDS = frozenset("""
+a about above across after again against all also am an and any are as at be because been before being below between
+both but by can could did do does doing down during each either etc few for from further get had has have having he
+her here hers him his how i if in into is it its itself just may me might more most must my no nor not now of off
+on once only or other our ours out over own per plus same she should so some such than that the their theirs them
+then there these they this those through to too under until up upon us very via was we well were what when where
+which while who whom why will with within without would you your yours
+ability able candidate candidates company experience experienced familiarity good great ideal including job join
+knowledge looking new opportunity preferred proficiency related required requirement requirements responsibilities
+role skills strong team understanding using work working year years
+applicant applicants benefit benefits build day days employer employment environment equal help junior nice offer
+salary senior
+""".split())
+
+SKILL_PHRASES = frozenset(tuple(phrase.split()) for phrase in (
+    "machine learning", "deep learning", "data science", "data analysis", "data engineering", "computer science",
+    "natural language processing", "computer vision", "distributed systems", "system design", "unit testing",
+    "project management", "product management", "customer service", "continuous integration", "version control",
+    "cloud computing", "software development", "web development", "front end", "back end", "full stack",
+    "object oriented", "agile methodologies", "business intelligence", "financial modeling", "technical writing",
+))
+
+SECTION_HEADINGS = ("experience", "education", "skills")
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*(?:[./\-][a-z0-9+#]+)*")
+_SENTENCE_RE = re.compile(r"[\n;•●▪]+|(?<=[a-z0-9)])[.!?](?=\s)")
+_EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+\.[\w.]+")
+_PHONE_RE = re.compile(r"\+?\d[\d\s().-]{7,}\d")
+_ALPHABET = {c: i for i, c in enumerate("abcdefghijklmnopqrstuvwxyz0123456789+#./-")}
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def stem(token: str) -> str:
+    if len(token) <= 4 or not token.isalpha():
+        return token
+    if token.endswith("ies"):
+        return token[:-3] + "y"
+    if token.endswith(("sses", "ches", "shes", "xes", "zes")):
+        return token[:-2]
+    if token.endswith("s") and not token.endswith(("ss", "us", "is")):
+        return token[:-1]
+    for suffix in ("ing", "ed"):
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+            return token[:-len(suffix)]
+    return token
+
+
+def _is_stopword(token: str) -> bool:
+    return token in STOPWORDS or stem(token) in STOPWORDS
+
+
+def _ngrams(tokens: List[str], max_n: int) -> List[Tuple[str, ...]]:
+    grams = []
+    for n in range(1, max_n + 1):
+        for i in range(len(tokens) - n + 1):
+            gram = tuple(tokens[i:i + n])
+            if _is_stopword(gram[0]) or _is_stopword(gram[-1]):
+                continue
+            if n == 1 and (len(gram[0]) < 2 or not any(c.isalpha() for c in gram[0])):
+                continue
+            grams.append(gram)
+    return grams
+
+
+class _FuzzyVocabulary:
+    def __init__(self, words: List[str], cutoff: float):
+        self.words = words
+        self.cutoff = cutoff
+        self.lengths = np.fromiter(map(len, words), dtype=np.int64, count=len(words))
+        self.counts = np.zeros((len(words), len(_ALPHABET) + 1), dtype=np.int32)
+        np.add.at(self.counts, (np.repeat(np.arange(len(words)), self.lengths), self._codes("".join(words))), 1)
+
+    @staticmethod
+    def _codes(text: str) -> np.ndarray:
+        return np.fromiter((_ALPHABET.get(c, len(_ALPHABET)) for c in text), dtype=np.int64, count=len(text))
+
+    def has_close_match(self, token: str) -> bool:
+        # Shared characters bound difflib's ratio from above (it is exactly quick_ratio), so one vectorised pass
+        # leaves only the few words that could reach the cutoff for SequenceMatcher.
+        overlap = np.minimum(self.counts, np.bincount(self._codes(token), minlength=self.counts.shape[1])).sum(1)
+        within = np.flatnonzero(2 * overlap >= self.cutoff * (self.lengths + len(token)) - 1e-9)
+        return bool(len(within) and difflib.get_close_matches(token, [self.words[i] for i in within], 1,
+                                                                  self.cutoff))
+
+
+class ATSScorer:
+    def __init__(self, max_terms: int = 40, max_ngram: int = 3, fuzzy_cutoff: float = 0.8):
+        self.max_terms = max_terms
+        self.max_ngram = max_ngram
+        self.fuzzy_cutoff = fuzzy_cutoff
+
+    def extract_terms(self, job_description: str) -> Tuple[List[str], np.ndarray]:
+        sentences = [tokenize(s) for s in _SENTENCE_RE.split(job_description)]
+        sentences = [s for s in sentences if s]
+        if not sentences:
+            return [], np.zeros(0)
+
+        term_freq: Counter = Counter()
+        doc_freq: Counter = Counter()
+        surface: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+        for tokens in sentences:
+            grams = _ngrams(tokens, self.max_ngram)
+            stemmed = [tuple(stem(t) for t in gram) for gram in grams]
+            for gram, key in zip(grams, stemmed):
+                surface.setdefault(key, gram)
+            term_freq.update(stemmed)
+            doc_freq.update(set(stemmed))
+
+        keys = list(term_freq)
+        tf = np.fromiter((term_freq[k] for k in keys), dtype=np.float64, count=len(keys))
+        df = np.fromiter((doc_freq[k] for k in keys), dtype=np.float64, count=len(keys))
+        lengths = np.fromiter((len(k) for k in keys), dtype=np.float64, count=len(keys))
+        known = np.fromiter((surface[k] in SKILL_PHRASES for k in keys), dtype=bool, count=len(keys))
+        idf = np.log((1 + len(sentences)) / (1 + df)) + 1
+        weights = (1 + np.log(tf)) * idf * (1 + 0.5 * (lengths - 1))
+        # A phrase only counts as a key term when it repeats or is a known skill, otherwise every bigram of a
+        # sentence would qualify.
+        weights[(lengths > 1) & (tf < 2) & ~known] = 0
+
+        order = np.argsort(-weights, kind="stable")
+        selected: List[Tuple[str, ...]] = []
+        selected_weights: List[float] = []
+        for idx in order:
+            if weights[idx] <= 0 or len(selected) >= self.max_terms:
+                break
+            key = keys[idx]
+            if any(self._contains(other, key) and term_freq[other] >= term_freq[key] for other in selected):
+                continue
+            selected.append(key)
+            selected_weights.append(float(weights[idx]))
+
+        return [" ".join(surface[k]) for k in selected], np.asarray(selected_weights)
+
+    def score(self, resume_content: str, job_description: str) -> Dict:
+        terms, weights = self.extract_terms(job_description)
+        if not terms:
+            return {"match_percentage": 0.0, "exact": [], "partial": [], "missing": [], "terms": []}
+
+        resume_tokens = [stem(t) for t in tokenize(resume_content)]
+        resume_vocab: Set[str] = set(resume_tokens)
+        resume_grams = {tuple(resume_tokens[i:i + n]) for n in range(2, self.max_ngram + 1) for i in
+                        range(len(resume_tokens) - n + 1)}
+        fuzzy = None
+        close: Dict[str, bool] = {}
+
+        credit = np.zeros(len(terms))
+        exact, partial, missing = [], [], []
+        for i, term in enumerate(terms):
+            key = tuple(stem(t) for t in term.split())
+            if (len(key) == 1 and key[0] in resume_vocab) or key in resume_grams:
+                credit[i] = 1.0
+                exact.append(term)
+                continue
+            for t in key:
+                if t not in resume_vocab and t not in close:
+                    fuzzy = fuzzy or _FuzzyVocabulary(sorted(resume_vocab), self.fuzzy_cutoff)
+                    close[t] = fuzzy.has_close_match(t)
+            found = sum(1 for t in key if t in resume_vocab or close[t])
+            if found and found / len(key) >= 0.5:
+                credit[i] = 0.5 * found / len(key)
+                partial.append(term)
+            else:
+                missing.append(term)
+
+        match_percentage = float(np.dot(weights, credit) / weights.sum() * 100)
+        return {"match_percentage": round(match_percentage, 1), "exact": exact, "partial": partial,
+                "missing": missing, "terms": terms}
+
+    def formatting_issues(self, resume_content: str) -> List[str]:
+        issues = []
+        lowered = resume_content.lower()
+        if not _EMAIL_RE.search(resume_content):
+            issues.append("No email address detected.")
+        if not _PHONE_RE.search(resume_content):
+            issues.append("No phone number detected.")
+        for heading in SECTION_HEADINGS:
+            if heading not in lowered:
+                issues.append(f"No '{heading.title()}' section heading detected.")
+        word_count = len(resume_content.split())
+        if word_count > 1200:
+            issues.append(f"Resume is long ({word_count} words); consider trimming to two pages.")
+        elif word_count < 150:
+            issues.append(f"Resume is short ({word_count} words); ATS parsers may find little to match.")
+        return issues
+
+    def analyze(self, resume_content: str, job_description: str) -> Dict:
+        report = self.score(resume_content, job_description)
+        formatting_issues = self.formatting_issues(resume_content)
+        missing = report["missing"]
+        suggestions = [f"Mention '{term}' if it reflects your experience." for term in missing[:10]]
+        feedback = [f"Matched {len(report['exact'])} of {len(report['terms'])} key terms exactly and "
+                    f"{len(report['partial'])} partially."]
+        recommendations = ["Mirror the job description's wording for skills you already have."] if missing else []
+        return {"optimization": {"missing_keywords": missing, "skill_gaps": [], "suggestions": suggestions,
+                                 "match_percentage": report["match_percentage"]},
+                "ats": {"score": int(round(report["match_percentage"])), "feedback": feedback,
+                        "keyword_matches": {"exact": report["exact"], "partial": report["partial"]},
+                        "formatting_issues": formatting_issues, "recommendations": recommendations}}
+
+    @staticmethod
+    def _contains(longer: Tuple[str, ...], shorter: Tuple[str, ...]) -> bool:
+        if len(longer) <= len(shorter):
+            return False
+        return any(longer[i:i + len(shorter)] == shorter for i in range(len(longer) - len(shorter) + 1))
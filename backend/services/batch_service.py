@@ -0,0 +1,67 @@
+import asyncio
+from typing import AsyncIterator, Dict, List, Optional
+
+from pydantic import ValidationError
+
+from models import AnalyzeResumeResponse
+from services.ai_service import AIService
+
+
+class BatchItem:
+    def __init__(self, index: int, item_id: Optional[str], resume_content: str, job_description: str):
+        self.index = index
+        self.item_id = item_id
+        self.resume_content = resume_content
+        self.job_description = job_description
+
+
+class BatchAnalysisService:
+    def __init__(self, ai_service: AIService):
+        self.ai_service = ai_service
+
+    async def analyze_many(self, items: List[BatchItem], mode: str = "full", use_cache: bool = True,
+                           max_concurrency: int = 4, pack_size: int = 1) -> AsyncIterator[Dict]:
+        chunks = self._chunk(items, pack_size if mode == "full" else 1)
+        semaphore = asyncio.Semaphore(max_concurrency)
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def run_chunk(chunk: List[BatchItem]):
+            async with semaphore:
+                try:
+                    if len(chunk) == 1:
+                        results = [await self.ai_service.analyze_resume(chunk[0].resume_content,
+                                                                        chunk[0].job_description,
+                                                                        use_cache=use_cache, mode=mode)]
+                    else:
+                        results = await self.ai_service.analyze_resume_packed(
+                            chunk[0].resume_content, [item.job_description for item in chunk], use_cache=use_cache)
+                except Exception as e:
+                    results = [e] * len(chunk)
+            for item, result in zip(chunk, results):
+                await queue.put(self._to_line(item, result))
+
+        tasks = [asyncio.create_task(run_chunk(chunk)) for chunk in chunks]
+        try:
+            for _ in range(len(items)):
+                yield await queue.get()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    @staticmethod
+    def _chunk(items: List[BatchItem], pack_size: int) -> List[List[BatchItem]]:
+        by_resume: Dict[str, List[BatchItem]] = {}
+        for item in items:
+            by_resume.setdefault(item.resume_content, []).append(item)
+        return [group[i:i + pack_size] for group in by_resume.values() for i in range(0, len(group), pack_size)]
+
+    @staticmethod
+    def _to_line(item: BatchItem, result) -> Dict:
+        line = {"index": item.index, "id": item.item_id}
+        if isinstance(result, Exception):
+            return {**line, "status": "error", "error": str(result) or result.__class__.__name__}
+        try:
+            response = AnalyzeResumeResponse(**result)
+        except ValidationError as e:
+            return {**line, "status": "error", "error": f"Invalid analysis result: {e.error_count()} validation errors"}
+        return {**line, "status": "ok", "result": response.model_dump()}
@@ -0,0 +1,311 @@
+import asyncio
+import logging
+import os
+import random
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from models import AnalyzeResumeResponse
+from services.ai_service import AIService
+from services.llm_client import LLMUnavailableError
+
+logger = logging.getLogger(__name__)
+
+JOB_KINDS = ("analysis", "cover_letter")
+TERMINAL_STATUSES = ("succeeded", "failed")
+CLAIM_SORT = [("priority", -1), ("run_after", 1), ("_id", 1)]
+CLAIM_ATTEMPTS = 5
+EXPIRED_PROJECTION = {"tenant": 1, "attempts": 1, "max_attempts": 1, "worker_id": 1}
+RUNNING_BY_TENANT = [{"$match": {"status": "running"}}, {"$group": {"_id": "$tenant", "running": {"$sum": 1}}}]
+
+
+def claim_query(now: datetime, saturated: Set[str]) -> Dict:
+    query = {"status": "queued", "run_after": {"$lte": now}}
+    if saturated:
+        query["tenant"] = {"$nin": list(saturated)}
+    return query
+
+
+def expired_query(now: datetime) -> Dict:
+    return {"status": "running", "lease_until": {"$lt": now}}
+
+
+class JobError(Exception):
+    pass
+
+
+class JobQueue:
+    def __init__(self):
+        self.max_attempts = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+        self.lease_seconds = float(os.getenv("JOB_LEASE_SECONDS", "60"))
+        self.retry_base_seconds = float(os.getenv("JOB_RETRY_BASE_SECONDS", "5"))
+        self.tenant_max_running = int(os.getenv("JOB_TENANT_MAX_RUNNING", "2"))
+        self.result_ttl = int(os.getenv("JOB_RESULT_TTL_SECONDS", str(24 * 3600)))
+        self._wakeup = asyncio.Event()
+        self._finished: Dict[str, List] = {}
+        self._drifted: Dict[str, int] = {}
+
+    async def submit(self, db: AsyncIOMotorDatabase, kind: str, payload: Dict, tenant: str = "default",
+                     priority: int = 0) -> Dict:
+        now = datetime.utcnow()
+        job = {"kind": kind, "payload": payload, "tenant": tenant, "priority": priority, "status": "queued",
+               "attempts": 0, "max_attempts": self.max_attempts, "run_after": now, "created_at": now,
+               "updated_at": now}
+        result = await db.jobs.insert_one(job)
+        job["_id"] = result.inserted_id
+        self._wakeup.set()
+        return job
+
+    async def get(self, db: AsyncIOMotorDatabase, job_id: ObjectId) -> Optional[Dict]:
+        return await db.jobs.find_one({"_id": job_id}, {"payload": 0})
+
+    async def wait_for_job(self, job_id: str, timeout: float):
+        waiter = self._finished.setdefault(job_id, [asyncio.Event(), 0])
+        waiter[1] += 1
+        try:
+            await asyncio.wait_for(waiter[0].wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            waiter[1] -= 1
+            if waiter[1] == 0:
+                self._finished.pop(job_id, None)
+
+    async def wait_for_work(self, timeout: float):
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
+
+    async def claim(self, db: AsyncIOMotorDatabase, worker_id: str) -> Optional[Dict]:
+        saturated = await self._saturated_tenants(db)
+        for _ in range(CLAIM_ATTEMPTS):
+            now = datetime.utcnow()
+            candidate = await db.jobs.find_one(claim_query(now, saturated), {"tenant": 1}, sort=CLAIM_SORT)
+            if candidate is None:
+                return None
+            if not await self._reserve_slot(db, candidate["tenant"]):
+                saturated.add(candidate["tenant"])
+                continue
+            job = await db.jobs.find_one_and_update({"_id": candidate["_id"], "status": "queued"}, {
+                "$set": {"status": "running", "worker_id": worker_id, "started_at": now, "updated_at": now,
+                         "lease_until": now + timedelta(seconds=self.lease_seconds)}, "$inc": {"attempts": 1}},
+                                                    return_document=ReturnDocument.AFTER)
+            if job is not None:
+                return job
+            await self._release_slot(db, candidate["tenant"])
+        return None
+
+    async def renew(self, db: AsyncIOMotorDatabase, job: Dict, worker_id: str) -> bool:
+        now = datetime.utcnow()
+        result = await db.jobs.update_one({"_id": job["_id"], "status": "running", "worker_id": worker_id}, {
+            "$set": {"lease_until": now + timedelta(seconds=self.lease_seconds), "updated_at": now}})
+        return result.modified_count == 1
+
+    async def complete(self, db: AsyncIOMotorDatabase, job: Dict, worker_id: str, result: Dict):
+        await self._finish(db, job, worker_id, {"status": "succeeded", "result": result, "error": None})
+
+    async def fail(self, db: AsyncIOMotorDatabase, job: Dict, worker_id: str, error: str,
+                   retry_after: Optional[float] = None):
+        if retry_after is not None and job["attempts"] < job.get("max_attempts", self.max_attempts):
+            now = datetime.utcnow()
+            result = await db.jobs.update_one({"_id": job["_id"], "status": "running", "worker_id": worker_id}, {
+                "$set": {"status": "queued", "error": error, "updated_at": now,
+                         "run_after": now + timedelta(seconds=retry_after)},
+                "$unset": {"worker_id": "", "lease_until": ""}})
+            if result.modified_count:
+                await self._release_slot(db, job["tenant"])
+            return
+        await self._finish(db, job, worker_id, {"status": "failed", "error": error})
+
+    async def release(self, db: AsyncIOMotorDatabase, job: Dict, worker_id: str):
+        now = datetime.utcnow()
+        result = await db.jobs.update_one({"_id": job["_id"], "status": "running", "worker_id": worker_id}, {
+            "$set": {"status": "queued", "run_after": now, "updated_at": now},
+            "$unset": {"worker_id": "", "lease_until": ""}, "$inc": {"attempts": -1}})
+        if result.modified_count:
+            await self._release_slot(db, job["tenant"])
+
+    async def requeue_expired(self, db: AsyncIOMotorDatabase) -> int:
+        now = datetime.utcnow()
+        expired = expired_query(now)
+        requeued = 0
+        async for job in db.jobs.find(expired, EXPIRED_PROJECTION):
+            if job["attempts"] >= job.get("max_attempts", self.max_attempts):
+                await self._finish(db, job, job.get("worker_id"), {
+                    "status": "failed", "error": f"Lease expired after {job['attempts']} attempts."}, **expired)
+                continue
+            result = await db.jobs.update_one({"_id": job["_id"], "worker_id": job.get("worker_id"), **expired}, {
+                "$set": {"status": "queued", "run_after": now, "updated_at": now},
+                "$unset": {"worker_id": "", "lease_until": ""}})
+            if result.modified_count:
+                await self._release_slot(db, job["tenant"])
+                requeued += 1
+        if requeued:
+            self._wakeup.set()
+        return requeued
+
+    def retry_delay(self, job: Dict, retry_after: Optional[float]) -> float:
+        delay = retry_after or self.retry_base_seconds * 2 ** (job["attempts"] - 1)
+        return random.uniform(delay / 2, delay)
+
+    async def _finish(self, db: AsyncIOMotorDatabase, job: Dict, worker_id: str, fields: Dict, **conditions):
+        now = datetime.utcnow()
+        query = {"_id": job["_id"], "status": "running", "worker_id": worker_id, **conditions}
+        result = await db.jobs.update_one(query, {
+            "$set": {**fields, "finished_at": now, "updated_at": now,
+                     "expires_at": now + timedelta(seconds=self.result_ttl)},
+            "$unset": {"lease_until": ""}})
+        if result.modified_count:
+            await self._release_slot(db, job["tenant"])
+        waiter = self._finished.get(str(job["_id"]))
+        if waiter is not None:
+            waiter[0].set()
+
+    async def _saturated_tenants(self, db: AsyncIOMotorDatabase) -> Set[str]:
+        if self.tenant_max_running <= 0:
+            return set()
+        return {row["_id"] async for row in
+                db.job_tenants.find({"running": {"$gte": self.tenant_max_running}}, {"_id": 1})}
+
+    async def reconcile_tenants(self, db: AsyncIOMotorDatabase) -> int:
+        if self.tenant_max_running <= 0:
+            return 0
+        actual = {row["_id"]: row["running"] async for row in db.jobs.aggregate(RUNNING_BY_TENANT)}
+        drifted, fixed = {}, 0
+        async for counter in db.job_tenants.find({}):
+            tenant, running = counter["_id"], counter.get("running", 0)
+            if running == actual.get(tenant, 0):
+                continue
+            # A claim between _reserve_slot and its job update looks like drift for a moment; only a count that is
+            # still off by the same value on the next pass is a leaked slot.
+            if self._drifted.get(tenant) == running:
+                result = await db.job_tenants.update_one({"_id": tenant, "running": running},
+                                                         {"$set": {"running": actual.get(tenant, 0)}})
+                fixed += result.modified_count
+            else:
+                drifted[tenant] = running
+        self._drifted = drifted
+        return fixed
+
+    async def _reserve_slot(self, db: AsyncIOMotorDatabase, tenant: str) -> bool:
+        if self.tenant_max_running <= 0:
+            return True
+        try:
+            await db.job_tenants.update_one({"_id": tenant, "running": {"$lt": self.tenant_max_running}},
+                                            {"$inc": {"running": 1}}, upsert=True)
+        except DuplicateKeyError:
+            return False
+        return True
+
+    async def _release_slot(self, db: AsyncIOMotorDatabase, tenant: str):
+        if self.tenant_max_running <= 0:
+            return
+        await db.job_tenants.update_one({"_id": tenant, "running": {"$gt": 0}}, {"$inc": {"running": -1}})
+
+
+class JobWorkerPool:
+    def __init__(self, queue: JobQueue, ai_service: AIService):
+        self.queue = queue
+        self.ai_service = ai_service
+        self.workers = int(os.getenv("JOB_WORKERS", "4"))
+        self.poll_seconds = float(os.getenv("JOB_POLL_SECONDS", "1"))
+        self.worker_prefix = f"{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self._tasks = []
+
+    def start(self, db: AsyncIOMotorDatabase):
+        if self._tasks or self.workers <= 0:
+            return
+        self._tasks = [asyncio.create_task(self._run(db, f"{self.worker_prefix}-{i}")) for i in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._reap(db)))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _run(self, db: AsyncIOMotorDatabase, worker_id: str):
+        while True:
+            try:
+                job = await self.queue.claim(db, worker_id)
+            except Exception:
+                logger.exception("Job claim failed")
+                job = None
+            if job is None:
+                await self.queue.wait_for_work(self.poll_seconds)
+                continue
+            await self._process(db, job, worker_id)
+
+    async def _process(self, db: AsyncIOMotorDatabase, job: Dict, worker_id: str):
+        heartbeat = asyncio.create_task(self._heartbeat(db, job, worker_id))
+        try:
+            result = await self._execute(db, job)
+        except asyncio.CancelledError:
+            await asyncio.shield(self.queue.release(db, job, worker_id))
+            raise
+        except LLMUnavailableError as e:
+            await self.queue.fail(db, job, worker_id, str(e), retry_after=self.queue.retry_delay(job, e.retry_after))
+        except Exception as e:
+            logger.warning("Job %s failed: %s", job["_id"], e)
+            await self.queue.fail(db, job, worker_id, str(e) or e.__class__.__name__)
+        else:
+            await self.queue.complete(db, job, worker_id, result)
+        finally:
+            heartbeat.cancel()
+
+    async def _heartbeat(self, db: AsyncIOMotorDatabase, job: Dict, worker_id: str):
+        while True:
+            await asyncio.sleep(self.queue.lease_seconds / 3)
+            try:
+                await self.queue.renew(db, job, worker_id)
+            except Exception:
+                logger.exception("Job lease renewal failed")
+
+    async def _reap(self, db: AsyncIOMotorDatabase):
+        while True:
+            await asyncio.sleep(self.queue.lease_seconds / 2)
+            try:
+                requeued = await self.queue.requeue_expired(db)
+            except Exception:
+                logger.exception("Job lease reaper failed")
+                continue
+            if requeued:
+                logger.warning("Requeued %d jobs with expired leases", requeued)
+            try:
+                reconciled = await self.queue.reconcile_tenants(db)
+            except Exception:
+                logger.exception("Job tenant reconciliation failed")
+                continue
+            if reconciled:
+                logger.warning("Reset %d leaked tenant running counts", reconciled)
+
+    async def _execute(self, db: AsyncIOMotorDatabase, job: Dict) -> Dict:
+        payload = job["payload"]
+        resume = await db.resumes.find_one({"_id": ObjectId(payload["resume_id"])}, {"content": 1})
+        if not resume or not resume.get("content"):
+            raise JobError("Resume not found or content empty.")
+        if job["kind"] == "analysis":
+            result = await self.ai_service.analyze_resume(resume["content"], payload["job_description"],
+                                                          use_cache=not payload.get("no_cache", False),
+                                                          mode=payload.get("mode", "full"))
+            return AnalyzeResumeResponse(**result).model_dump()
+        if job["kind"] == "cover_letter":
+            cover_letter = await self.ai_service.generate_cover_letter(job_description=payload["job_description"],
+                                                                       company_name=payload["company_name"],
+                                                                       position_title=payload["position_title"],
+                                                                       resume_content=resume["content"],
+                                                                       tone=payload.get("tone", "professional"))
+            if cover_letter.get("error"):
+                raise JobError(f"Cover letter generation failed: {cover_letter['error']}")
+            return {"resume_id": payload["resume_id"], "company_name": payload["company_name"],
+                    "position_title": payload["position_title"], "content": cover_letter["content"],
+                    "tone": payload.get("tone", "professional"), "created_at": datetime.utcnow()}
+        raise JobError(f"Unknown job kind: {job['kind']}")
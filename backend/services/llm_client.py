@@ -0,0 +1,276 @@
+import asyncio
+import os
+import random
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+TRANSIENT_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+
+class LLMUnavailableError(Exception):
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class LLMTimeoutError(LLMUnavailableError):
+    pass
+
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    code = getattr(exc, "code", None)
+    if isinstance(code, int):
+        return code
+    return getattr(code, "value", None) if code is not None else None
+
+
+def _retry_after(exc: BaseException) -> Optional[float]:
+    retry_after = getattr(exc, "retry_after", None)
+    response = getattr(exc, "response", None)
+    if retry_after is None and response is not None:
+        retry_after = getattr(response, "headers", {}).get("Retry-After")
+    try:
+        return float(retry_after) if retry_after is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def is_transient(exc: BaseException) -> bool:
+    if isinstance(exc, (asyncio.TimeoutError, ConnectionError)):
+        return True
+    return _status_code(exc) in TRANSIENT_STATUS_CODES
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float, min_rate: float):
+        self.max_rate = rate
+        self.min_rate = min(min_rate, rate)
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.blocked_until = 0.0
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if now < self.blocked_until:
+                    await asyncio.sleep(self.blocked_until - now)
+                    continue
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def on_throttle(self, retry_after: Optional[float]):
+        self.rate = max(self.min_rate, self.rate / 2)
+        self.tokens = min(self.tokens, 0.0)
+        if retry_after:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + retry_after)
+
+    def on_success(self):
+        self.rate = min(self.max_rate, self.rate + self.max_rate * 0.05)
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+
+    def allow(self) -> bool:
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = self.HALF_OPEN
+            self._probing = False
+        if self.state == self.HALF_OPEN and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def retry_after(self) -> float:
+        return max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+
+    def record_success(self):
+        self.state = self.CLOSED
+        self.failures = 0
+        self._probing = False
+
+    def release_probe(self):
+        self._probing = False
+
+    def record_failure(self):
+        self.failures += 1
+        self._probing = False
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+
+class ResilientModelClient:
+    def __init__(self, model):
+        self.model = model
+        self.max_concurrency = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+        self.max_queue = int(os.getenv("LLM_MAX_QUEUE", "64"))
+        self.timeout = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))
+        self.max_retries = int(os.getenv("LLM_MAX_RETRIES", "3"))
+        self.base_delay = float(os.getenv("LLM_RETRY_BASE_SECONDS", "0.5"))
+        self.max_delay = float(os.getenv("LLM_RETRY_MAX_SECONDS", "8"))
+        rate = float(os.getenv("LLM_RATE_PER_SECOND", "5"))
+        self.bucket = TokenBucket(rate=rate, capacity=float(os.getenv("LLM_BURST", "10")), min_rate=rate / 10)
+        self.breaker = CircuitBreaker(failure_threshold=int(os.getenv("LLM_CIRCUIT_FAILURES", "5")),
+                                      reset_timeout=float(os.getenv("LLM_CIRCUIT_RESET_SECONDS", "30")))
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.queued = 0
+        self.in_flight = 0
+        self.counters = {"requests": 0, "succeeded": 0, "failed": 0, "retries": 0, "throttled": 0, "timeouts": 0,
+                         "rejected_queue_full": 0, "rejected_circuit_open": 0}
+
+    async def generate(self, prompt: str, **kwargs) -> Any:
+        probe = self._admit()
+        deadline = time.monotonic() + self.timeout
+        attempt = 0
+        try:
+            while True:
+                try:
+                    async with self._slot(deadline):
+                        response = await asyncio.wait_for(self.model.generate_content_async(prompt, **kwargs),
+                                                          timeout=self._remaining(deadline))
+                except LLMUnavailableError:
+                    raise
+                except Exception as e:
+                    delay = self._on_failure(e, attempt, deadline)
+                    if delay is None:
+                        raise self._translate(e)
+                    attempt += 1
+                    self.counters["retries"] += 1
+                    await asyncio.sleep(delay)
+                    continue
+                self._on_success()
+                return response
+        finally:
+            if probe:
+                self.breaker.release_probe()
+
+    async def stream(self, prompt: str, **kwargs) -> AsyncIterator[Any]:
+        probe = self._admit()
+        deadline = time.monotonic() + self.timeout
+        attempt = 0
+        try:
+            while True:
+                async with self._slot(deadline):
+                    try:
+                        response = await asyncio.wait_for(
+                            self.model.generate_content_async(prompt, stream=True, **kwargs),
+                            timeout=self._remaining(deadline))
+                    except Exception as e:
+                        delay = self._on_failure(e, attempt, deadline)
+                        if delay is None:
+                            raise self._translate(e)
+                    else:
+                        try:
+                            chunks = response.__aiter__()
+                            while True:
+                                try:
+                                    chunk = await asyncio.wait_for(chunks.__anext__(),
+                                                                   timeout=self._remaining(deadline))
+                                except StopAsyncIteration:
+                                    break
+                                yield chunk
+                        except Exception as e:
+                            self._on_failure(e, self.max_retries, deadline)
+                            raise self._translate(e)
+                        self._on_success()
+                        return
+                attempt += 1
+                self.counters["retries"] += 1
+                await asyncio.sleep(delay)
+        finally:
+            if probe:
+                self.breaker.release_probe()
+
+    def metrics(self) -> Dict[str, Any]:
+        return {"queue_depth": self.queued, "in_flight": self.in_flight, "max_concurrency": self.max_concurrency,
+                "rate_per_second": round(self.bucket.rate, 3), "circuit_state": self.breaker.state, **self.counters}
+
+    def _admit(self) -> bool:
+        self.counters["requests"] += 1
+        if self.queued >= self.max_queue:
+            self.counters["rejected_queue_full"] += 1
+            raise LLMUnavailableError("AI service is overloaded, please retry shortly", retry_after=1.0)
+        if not self.breaker.allow():
+            self.counters["rejected_circuit_open"] += 1
+            raise LLMUnavailableError("AI service is temporarily unavailable", retry_after=self.breaker.retry_after())
+        return self.breaker.state == CircuitBreaker.HALF_OPEN
+
+    @asynccontextmanager
+    async def _slot(self, deadline: float):
+        self.queued += 1
+        try:
+            await asyncio.wait_for(self._wait_for_capacity(), timeout=self._remaining(deadline))
+        except asyncio.TimeoutError:
+            self.counters["timeouts"] += 1
+            raise LLMTimeoutError("Timed out waiting for AI service capacity")
+        finally:
+            self.queued -= 1
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    async def _wait_for_capacity(self):
+        await self.bucket.acquire()
+        await self._semaphore.acquire()
+
+    def _remaining(self, deadline: float) -> float:
+        return max(0.001, deadline - time.monotonic())
+
+    def _on_success(self):
+        self.counters["succeeded"] += 1
+        self.breaker.record_success()
+        self.bucket.on_success()
+
+    def _on_failure(self, exc: Exception, attempt: int, deadline: float) -> Optional[float]:
+        if isinstance(exc, asyncio.TimeoutError):
+            self.counters["timeouts"] += 1
+        if not is_transient(exc):
+            self.counters["failed"] += 1
+            self.breaker.release_probe()
+            return None
+        retry_after = _retry_after(exc)
+        if _status_code(exc) == 429:
+            self.counters["throttled"] += 1
+            self.bucket.on_throttle(retry_after)
+            self.breaker.release_probe()
+        else:
+            self.breaker.record_failure()
+        delay = retry_after or min(self.max_delay, self.base_delay * 2 ** attempt)
+        delay = random.uniform(delay / 2, delay)
+        if (attempt >= self.max_retries or time.monotonic() + delay >= deadline
+                or self.breaker.state != CircuitBreaker.CLOSED):
+            self.counters["failed"] += 1
+            return None
+        return delay
+
+    @staticmethod
+    def _translate(exc: Exception) -> Exception:
+        if isinstance(exc, asyncio.TimeoutError):
+            return LLMTimeoutError("AI service did not respond in time")
+        if is_transient(exc):
+            return LLMUnavailableError(f"AI service is temporarily unavailable: {exc}", retry_after=_retry_after(exc))
+        return exc
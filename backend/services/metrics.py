@@ -0,0 +1,364 @@
+import asyncio
+import functools
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from fastapi.routing import APIRoute
+from pymongo import monitoring
+
+logger = logging.getLogger(__name__)
+
+PREFIX = "aurahire_"
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _quote(value) -> str:
+    return '"%s"' % (format(value, "g") if isinstance(value, float) else value)
+
+
+def _labels(names: Iterable[str], values: Iterable, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, label_names: Iterable[str] = ()):
+        self.name = PREFIX + name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.label_names)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            return [f"{self.name}{_labels(self.label_names, key)} {value:g}" for key, value in self._values.items()]
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}", *self.samples()]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, label_names: Iterable[str] = (),
+                 buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, label_names)
+        self.buckets = buckets
+        self._series: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.setdefault(key, [0.0] * (len(self.buckets) + 2))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += 1
+            series[-1] += value
+
+    def samples(self) -> List[str]:
+        lines = []
+        with self._lock:
+            for key, series in self._series.items():
+                for bound, count in zip(self.buckets, series):
+                    lines.append(f"{self.name}_bucket{_labels(self.label_names, key, 'le=%s' % _quote(bound))} "
+                                 f"{count:g}")
+                lines.append(f"{self.name}_bucket{_labels(self.label_names, key, 'le=%s' % _quote('+Inf'))} "
+                             f"{series[-2]:g}")
+                lines.append(f"{self.name}_count{_labels(self.label_names, key)} {series[-2]:g}")
+                lines.append(f"{self.name}_sum{_labels(self.label_names, key)} {series[-1]:g}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.metrics: List[_Metric] = []
+        self.collectors: List[Tuple[str, Callable[[], Dict]]] = []
+
+    def counter(self, name: str, documentation: str, label_names: Iterable[str] = ()) -> Counter:
+        return self._add(Counter(name, documentation, label_names))
+
+    def gauge(self, name: str, documentation: str, label_names: Iterable[str] = ()) -> Gauge:
+        return self._add(Gauge(name, documentation, label_names))
+
+    def histogram(self, name: str, documentation: str, label_names: Iterable[str] = (),
+                  buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> Histogram:
+        return self._add(Histogram(name, documentation, label_names, buckets))
+
+    def register_collector(self, prefix: str, collect: Callable[[], Dict]):
+        self.collectors.append((prefix, collect))
+
+    def render(self) -> str:
+        lines = [line for metric in self.metrics for line in metric.render()]
+        for prefix, collect in self.collectors:
+            try:
+                lines.extend(self._render_collected(PREFIX + prefix, collect()))
+            except Exception:
+                logger.exception("Metrics collector %s failed", prefix)
+        return "\n".join(lines) + "\n"
+
+    def _add(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def _render_collected(self, prefix: str, values: Dict) -> List[str]:
+        lines = []
+        for key, value in values.items():
+            name = f"{prefix}_{key}"
+            if isinstance(value, dict):
+                lines.extend(self._render_collected(name, value))
+            elif isinstance(value, bool) or not isinstance(value, (int, float)):
+                lines += [f"# TYPE {name} gauge", f'{name}{{value="{_escape(value)}"}} 1']
+            else:
+                lines += [f"# TYPE {name} gauge", f"{name} {value:g}"]
+        return lines
+
+
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUEST_SECONDS = REGISTRY.histogram("http_request_duration_seconds",
+                                          "Time from request start to the last response byte.",
+                                          ("method", "route", "status"))
+STAGE_SECONDS = REGISTRY.histogram("request_stage_duration_seconds", "Time spent in each stage of a request.",
+                                   ("route", "stage"))
+SLOW_REQUESTS = REGISTRY.counter("slow_requests_total", "Requests slower than SLOW_REQUEST_SECONDS.", ("route",))
+MONGO_COMMAND_SECONDS = REGISTRY.histogram("mongo_command_duration_seconds", "MongoDB command round trip time.",
+                                           ("command", "collection"))
+MONGO_COMMAND_FAILURES = REGISTRY.counter("mongo_command_failures_total", "Failed MongoDB commands.",
+                                          ("command", "collection"))
+MONGO_CONNECTIONS = REGISTRY.gauge("mongo_pool_connections", "Connections per pool and state.", ("address", "state"))
+MONGO_CHECKOUT_SECONDS = REGISTRY.histogram("mongo_pool_checkout_wait_seconds", "Time waiting for a pooled connection.",
+                                            ("address",))
+MONGO_CHECKOUT_FAILURES = REGISTRY.counter("mongo_pool_checkout_failures_total", "Failed connection checkouts.",
+                                           ("address", "reason"))
+LLM_PROMPT_CHARS = REGISTRY.histogram("llm_prompt_chars", "Prompt size sent to the model.", ("operation",),
+                                      SIZE_BUCKETS)
+LLM_RESPONSE_CHARS = REGISTRY.histogram("llm_response_chars", "Response size returned by the model.", ("operation",),
+                                        SIZE_BUCKETS)
+LLM_TOKENS = REGISTRY.counter("llm_tokens_total", "Tokens reported by the model.", ("operation", "kind"))
+
+
+class RequestTrace:
+    def __init__(self, method: str, path: str):
+        self.method = method
+        self.path = path
+        self.route: Optional[str] = None
+        self.started = time.perf_counter()
+        self.endpoint_finished: Optional[float] = None
+        self.stages: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, seconds: float):
+        with self._lock:
+            self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+
+_current_trace: ContextVar[Optional[RequestTrace]] = ContextVar("request_trace", default=None)
+
+
+def record_stage(stage: str, seconds: float):
+    trace = _current_trace.get()
+    STAGE_SECONDS.observe(seconds, route=(trace.route or "unmatched") if trace else "background", stage=stage)
+    if trace is not None:
+        trace.add(stage, seconds)
+
+
+@contextmanager
+def span(stage: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(stage, time.perf_counter() - started)
+
+
+def record_llm_call(operation: str, prompt_chars: int, response_chars: int, usage=None):
+    LLM_PROMPT_CHARS.observe(prompt_chars, operation=operation)
+    LLM_RESPONSE_CHARS.observe(response_chars, operation=operation)
+    for kind in ("prompt", "candidates"):
+        count = getattr(usage, f"{kind}_token_count", None)
+        if count:
+            LLM_TOKENS.inc(count, operation=operation, kind=kind)
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+        self.slow_request_seconds = float(os.getenv("SLOW_REQUEST_SECONDS", "0"))
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        trace = RequestTrace(scope["method"], scope["path"])
+        token = _current_trace.set(trace)
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            _current_trace.reset(token)
+            self._finish(trace, status)
+
+    def _finish(self, trace: RequestTrace, status: int):
+        elapsed = time.perf_counter() - trace.started
+        route = trace.route or "unmatched"
+        HTTP_REQUEST_SECONDS.observe(elapsed, method=trace.method, route=route, status=status)
+        if self.slow_request_seconds and elapsed >= self.slow_request_seconds:
+            SLOW_REQUESTS.inc(route=route)
+            stages = ", ".join(f"{stage}={seconds * 1000:.1f}ms" for stage, seconds in
+                               sorted(trace.stages.items(), key=lambda item: -item[1]))
+            logger.warning("Slow request %s %s -> %d in %.1fms (%s)", trace.method, trace.path, status,
+                           elapsed * 1000, stages or "no stages recorded")
+
+
+def _timed_endpoint(endpoint):
+    @functools.wraps(endpoint)
+    async def timed(*args, **kwargs):
+        try:
+            with span("handler"):
+                return await endpoint(*args, **kwargs)
+        finally:
+            trace = _current_trace.get()
+            if trace is not None:
+                trace.endpoint_finished = time.perf_counter()
+
+    return timed
+
+
+class TimedRoute(APIRoute):
+    def __init__(self, path: str, endpoint, **kwargs):
+        if asyncio.iscoroutinefunction(endpoint):
+            endpoint = _timed_endpoint(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+        route = self.path
+
+        async def timed_handler(request):
+            trace = _current_trace.get()
+            if trace is not None:
+                trace.route = route
+            response = await handler(request)
+            if trace is not None and trace.endpoint_finished is not None:
+                record_stage("serialization", time.perf_counter() - trace.endpoint_finished)
+            return response
+
+        return timed_handler
+
+
+def _collection(event) -> str:
+    target = event.command.get(event.command_name) if hasattr(event, "command") else None
+    return target if isinstance(target, str) else ""
+
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    def __init__(self):
+        self._collections: Dict[int, str] = {}
+
+    def started(self, event):
+        collection = _collection(event) or event.command.get("collection", "")
+        self._collections[event.request_id] = collection if isinstance(collection, str) else ""
+
+    def succeeded(self, event):
+        self._observe(event)
+
+    def failed(self, event):
+        MONGO_COMMAND_FAILURES.inc(command=event.command_name, collection=self._collections.get(event.request_id, ""))
+        self._observe(event)
+
+    def _observe(self, event):
+        seconds = event.duration_micros / 1_000_000
+        collection = self._collections.pop(event.request_id, "")
+        MONGO_COMMAND_SECONDS.observe(seconds, command=event.command_name, collection=collection)
+        record_stage("mongo", seconds)
+
+
+class MongoPoolMetrics(monitoring.ConnectionPoolListener):
+    def __init__(self):
+        self._checkout_started = threading.local()
+
+    def pool_created(self, event):
+        MONGO_CONNECTIONS.set(0, address=self._address(event), state="open")
+        MONGO_CONNECTIONS.set(0, address=self._address(event), state="checked_out")
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        MONGO_CONNECTIONS.inc(address=self._address(event), state="open")
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        MONGO_CONNECTIONS.inc(-1, address=self._address(event), state="open")
+
+    def connection_check_out_started(self, event):
+        self._checkout_started.value = time.perf_counter()
+
+    def connection_check_out_failed(self, event):
+        MONGO_CHECKOUT_FAILURES.inc(address=self._address(event), reason=event.reason)
+
+    def connection_checked_out(self, event):
+        started = getattr(self._checkout_started, "value", None)
+        if started is not None:
+            MONGO_CHECKOUT_SECONDS.observe(time.perf_counter() - started, address=self._address(event))
+        MONGO_CONNECTIONS.inc(address=self._address(event), state="checked_out")
+
+    def connection_checked_in(self, event):
+        MONGO_CONNECTIONS.inc(-1, address=self._address(event), state="checked_out")
+
+    @staticmethod
+    def _address(event) -> str:
+        host, port = event.address
+        return f"{host}:{port}"
@@ -0,0 +1,38 @@
+import base64
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from bson import ObjectId
+
+KEYSET_SORT = [("created_at", -1), ("_id", -1)]
+
+
+def encode_cursor(doc: Dict) -> str:
+    raw = f"{doc['created_at'].isoformat()}|{doc['_id']}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, ObjectId]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        created_at, object_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), ObjectId(object_id)
+    except Exception:
+        raise ValueError("Invalid pagination cursor")
+
+
+def keyset_query(query: Dict, cursor: Optional[str]) -> Dict:
+    if not cursor:
+        return query
+    created_at, object_id = decode_cursor(cursor)
+    after = {"created_at": {"$lte": created_at},
+             "$or": [{"created_at": {"$lt": created_at}}, {"created_at": created_at, "_id": {"$lt": object_id}}]}
+    return {"$and": [query, after]} if query else after
+
+
+async def fetch_page(collection, query: Dict, projection: Optional[Dict], limit: int,
+                     cursor: Optional[str]) -> Tuple[List[Dict], Optional[str]]:
+    docs = await collection.find(keyset_query(query, cursor), projection).sort(KEYSET_SORT).limit(limit + 1).to_list(
+        length=limit + 1)
+    next_cursor = encode_cursor(docs[limit - 1]) if len(docs) > limit else None
+    return docs[:limit], next_cursor
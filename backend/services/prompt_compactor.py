@@ -0,0 +1,161 @@
+import hashlib
+import os
+import re
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from services.metrics import REGISTRY
+
+DROP = 99
+
+JOB_SECTION_PRIORITIES = [
+    (("equal opportunity", "eeo", "diversity", "accommodation", "disclaimer", "legal"), DROP),
+    (("benefit", "perk", "what we offer", "compensation", "salary", "pay range", "why join", "why work"), DROP),
+    (("requirement", "qualification", "must have", "what you need", "what you'll need", "what you bring",
+      "skills", "experience", "you have", "you are"), 0),
+    (("responsibilit", "what you'll do", "what you will do", "the role", "duties", "day to day", "your impact"), 1),
+    (("preferred", "nice to have", "bonus", "plus"), 2),
+    (("about us", "about the company", "who we are", "our mission", "our culture", "company", "the team"), 4),
+]
+RESUME_SECTION_PRIORITIES = [
+    (("reference",), DROP),
+    (("interest", "hobbies", "hobby", "personal"), 5),
+    (("volunteer", "activities", "extracurricular"), 4),
+    (("award", "honor", "publication", "language"), 3),
+    (("skill", "technolog", "tools", "stack"), 0),
+    (("experience", "employment", "work history", "professional"), 0),
+    (("summary", "profile", "objective", "about"), 1),
+    (("project",), 1),
+    (("education", "certification", "training", "course"), 2),
+]
+DEFAULT_PRIORITY = 2
+
+JOB_BOILERPLATE = re.compile(
+    r"equal (employment )?opportunity employer|without regard to (race|color|religion|sex|gender|age)|"
+    r"regardless of (race|color|religion|sex|gender|age)|protected veteran status|"
+    r"(with or without|request an?) reasonable accommodation|participates in e-verify|drug[- ]free workplace|"
+    r"affirmative action employer|401\(?k\)? (match|plan)|(medical|health), dental|dental (and|&) vision|"
+    r"(dental|vision|health|medical|life) insurance|paid time off|unlimited (pto|vacation)|paid parental leave|"
+    r"wellness stipend|apply (now|today)|click apply|all rights reserved", re.IGNORECASE)
+RESUME_BOILERPLATE = re.compile(r"references (are )?available|available upon request|curriculum vitae|^page \d+",
+                                re.IGNORECASE)
+BULLET = re.compile(r"^[\s•●▪‣⁃∙*•·▪\-–—>]+")
+SENTENCE_END = re.compile(r"(?<=[.!?;])\s+")
+LONG_LINE_TOKENS = 120
+
+PROMPT_INPUT_TOKENS = REGISTRY.counter("prompt_input_tokens_total",
+                                       "Estimated tokens of prompt inputs before and after compaction.",
+                                       ("input", "stage"))
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + 3) // 4
+
+
+def _heading(line: str, priorities) -> Optional[str]:
+    stripped = line.rstrip(":").strip()
+    words = stripped.split()
+    if line.startswith("- ") or not words or len(words) > 5 or len(stripped) > 40 or not stripped[0].isalpha():
+        return None
+    if re.search(r"[\d.,;()|/]", stripped) or not (line.endswith(":") or stripped.isupper() or len(words) <= 3):
+        return None
+    heading = stripped.lower()
+    if any(re.search(rf"\b{re.escape(keyword)}", heading) for keywords, _ in priorities for keyword in keywords):
+        return heading
+    return None
+
+
+def _priority(heading: str, table) -> Optional[int]:
+    for keywords, priority in table:
+        if any(keyword in heading for keyword in keywords):
+            return priority
+    return None
+
+
+def _lines(text: str) -> List[str]:
+    lines = []
+    for raw in text.replace("\r", "\n").split("\n"):
+        line = " ".join(raw.split())
+        if not line:
+            continue
+        bullet = BULLET.match(line)
+        if bullet and bullet.end() < len(line):
+            line = "- " + line[bullet.end():]
+        if estimate_tokens(line) > LONG_LINE_TOKENS:
+            lines.extend(sentence for sentence in SENTENCE_END.split(line) if sentence)
+        else:
+            lines.append(line)
+    return lines
+
+
+class PromptCompactor:
+    def __init__(self):
+        self.resume_budget = int(os.getenv("PROMPT_RESUME_TOKEN_BUDGET", "1500"))
+        self.job_budget = int(os.getenv("PROMPT_JOB_TOKEN_BUDGET", "1000"))
+        self.cache_entries = int(os.getenv("PROMPT_COMPACT_CACHE_ENTRIES", "256"))
+        self._resumes: "OrderedDict[str, str]" = OrderedDict()
+
+    @property
+    def fingerprint(self) -> str:
+        return f"c2r{self.resume_budget}j{self.job_budget}"
+
+    def resume(self, text: str, budget: Optional[int] = None) -> str:
+        budget = budget or self.resume_budget
+        key = f"{budget}:{hashlib.sha256(text.encode('utf-8')).hexdigest()}"
+        compacted = self._resumes.get(key)
+        if compacted is None:
+            compacted = self.compact(text, budget, RESUME_SECTION_PRIORITIES, RESUME_BOILERPLATE, "resume")
+            self._resumes[key] = compacted
+            if len(self._resumes) > self.cache_entries:
+                self._resumes.popitem(last=False)
+        else:
+            self._resumes.move_to_end(key)
+        return compacted
+
+    def job_description(self, text: str, budget: Optional[int] = None) -> str:
+        return self.compact(text, budget or self.job_budget, JOB_SECTION_PRIORITIES, JOB_BOILERPLATE,
+                            "job_description")
+
+    def compact(self, text: str, budget: int, priorities, boilerplate: re.Pattern, label: str) -> str:
+        compacted = "\n".join(_lines(text))
+        if estimate_tokens(compacted) > budget:
+            sections = self._sections(text, priorities, boilerplate)
+            self._trim(sections, budget)
+            compacted = "\n".join(line for _, _, lines in sections for line in lines)
+        PROMPT_INPUT_TOKENS.inc(estimate_tokens(text), input=label, stage="raw")
+        PROMPT_INPUT_TOKENS.inc(estimate_tokens(compacted), input=label, stage="compacted")
+        return compacted
+
+    @staticmethod
+    def _sections(text: str, priorities, boilerplate: re.Pattern) -> List[Tuple[Optional[str], int, List[str]]]:
+        sections = [(None, DEFAULT_PRIORITY, [])]
+        seen = set()
+        for line in _lines(text):
+            heading = _heading(line, priorities)
+            if heading is not None:
+                priority = _priority(heading, priorities)
+                sections.append((heading, sections[-1][1] if priority is None else priority, [line]))
+                continue
+            key = line.lstrip("- ").lower()
+            if key in seen or boilerplate.search(line):
+                continue
+            seen.add(key)
+            sections[-1][2].append(line)
+        return [(heading, priority, lines) for heading, priority, lines in sections if
+                priority != DROP and lines]
+
+    @staticmethod
+    def _trim(sections: List[Tuple[Optional[str], int, List[str]]], budget: int):
+        costs: Dict[int, List[int]] = {i: [estimate_tokens(line) + 1 for line in lines] for i, (_, _, lines) in
+                                       enumerate(sections)}
+        total = sum(sum(cost) for cost in costs.values())
+        while total > budget:
+            candidates = [i for i, (_, _, lines) in enumerate(sections) if lines]
+            if not candidates:
+                break
+            victim = max(candidates, key=lambda i: (sections[i][1], sum(costs[i])))
+            sections[victim][2].pop()
+            total -= costs[victim].pop()
+            if len(sections[victim][2]) == 1 and sections[victim][0] is not None:
+                sections[victim][2].pop()
+                total -= costs[victim].pop()
@@ -0,0 +1,89 @@
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import Response
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from services.metrics import REGISTRY
+
+CACHED_HEADERS = ("content-type", "x-next-cursor")
+
+RESPONSE_CACHE_EVENTS = REGISTRY.counter("response_cache_total", "Conditional GET outcomes by route.",
+                                         ("route", "result"))
+
+
+class CollectionVersions:
+    async def get(self, db: AsyncIOMotorDatabase, names: Iterable[str]) -> Dict[str, int]:
+        versions = dict.fromkeys(names, 0)
+        async for document in db.collection_versions.find({"_id": {"$in": list(versions)}}):
+            versions[document["_id"]] = document.get("version", 0)
+        return versions
+
+    async def bump(self, db: AsyncIOMotorDatabase, *names: str):
+        for name in names:
+            await db.collection_versions.update_one({"_id": name}, {"$inc": {"version": 1}}, upsert=True)
+
+
+def _matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or etag.removeprefix("W/") in candidates
+
+
+class ResponseCache:
+    def __init__(self, versions: CollectionVersions):
+        self.versions = versions
+        self.ttl = float(os.getenv("RESPONSE_CACHE_SECONDS", "30"))
+        self.max_entries = int(os.getenv("RESPONSE_CACHE_ENTRIES", "256"))
+        self._entries: "OrderedDict[str, Tuple[float, bytes, Dict[str, str]]]" = OrderedDict()
+
+    @staticmethod
+    def etag(request: Request, versions: Dict[str, int], vary: str = "") -> str:
+        stamp = ",".join(f"{name}={version}" for name, version in sorted(versions.items()))
+        digest = hashlib.sha1(f"{request.url.path}?{request.url.query}|{stamp}|{vary}".encode("utf-8")).hexdigest()
+        return f'W/"{digest[:20]}"'
+
+    async def respond(self, request: Request, db: AsyncIOMotorDatabase, collections: Iterable[str],
+                      build: Callable[[], Awaitable[Response]], vary: str = "") -> Response:
+        route = getattr(request.scope.get("route"), "path", request.url.path)
+        etag = self.etag(request, await self.versions.get(db, collections), vary)
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if _matches(request.headers.get("if-none-match"), etag):
+            RESPONSE_CACHE_EVENTS.inc(route=route, result="not_modified")
+            return Response(status_code=304, headers=headers)
+        cached = self._get(etag)
+        if cached is not None:
+            RESPONSE_CACHE_EVENTS.inc(route=route, result="hit")
+            body, cached_headers = cached
+            return Response(body, headers={**cached_headers, **headers})
+        RESPONSE_CACHE_EVENTS.inc(route=route, result="miss")
+        response = await build()
+        response.headers.update(headers)
+        if response.status_code == 200:
+            self._put(etag, response.body, {name: value for name, value in response.headers.items() if
+                                            name in CACHED_HEADERS})
+        return response
+
+    def _get(self, etag: str) -> Optional[Tuple[bytes, Dict[str, str]]]:
+        entry = self._entries.get(etag)
+        if entry is None:
+            return None
+        stored_at, body, headers = entry
+        if time.monotonic() - stored_at > self.ttl:
+            del self._entries[etag]
+            return None
+        self._entries.move_to_end(etag)
+        return body, headers
+
+    def _put(self, etag: str, body: bytes, headers: Dict[str, str]):
+        if self.ttl <= 0 or self.max_entries <= 0:
+            return
+        self._entries[etag] = (time.monotonic(), body, headers)
+        self._entries.move_to_end(etag)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
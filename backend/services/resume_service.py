@@ -1,35 +1,151 @@
+import asyncio
+import hashlib
 import io
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
 
-import PyPDF2
-from docx import Document
+from services.metrics import span
 
+RESUME_SUMMARY_PROJECTION = {"filename": 1, "created_at": 1}
 
-class ResumeService:
-    async def parse_resume(self, file_content: bytes, filename: str) -> str:
+
+class ResumeParseError(Exception):
+    pass
+
+
+class ResumeTooLargeError(ResumeParseError):
+    pass
+
+
+class ParserOverloadedError(Exception):
+    pass
+
+
+class ParseTimeoutError(Exception):
+    pass
+
+
+class ParserUnavailableError(Exception):
+    pass
+
+
+def parse_resume_bytes(file_content: bytes, filename: str, max_pages: int) -> str:
+    try:
         if filename.lower().endswith('.pdf'):
-            return await self._parse_pdf(file_content)
+            return _parse_pdf(file_content, max_pages)
         if filename.lower().endswith('.docx'):
-            return await self._parse_docx(file_content)
-        raise ValueError("Unsupported file format")
-
-    async def _parse_pdf(self, file_content: bytes) -> str:
-        pdf_file = io.BytesIO(file_content)
-        pdf_reader = PyPDF2.PdfReader(pdf_file)
-        text = "".join(page.extract_text() + "\n" for page in pdf_reader.pages)
-        return self._clean_text(text)
-
-    async def _parse_docx(self, file_content: bytes) -> str:
-        doc_file = io.BytesIO(file_content)
-        doc = Document(doc_file)
-        text = "".join(p.text + "\n" for p in doc.paragraphs)
-        for table in doc.tables:
-            for row in table.rows:
-                text += " ".join(cell.text for cell in row.cells) + "\n"
-        return self._clean_text(text)
-
-    def _clean_text(self, text: str) -> str:
-        text = re.sub(r'\n\s*\n', '\n\n', text)
-        text = re.sub(r' +', ' ', text)
-        text = text.replace('\x00', '').replace('\r', '\n').strip()
-        return text
+            return _parse_docx(file_content)
+    except ResumeParseError:
+        raise
+    except Exception as e:
+        # Raised in the worker, so always about the file
+        raise ResumeParseError(f"Could not read {filename}: {e.__class__.__name__}: {e}") from None
+    raise ResumeParseError("Unsupported file format")
+
+
+def _parse_pdf(file_content: bytes, max_pages: int) -> str:
+    import PyPDF2
+
+    pdf_file = io.BytesIO(file_content)
+    pdf_reader = PyPDF2.PdfReader(pdf_file)
+    if len(pdf_reader.pages) > max_pages:
+        raise ResumeTooLargeError(f"PDF has {len(pdf_reader.pages)} pages, the limit is {max_pages}")
+    text = "".join(page.extract_text() + "\n" for page in pdf_reader.pages)
+    return _clean_text(text)
+
+
+def _parse_docx(file_content: bytes) -> str:
+    from docx import Document
+
+    doc_file = io.BytesIO(file_content)
+    doc = Document(doc_file)
+    text = "".join(p.text + "\n" for p in doc.paragraphs)
+    for table in doc.tables:
+        for row in table.rows:
+            text += " ".join(cell.text for cell in row.cells) + "\n"
+    return _clean_text(text)
+
+
+def _clean_text(text: str) -> str:
+    text = re.sub(r'\n\s*\n', '\n\n', text)
+    text = re.sub(r' +', ' ', text)
+    text = text.replace('\x00', '').replace('\r', '\n').strip()
+    return text
+
+
+class ResumeService:
+    def __init__(self):
+        self.executor_kind = os.getenv("PARSE_EXECUTOR", "process").lower()
+        self.max_workers = int(os.getenv("PARSE_WORKERS", str(os.cpu_count() or 1)))
+        self.max_queue = int(os.getenv("PARSE_MAX_QUEUE", "16"))
+        self.timeout = float(os.getenv("PARSE_TIMEOUT_SECONDS", "30"))
+        self.max_bytes = int(os.getenv("RESUME_MAX_BYTES", str(10 * 1024 * 1024)))
+        self.max_pages = int(os.getenv("RESUME_MAX_PAGES", "20"))
+        self._executor: Optional[ThreadPoolExecutor | ProcessPoolExecutor] = None
+        self._pending = 0
+
+    @staticmethod
+    def content_hash(file_content: bytes) -> str:
+        return hashlib.sha256(file_content).hexdigest()
+
+    def start(self):
+        if self._executor is None:
+            self._executor = self._create_executor()
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _create_executor(self):
+        if self.executor_kind == "process":
+            try:
+                return ProcessPoolExecutor(max_workers=self.max_workers)
+            except (NotImplementedError, OSError, ImportError):
+                pass
+        return ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="resume-parser")
+
+    async def parse_resume(self, file_content: bytes, filename: str) -> str:
+        if len(file_content) > self.max_bytes:
+            raise ResumeTooLargeError(f"File exceeds the {self.max_bytes} byte limit")
+        if self._pending >= self.max_workers + self.max_queue:
+            raise ParserOverloadedError("Resume parser is busy, please retry shortly")
+        self.start()
+        try:
+            future = self._submit(file_content, filename)
+        except BrokenProcessPool:
+            self._rebuild(self._executor)
+            future = self._submit(file_content, filename)
+        executor = self._executor
+        try:
+            with span("parse_resume"):
+                return await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            # A parse already running keeps its _pending slot until it finishes
+            future.cancel()
+            raise ParseTimeoutError(f"Parsing took longer than {self.timeout:g}s")
+        except BrokenProcessPool:
+            self._rebuild(executor)
+            raise ParserUnavailableError("Resume parser worker crashed, please retry")
+
+    def _rebuild(self, executor):
+        if self._executor is executor:
+            self.shutdown()
+            self.start()
+
+    def _submit(self, file_content: bytes, filename: str):
+        loop = asyncio.get_running_loop()
+        future = self._executor.submit(parse_resume_bytes, file_content, filename, self.max_pages)
+        self._pending += 1
+        future.add_done_callback(lambda _: self._release(loop))
+        return future
+
+    def _release(self, loop: asyncio.AbstractEventLoop):
+        if not loop.is_closed():
+            loop.call_soon_threadsafe(self._decrement_pending)
+
+    def _decrement_pending(self):
+        self._pending -= 1
@@ -0,0 +1,144 @@
+import html
+import os
+import re
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from services.ats_scorer import STOPWORDS, stem, tokenize
+
+SEARCH_SCOPES = ("all", "applications", "resumes")
+TEXT_SCORE = {"$meta": "textScore"}
+APPLICATION_SEARCH_PROJECTION = {"score": TEXT_SCORE, "company_name": 1, "position_title": 1, "status": 1,
+                                 "location": 1, "application_date": 1, "created_at": 1, "job_description": 1,
+                                 "notes": 1}
+RESUME_SEARCH_PROJECTION = {"score": TEXT_SCORE, "filename": 1, "created_at": 1, "content": 1}
+APPLICATION_SNIPPET_FIELDS = ("position_title", "job_description", "notes")
+MARK_OPEN, MARK_CLOSE = "<mark>", "</mark>"
+
+
+class SearchQueryError(Exception):
+    pass
+
+
+def highlight_pattern(query: str) -> Optional[re.Pattern]:
+    terms = {stem(token) for token in tokenize(query.replace('"', " ")) if token not in STOPWORDS}
+    if not terms:
+        return None
+    alternatives = "|".join(re.escape(term) for term in sorted(terms, key=len, reverse=True))
+    return re.compile(rf"\b(?:{alternatives})[\w+#]*", re.IGNORECASE)
+
+
+def _mark(text: str, pattern: re.Pattern) -> str:
+    parts, last = [], 0
+    for match in pattern.finditer(text):
+        parts += [html.escape(text[last:match.start()]), MARK_OPEN, html.escape(match.group()), MARK_CLOSE]
+        last = match.end()
+    parts.append(html.escape(text[last:]))
+    return "".join(parts)
+
+
+def snippets(text: Optional[str], pattern: Optional[re.Pattern], context: int, limit: int) -> List[str]:
+    if not text or pattern is None:
+        return []
+    text = " ".join(text.split())
+    windows: List[Tuple[int, int]] = []
+    for match in pattern.finditer(text):
+        start, end = max(0, match.start() - context), min(len(text), match.end() + context)
+        if windows and start <= windows[-1][1]:
+            windows[-1] = (windows[-1][0], end)
+        elif len(windows) == limit:
+            break
+        else:
+            windows.append((start, end))
+    return [("…" if start else "") + _mark(text[start:end], pattern) + ("…" if end < len(text) else "") for
+            start, end in windows]
+
+
+def _normalized(documents: List[Dict]) -> List[Dict]:
+    # textScore depends on each index's field weights and document lengths, so scores from two collections are not
+    # comparable. Scaling by each collection's best match puts both on 0..1 before they are merged.
+    top = max((document["score"] for document in documents), default=0)
+    for document in documents:
+        document["score"] = document["score"] / top if top > 0 else 0.0
+    return documents
+
+
+class SearchService:
+    def __init__(self):
+        self.max_offset = int(os.getenv("SEARCH_MAX_OFFSET", "500"))
+        self.max_time_ms = int(os.getenv("SEARCH_MAX_TIME_MS", "2000"))
+        self.snippet_context = int(os.getenv("SEARCH_SNIPPET_CONTEXT", "60"))
+        self.snippets_per_hit = int(os.getenv("SEARCH_SNIPPETS_PER_HIT", "3"))
+
+    async def search(self, db: AsyncIOMotorDatabase, q: str, scope: str = "all", status: Optional[str] = None,
+                     start: Optional[datetime] = None, end: Optional[datetime] = None, location: Optional[str] = None,
+                     limit: int = 20, offset: int = 0) -> dict:
+        if scope not in SEARCH_SCOPES:
+            raise SearchQueryError(f"Unsupported search scope. Choose one of: {', '.join(SEARCH_SCOPES)}")
+        if offset > self.max_offset:
+            raise SearchQueryError(f"Offset cannot exceed {self.max_offset}; narrow the query or add filters.")
+        if start and end and start >= end:
+            raise SearchQueryError("date_from must not be after date_to.")
+        pattern = highlight_pattern(q)
+        window = offset + limit + 1
+        hits = []
+        if scope in ("all", "applications"):
+            query = self.application_query(q, status, start, end, location)
+            hits += [self._application_hit(document, pattern) for document in
+                     _normalized(await self._find(db.applications, query, APPLICATION_SEARCH_PROJECTION, window))]
+        if scope in ("all", "resumes") and not (status or location):
+            query = self.resume_query(q, start, end)
+            hits += [self._resume_hit(document, pattern) for document in
+                     _normalized(await self._find(db.resumes, query, RESUME_SEARCH_PROJECTION, window))]
+        hits.sort(key=lambda hit: hit["score"], reverse=True)
+        page = hits[offset:offset + limit]
+        next_offset = offset + limit if len(hits) > offset + limit and offset + limit <= self.max_offset else None
+        return {"query": q, "hits": page, "offset": offset, "limit": limit, "next_offset": next_offset}
+
+    @classmethod
+    def application_query(cls, q: str, status: Optional[str], start: Optional[datetime], end: Optional[datetime],
+                          location: Optional[str]) -> Dict:
+        query = {"$text": {"$search": q}}
+        if status:
+            query["status"] = status
+        if location:
+            query["location"] = {"$regex": re.escape(location), "$options": "i"}
+        if start or end:
+            query["$or"] = [cls._date_range("application_date", start, end),
+                            {"application_date": None, **cls._date_range("created_at", start, end)}]
+        return query
+
+    @classmethod
+    def resume_query(cls, q: str, start: Optional[datetime], end: Optional[datetime]) -> Dict:
+        return {"$text": {"$search": q}, **cls._date_range("created_at", start, end)}
+
+    @staticmethod
+    def _date_range(field: str, start: Optional[datetime], end: Optional[datetime]) -> Dict:
+        bounds = {}
+        if start:
+            bounds["$gte"] = start
+        if end:
+            bounds["$lt"] = end
+        return {field: bounds} if bounds else {}
+
+    async def _find(self, collection, query: Dict, projection: Dict, limit: int) -> List[Dict]:
+        cursor = collection.find(query, projection).sort([("score", TEXT_SCORE)]).limit(limit)
+        return await cursor.max_time_ms(self.max_time_ms).to_list(length=limit)
+
+    def _application_hit(self, document: Dict, pattern: Optional[re.Pattern]) -> Dict:
+        found = []
+        for field in APPLICATION_SNIPPET_FIELDS:
+            found += snippets(document.get(field), pattern, self.snippet_context, self.snippets_per_hit - len(found))
+            if len(found) >= self.snippets_per_hit:
+                break
+        return {"id": str(document["_id"]), "kind": "application", "score": round(document["score"], 4),
+                "title": document.get("position_title"), "subtitle": document.get("company_name"),
+                "status": document.get("status"), "location": document.get("location"),
+                "date": document.get("application_date") or document.get("created_at"), "snippets": found}
+
+    def _resume_hit(self, document: Dict, pattern: Optional[re.Pattern]) -> Dict:
+        return {"id": str(document["_id"]), "kind": "resume", "score": round(document["score"], 4),
+                "title": document.get("filename"), "date": document.get("created_at"),
+                "snippets": snippets(document.get("content"), pattern, self.snippet_context, self.snippets_per_hit)}
@@ -0,0 +1,96 @@
+import math
+import os
+import zlib
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import UpdateOne
+
+from services.ats_scorer import STOPWORDS, stem, tokenize
+
+VECTOR_VERSION = 1
+VECTOR_FIELD = "vector"
+WITHOUT_VECTOR = {VECTOR_FIELD: 0}
+APPLICATION_TEXT_FIELDS = ("position_title", "job_description")
+
+Vector = Tuple[np.ndarray, np.ndarray]
+
+
+def application_text(document: Dict) -> str:
+    return "\n".join(document.get(field) or "" for field in APPLICATION_TEXT_FIELDS)
+
+
+class SemanticIndex:
+    def __init__(self):
+        self.dim = int(os.getenv("SEMANTIC_INDEX_DIM", str(2 ** 18)))
+
+    def terms(self, text: str) -> List[str]:
+        stems = [stem(token) for token in tokenize(text) if
+                 len(token) > 1 and any(c.isalpha() for c in token) and token not in STOPWORDS]
+        stems = [token for token in stems if token not in STOPWORDS]
+        return stems + [f"{a} {b}" for a, b in zip(stems, stems[1:])]
+
+    def encode(self, text: str) -> Vector:
+        counts = Counter(zlib.crc32(term.encode("utf-8")) % self.dim for term in self.terms(text or ""))
+        idx = np.fromiter(counts.keys(), dtype=np.uint32, count=len(counts))
+        val = np.fromiter((1 + math.log(count) for count in counts.values()), dtype=np.float32, count=len(counts))
+        return idx, val
+
+    def vectorize(self, text: str) -> Dict:
+        idx, val = self.encode(text)
+        return {"v": VECTOR_VERSION, "dim": self.dim, "idx": idx.tobytes(), "val": val.tobytes()}
+
+    def unpack(self, vector: Optional[Dict]) -> Optional[Vector]:
+        if not vector or vector.get("v") != VECTOR_VERSION or vector.get("dim") != self.dim:
+            return None
+        return np.frombuffer(vector["idx"], dtype=np.uint32), np.frombuffer(vector["val"], dtype=np.float32)
+
+    async def candidates(self, collection: AsyncIOMotorCollection, query: Dict, projection: Dict,
+                         text_fields: Tuple[str, ...], text: Callable[[Dict], str]) -> List[Tuple[Dict, Vector]]:
+        found, stale = [], []
+        async for document in collection.find(query, {**projection, VECTOR_FIELD: 1}):
+            vector = self.unpack(document.pop(VECTOR_FIELD, None))
+            if vector is None:
+                stale.append(document)
+            elif len(vector[0]):
+                found.append((document, vector))
+        if stale:
+            by_id = {document["_id"]: document for document in stale}
+            updates = []
+            async for document in collection.find({"_id": {"$in": list(by_id)}}, dict.fromkeys(text_fields, 1)):
+                packed = self.vectorize(text(document))
+                updates.append(UpdateOne({"_id": document["_id"]}, {"$set": {VECTOR_FIELD: packed}}))
+                vector = self.unpack(packed)
+                if len(vector[0]):
+                    found.append((by_id[document["_id"]], vector))
+            if updates:
+                await collection.bulk_write(updates, ordered=False)
+        return found
+
+    def rank(self, query_text: str, candidates: List[Tuple[Dict, Vector]], limit: int) -> List[Tuple[Dict, float]]:
+        q_idx, q_val = self.encode(query_text)
+        if not candidates or not len(q_idx):
+            return []
+        n = len(candidates)
+        lengths = np.fromiter((len(idx) for _, (idx, _) in candidates), dtype=np.int64, count=n)
+        rows = np.repeat(np.arange(n), lengths)
+        terms, inverse, df = np.unique(np.concatenate([idx for _, (idx, _) in candidates]), return_inverse=True,
+                                       return_counts=True)
+        val = np.concatenate([val for _, (_, val) in candidates])
+        position = np.minimum(np.searchsorted(terms, q_idx), len(terms) - 1)
+        shared = terms[position] == q_idx
+        df[position[shared]] += 1
+        idf = (np.log((n + 2) / (df + 1)) + 1).astype(np.float32)
+        query = np.zeros(len(terms), dtype=np.float32)
+        query[position[shared]] = q_val[shared] * idf[position[shared]]
+        # Query terms no candidate contains only add to the query norm; their df is the query itself.
+        unseen = q_val[~shared] * np.float32(math.log((n + 2) / 2) + 1)
+        query /= np.sqrt(np.dot(query, query) + np.dot(unseen, unseen))
+        weights = val * idf[inverse]
+        norms = np.sqrt(np.bincount(rows, weights=weights * weights, minlength=n))
+        scores = np.bincount(rows, weights=weights * query[inverse], minlength=n) / np.maximum(norms, 1e-12)
+        top = np.argpartition(-scores, limit - 1)[:limit] if limit < n else np.arange(n)
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(candidates[i][0], float(scores[i])) for i in top if scores[i] > 0]
@@ -0,0 +1,73 @@
+import json
+import os
+from datetime import date, datetime
+from enum import Enum
+from typing import Dict, List, Mapping, Optional, Type
+
+from bson import ObjectId
+from fastapi.responses import Response
+from pydantic import BaseModel, TypeAdapter
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(value):
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json", by_alias=True)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _stringify_ids(document: Dict) -> Dict:
+    return {key: str(value) if isinstance(value, ObjectId) else value for key, value in document.items()}
+
+
+def dumps(content) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, default=_default)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class JSONBytesResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return content if isinstance(content, bytes) else dumps(content)
+
+
+class DocumentSerializer:
+    def __init__(self, model: Type[BaseModel], trusted: Optional[bool] = None):
+        self.model = model
+        if trusted is None:
+            trusted = os.getenv("TRUSTED_READS", "true").lower() in ("1", "true", "yes")
+        self.trusted = trusted
+        self.fields = [(field.alias or name, None if field.is_required() else field.get_default(
+            call_default_factory=True)) for name, field in model.model_fields.items()]
+        self._one = TypeAdapter(model)
+        self._many = TypeAdapter(List[model])
+
+    def shape(self, document: Dict) -> Dict:
+        return {key: document.get(key, default) for key, default in self.fields}
+
+    def dump_many(self, documents: List[Dict]) -> bytes:
+        if self.trusted:
+            return dumps([self.shape(document) for document in documents])
+        return self._many.dump_json(self._many.validate_python([_stringify_ids(document) for document in documents]),
+                                    by_alias=True)
+
+    def dump_one(self, document: Dict) -> bytes:
+        return self._one.dump_json(self._one.validate_python(_stringify_ids(document)), by_alias=True)
+
+    def response(self, documents: List[Dict], headers: Optional[Mapping[str, str]] = None) -> Response:
+        return JSONBytesResponse(self.dump_many(documents), headers=headers)
+
+    def response_one(self, document: Dict, headers: Optional[Mapping[str, str]] = None) -> Response:
+        return JSONBytesResponse(self.dump_one(document), headers=headers)
@@ -0,0 +1,95 @@
+import asyncio
+import json
+
+from benchmarks.fake_model import FAKE_ANALYSIS, FakeGenerativeModel
+from services.ai_service import AIService
+from services.analysis_cache import AnalysisCache
+
+RESUME = "Backend engineer with Python, PostgreSQL and AWS experience."
+JOBS = ["Python backend engineer", "Data engineer with Spark", "Go platform engineer"]
+
+
+class PartlyBrokenModel(FakeGenerativeModel):
+    def __init__(self):
+        super().__init__(latency=0, jitter=0, chunk_delay=0)
+        self.single_calls = 0
+
+    def _respond(self, prompt: str) -> str:
+        if '"results" array' in prompt:
+            return json.dumps({"results": [FAKE_ANALYSIS, {"optimization": {}}, FAKE_ANALYSIS]})
+        self.single_calls += 1
+        return super()._respond(prompt)
+
+
+class ShortPackedModel(PartlyBrokenModel):
+    def _respond(self, prompt: str) -> str:
+        if '"results" array' in prompt:
+            return json.dumps({"results": [FAKE_ANALYSIS]})
+        return super()._respond(prompt)
+
+
+class AlwaysBrokenModel(FakeGenerativeModel):
+    def __init__(self):
+        super().__init__(latency=0, jitter=0, chunk_delay=0)
+
+    def _respond(self, prompt: str) -> str:
+        if '"results" array' in prompt:
+            return json.dumps({"results": [FAKE_ANALYSIS, {"ats": None}]})
+        return json.dumps({"ats": None})
+
+
+def test_packed_analysis_retries_invalid_items_and_caches_valid_ones():
+    async def scenario():
+        model = PartlyBrokenModel()
+        service = AIService(cache=AnalysisCache(), model=model)
+        results = await service.analyze_resume_packed(RESUME, JOBS)
+        assert model.single_calls == 1
+        assert [result["ats"]["score"] for result in results] == [74, 74, 74]
+        for job in JOBS:
+            assert await service.cache.get(service._cache_key(RESUME, job, "full")) is not None
+
+    asyncio.run(scenario())
+
+
+def test_packed_analysis_with_the_wrong_item_count_analyzes_each_item():
+    async def scenario():
+        model = ShortPackedModel()
+        service = AIService(cache=AnalysisCache(), model=model)
+        results = await service.analyze_resume_packed(RESUME, JOBS)
+        assert model.single_calls == len(JOBS)
+        assert [result["cache"] for result in results] == ["miss"] * len(JOBS)
+
+    asyncio.run(scenario())
+
+
+def test_packed_analysis_does_not_cache_items_that_stay_invalid():
+    async def scenario():
+        service = AIService(cache=AnalysisCache(), model=AlwaysBrokenModel())
+        results = await service.analyze_resume_packed(RESUME, JOBS[:2])
+        assert results[0]["cache"] == "miss" and "cache" not in results[1]
+        assert await service.cache.get(service._cache_key(RESUME, JOBS[1], "full")) is None
+
+    asyncio.run(scenario())
+
+
+def test_invalid_single_analysis_is_not_cached():
+    async def scenario():
+        service = AIService(cache=AnalysisCache(), model=AlwaysBrokenModel())
+        await service.analyze_resume(RESUME, JOBS[0])
+        assert await service.cache.get(service._cache_key(RESUME, JOBS[0], "full")) is None
+
+    asyncio.run(scenario())
+
+
+def test_cached_analysis_cannot_be_mutated_by_callers():
+    async def scenario():
+        service = AIService(cache=AnalysisCache(), model=PartlyBrokenModel())
+        first = await service.analyze_resume(RESUME, JOBS[0])
+        first["ats"]["score"] = 0
+        hit = await service.analyze_resume(RESUME, JOBS[0])
+        hit["ats"]["keyword_matches"]["exact"].append("mutated")
+        again = await service.analyze_resume(RESUME, JOBS[0])
+        assert again["cache"] == "hit" and again["ats"]["score"] == 74
+        assert "mutated" not in again["ats"]["keyword_matches"]["exact"]
+
+    asyncio.run(scenario())
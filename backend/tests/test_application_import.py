@@ -0,0 +1,66 @@
+import asyncio
+import io
+from datetime import datetime
+
+import pytest
+
+from services.application_import import ApplicationImporter, ImportFormatError, detect_import_format
+from services.application_stats import ApplicationStats
+from services.semantic_index import SemanticIndex
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+CSV = (b"Company,Position,Status,Application Date\n"
+       b"Acme,Backend Engineer,Applied,2024-03-01T09:00:00+02:00\n"
+       b",Missing Company,applied,\n"
+       b"Globex,Data Engineer,not-a-status,\n"
+       b"Acme,Backend Engineer,applied,2024-03-01T07:00:00Z\n")
+
+
+def run_import(documents, content: bytes, import_format: str, dedupe: bool = False):
+    async def scenario():
+        db = mongomock_motor.AsyncMongoMockClient()["test"]
+        if documents:
+            await db.applications.insert_many(documents)
+        importer = ApplicationImporter(ApplicationStats(), SemanticIndex())
+        summary = await importer.import_file(db, io.BytesIO(content), import_format, dedupe=dedupe)
+        return summary, await db.applications.find({}, {"vector": 0}).to_list(length=None)
+
+    return asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("filename, requested, expected", [("apps.csv", None, "csv"), ("apps.XLSX", None, "xlsx"),
+                                                           ("apps.jsonl", None, "ndjson"),
+                                                           ("export", "json", "ndjson"),
+                                                           ("apps.csv", "xlsx", "xlsx")])
+def test_detect_import_format(filename, requested, expected):
+    assert detect_import_format(filename, requested) == expected
+
+
+def test_detect_import_format_rejects_unknown_formats():
+    with pytest.raises(ImportFormatError):
+        detect_import_format("apps.pdf")
+
+
+def test_bad_rows_are_reported_with_their_row_numbers():
+    summary, stored = run_import([], CSV, "csv")
+    assert (summary["total_rows"], summary["inserted"], summary["failed"]) == (4, 2, 2)
+    assert [error["row"] for error in summary["errors"]] == [3, 4]
+    assert "company_name" in summary["errors"][0]["errors"][0]
+    assert all(document["application_date"].tzinfo is None for document in stored)
+    assert stored[0]["application_date"] == datetime(2024, 3, 1, 7, 0)
+
+
+def test_dedupe_matches_existing_naive_dates_and_repeats_within_the_file():
+    existing = {"company_name": "Acme", "position_title": "Backend Engineer", "status": "applied",
+                "application_date": datetime(2024, 3, 1, 7, 0)}
+    summary, stored = run_import([existing], CSV, "csv", dedupe=True)
+    assert (summary["inserted"], summary["duplicates"], summary["failed"]) == (0, 2, 2)
+    assert len(stored) == 1
+
+
+def test_ndjson_reports_invalid_lines():
+    content = b'{"company_name": "Acme", "position_title": "SRE"}\nnot json\n[1, 2]\n'
+    summary, _ = run_import([], content, "ndjson")
+    assert (summary["inserted"], summary["failed"]) == (1, 2)
+    assert [error["row"] for error in summary["errors"]] == [2, 3]
@@ -0,0 +1,23 @@
+import difflib
+import random
+
+from services.ats_scorer import ATSScorer, _FuzzyVocabulary
+
+
+def test_fuzzy_prefilter_agrees_with_difflib():
+    rng = random.Random(7)
+    alphabet = "abcdefghijklmnop0123+#."
+    words = sorted({"".join(rng.choices(alphabet, k=rng.randint(2, 12))) for _ in range(600)})
+    vocabulary = _FuzzyVocabulary(words, 0.8)
+    tokens = [word[:-1] + rng.choice(alphabet) for word in words[:150]] + ["".join(rng.choices(alphabet, k=8)) for
+                                                                             _ in range(150)]
+    for token in tokens:
+        assert vocabulary.has_close_match(token) == bool(difflib.get_close_matches(token, words, 1, 0.8)), token
+
+
+def test_misspelled_skill_counts_as_partial_match():
+    report = ATSScorer().score("Built services with Postgres and Python.",
+                               "PostgreSQL and Python required. PostgreSQL replicas on AWS.")
+    assert "python" in report["exact"]
+    assert "postgresql" in report["partial"]
+    assert "aws" in report["missing"]
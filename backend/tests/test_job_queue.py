@@ -0,0 +1,107 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from services.ai_service import AIService
+from services.job_queue import JobQueue, JobWorkerPool
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+
+def run(scenario):
+    async def with_db():
+        await scenario(JobQueue(), mongomock_motor.AsyncMongoMockClient()["test"])
+
+    asyncio.run(with_db())
+
+
+async def expire(db, job):
+    await db.jobs.update_one({"_id": job["_id"]}, {"$set": {"lease_until": datetime.utcnow() - timedelta(seconds=1)}})
+
+
+def test_requeue_expired_fails_jobs_out_of_attempts():
+    async def scenario(queue, db):
+        queue.max_attempts = 2
+        job = await queue.submit(db, "analysis", {})
+        for attempt in range(2):
+            claimed = await queue.claim(db, "worker")
+            assert claimed["_id"] == job["_id"] and claimed["attempts"] == attempt + 1
+            await expire(db, claimed)
+            assert await queue.requeue_expired(db) == (1 if attempt == 0 else 0)
+        stored = await db.jobs.find_one({"_id": job["_id"]})
+        assert stored["status"] == "failed" and "Lease expired" in stored["error"]
+        assert await queue.claim(db, "worker") is None
+
+    run(scenario)
+
+
+def test_claim_enforces_tenant_cap_across_workers():
+    async def scenario(queue, db):
+        queue.tenant_max_running = 2
+        for _ in range(4):
+            await queue.submit(db, "analysis", {}, tenant="acme")
+        other = await queue.submit(db, "analysis", {}, tenant="globex")
+        claimed = await asyncio.gather(*(queue.claim(db, f"worker-{i}") for i in range(5)))
+        tenants = sorted(job["tenant"] for job in claimed if job is not None)
+        assert tenants == ["acme", "acme", "globex"]
+        assert (await db.job_tenants.find_one({"_id": "acme"}))["running"] == 2
+
+        acme = next(job for job in claimed if job is not None and job["tenant"] == "acme")
+        await queue.complete(db, acme, acme["worker_id"], {})
+        await queue.complete(db, acme, acme["worker_id"], {})
+        assert (await db.job_tenants.find_one({"_id": "acme"}))["running"] == 1
+        assert (await queue.claim(db, "worker-5"))["tenant"] == "acme"
+        assert await queue.claim(db, "worker-6") is None
+        assert other["_id"] in {job["_id"] for job in claimed if job is not None}
+
+    run(scenario)
+
+
+def test_submit_between_claim_and_wait_is_not_lost():
+    async def scenario(queue, db):
+        assert await queue.claim(db, "worker") is None
+        await queue.submit(db, "analysis", {})
+        started = asyncio.get_running_loop().time()
+        await queue.wait_for_work(5)
+        assert asyncio.get_running_loop().time() - started < 1
+        assert await queue.claim(db, "worker") is not None
+
+    run(scenario)
+
+
+def test_reaper_resets_a_leaked_tenant_slot():
+    async def scenario(queue, db):
+        queue.tenant_max_running = 1
+        await queue.submit(db, "analysis", {}, tenant="acme")
+        assert await queue._reserve_slot(db, "acme")
+        assert await queue.claim(db, "worker") is None
+        assert await queue.reconcile_tenants(db) == 0
+        assert await queue.reconcile_tenants(db) == 1
+        assert (await queue.claim(db, "worker"))["tenant"] == "acme"
+        assert await queue.reconcile_tenants(db) == 0
+
+    run(scenario)
+
+
+class InvalidArgument(Exception):
+    code = 400
+
+
+class RejectingModel:
+    async def generate_content_async(self, prompt, **kwargs):
+        raise InvalidArgument("Invalid argument.")
+
+
+def test_cover_letter_job_fails_when_generation_errors():
+    async def scenario(queue, db):
+        resume = await db.resumes.insert_one({"content": "Python engineer"})
+        job = await queue.submit(db, "cover_letter", {"resume_id": str(resume.inserted_id), "job_description": "JD",
+                                                      "company_name": "Acme", "position_title": "Engineer"})
+        pool = JobWorkerPool(queue, AIService(model=RejectingModel()))
+        claimed = await queue.claim(db, "worker")
+        await pool._process(db, claimed, "worker")
+        stored = await db.jobs.find_one({"_id": job["_id"]})
+        assert stored["status"] == "failed" and "Invalid argument" in stored["error"]
+
+    run(scenario)
@@ -0,0 +1,116 @@
+import asyncio
+
+import pytest
+
+from services.llm_client import CircuitBreaker, LLMTimeoutError, ResilientModelClient
+
+
+class StallingModel:
+    async def generate_content_async(self, prompt, stream=False, **kwargs):
+        async def chunks():
+            yield "first"
+            await asyncio.sleep(10)
+            yield "never"
+
+        return chunks()
+
+
+class InvalidArgument(Exception):
+    code = 400
+
+
+class RejectingModel:
+    async def generate_content_async(self, prompt, **kwargs):
+        raise InvalidArgument("Invalid argument.")
+
+
+def test_stream_times_out_when_a_chunk_stalls():
+    async def scenario():
+        client = ResilientModelClient(StallingModel())
+        client.timeout = 0.2
+        received = []
+        with pytest.raises(LLMTimeoutError):
+            async for chunk in client.stream("prompt"):
+                received.append(chunk)
+        assert received == ["first"]
+        assert client.counters["timeouts"] == 1 and client.in_flight == 0
+
+    asyncio.run(scenario())
+
+
+def test_non_transient_error_leaves_breaker_state_alone():
+    async def scenario():
+        client = ResilientModelClient(RejectingModel())
+        client.breaker.failures = 2
+        with pytest.raises(InvalidArgument):
+            await client.generate("prompt")
+        assert (client.breaker.state, client.breaker.failures) == (CircuitBreaker.CLOSED, 2)
+
+        client.breaker.state, client.breaker.opened_at = CircuitBreaker.OPEN, 0.0
+        with pytest.raises(InvalidArgument):
+            await client.generate("prompt")
+        assert client.breaker.state == CircuitBreaker.HALF_OPEN and client.breaker.allow()
+
+    asyncio.run(scenario())
+
+
+class FastModel:
+    async def generate_content_async(self, prompt, stream=False, **kwargs):
+        if not stream:
+            return "ok"
+
+        async def chunks():
+            yield "ok"
+
+        return chunks()
+
+
+def half_open_client() -> ResilientModelClient:
+    client = ResilientModelClient(FastModel())
+    client.breaker.state, client.breaker.opened_at = CircuitBreaker.OPEN, 0.0
+    return client
+
+
+async def exhaust_slots(client: ResilientModelClient):
+    for _ in range(client.max_concurrency):
+        await client._semaphore.acquire()
+
+
+async def consume(stream):
+    return [chunk async for chunk in stream]
+
+
+@pytest.mark.parametrize("call", [lambda client: client.generate("prompt"),
+                                  lambda client: consume(client.stream("prompt"))])
+def test_half_open_probe_is_released_when_waiting_for_a_slot_times_out(call):
+    async def scenario():
+        client = half_open_client()
+        client.timeout = 0.05
+        await exhaust_slots(client)
+        with pytest.raises(LLMTimeoutError):
+            await call(client)
+        for _ in range(client.max_concurrency):
+            client._semaphore.release()
+        assert client.breaker.state == CircuitBreaker.HALF_OPEN
+        await call(client)
+        assert client.breaker.state == CircuitBreaker.CLOSED
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("call", [lambda client: client.generate("prompt"),
+                                  lambda client: consume(client.stream("prompt"))])
+def test_half_open_probe_is_released_when_cancelled_waiting_for_a_slot(call):
+    async def scenario():
+        client = half_open_client()
+        await exhaust_slots(client)
+        task = asyncio.ensure_future(call(client))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        for _ in range(client.max_concurrency):
+            client._semaphore.release()
+        await call(client)
+        assert client.breaker.state == CircuitBreaker.CLOSED
+
+    asyncio.run(scenario())
@@ -0,0 +1,42 @@
+from services.prompt_compactor import JOB_SECTION_PRIORITIES, PromptCompactor, _heading
+
+DENTAL_POSTING = """Dental Assistant
+Requirements:
+- Certified dental assistant with 2+ years of chairside experience
+- Dental radiography certification
+- Comfortable with PTO scheduling for the front desk
+- Must pass a background check
+- CPR certification
+Benefits:
+- Medical, dental and vision insurance
+- Paid time off and paid parental leave
+We are an equal opportunity employer and consider applicants without regard to race or religion."""
+
+
+def test_all_caps_skills_are_kept():
+    resume = "JANE DOE\nSKILLS\nPYTHON JAVA SQL\nAWS\nGCP\nEXPERIENCE\n- Built data pipelines"
+    compacted = PromptCompactor().resume(resume, budget=1000)
+    for line in ("PYTHON JAVA SQL", "AWS", "GCP", "SKILLS", "- Built data pipelines"):
+        assert line in compacted.splitlines()
+
+
+def test_all_caps_content_is_not_a_heading():
+    assert _heading("PYTHON JAVA SQL", JOB_SECTION_PRIORITIES) is None
+    assert _heading("AWS", JOB_SECTION_PRIORITIES) is None
+    assert _heading("Requirements:", JOB_SECTION_PRIORITIES) == "requirements"
+
+
+def test_under_budget_input_is_unchanged():
+    compacted = PromptCompactor().job_description(DENTAL_POSTING, budget=1000)
+    assert compacted.splitlines() == [line.strip() for line in DENTAL_POSTING.splitlines()]
+
+
+def test_dental_posting_keeps_requirements_when_trimmed():
+    compacted = PromptCompactor().job_description(DENTAL_POSTING, budget=80)
+    lines = compacted.splitlines()
+    for requirement in ("- Certified dental assistant with 2+ years of chairside experience",
+                        "- Dental radiography certification", "- Comfortable with PTO scheduling for the front desk",
+                        "- Must pass a background check", "- CPR certification"):
+        assert requirement in lines
+    assert "- Medical, dental and vision insurance" not in lines
+    assert not any("equal opportunity" in line for line in lines)
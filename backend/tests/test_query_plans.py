@@ -0,0 +1,35 @@
+import asyncio
+import os
+import uuid
+
+import pytest
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import ServerSelectionTimeoutError
+
+from database import create_indexes
+from scripts.check_query_plans import explain_all
+
+
+async def explain_scratch_database():
+    client = AsyncIOMotorClient(os.getenv("MONGO_URI", "mongodb://localhost:27017"), serverSelectionTimeoutMS=1000)
+    try:
+        try:
+            await client.admin.command("ping")
+        except ServerSelectionTimeoutError:
+            return None
+        db = client[f"query_plans_{uuid.uuid4().hex[:8]}"]
+        try:
+            await create_indexes(db)
+            return await explain_all(db)
+        finally:
+            await client.drop_database(db.name)
+    finally:
+        client.close()
+
+
+def test_no_query_shape_scans_a_collection():
+    plans = asyncio.run(explain_scratch_database())
+    if plans is None:
+        pytest.skip("No MongoDB server reachable at MONGO_URI")
+    scans = [f"{name} on {collection}" for name, collection, stages in plans if "COLLSCAN" in stages]
+    assert not scans
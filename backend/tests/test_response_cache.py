@@ -0,0 +1,113 @@
+import asyncio
+import io
+
+import pytest
+from fastapi.responses import Response
+from starlette.requests import Request
+
+from services import response_cache as response_cache_module
+from services.response_cache import CollectionVersions, ResponseCache, _matches
+
+APPLICATION = {"company_name": "Acme", "position_title": "Backend Engineer", "status": "applied"}
+
+
+class StaticVersions(CollectionVersions):
+    async def get(self, db, names):
+        return dict.fromkeys(names, 0)
+
+
+def get_request(path="/api/applications", if_none_match=None):
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "path": path, "query_string": b"", "headers": headers})
+
+
+@pytest.mark.parametrize("if_none_match, matches", [
+    (None, False),
+    ("", False),
+    ('W/"abc"', True),
+    ('"abc"', True),
+    ('"other", W/"abc"', True),
+    ('"other",W/"abc"', True),
+    ('"other"', False),
+    ("*", True),
+])
+def test_matches_weak_etags_lists_and_wildcard(if_none_match, matches):
+    assert _matches(if_none_match, 'W/"abc"') is matches
+
+
+def test_hit_miss_and_expiry(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(response_cache_module.time, "monotonic", lambda: now[0])
+    cache = ResponseCache(StaticVersions())
+    cache.ttl = 30
+    builds = []
+
+    async def build():
+        builds.append(1)
+        return Response(b"[]", media_type="application/json")
+
+    async def scenario():
+        first = await cache.respond(get_request(), None, ["applications"], build)
+        second = await cache.respond(get_request(), None, ["applications"], build)
+        now[0] += 31
+        third = await cache.respond(get_request(), None, ["applications"], build)
+        return first, second, third
+
+    first, second, third = asyncio.run(scenario())
+    assert len(builds) == 2
+    assert first.body == second.body == third.body == b"[]"
+    assert second.headers["content-type"] == "application/json"
+    assert first.headers["etag"] == second.headers["etag"] == third.headers["etag"]
+
+
+def test_if_none_match_returns_304_without_building():
+    cache = ResponseCache(StaticVersions())
+    etag = ResponseCache.etag(get_request(), {"applications": 0})
+
+    async def build():
+        raise AssertionError("a matching ETag must not build the response")
+
+    response = asyncio.run(cache.respond(get_request(if_none_match=etag), None, ["applications"], build))
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+
+
+async def create(client, application_id):
+    return await client.post("/api/applications", json=APPLICATION)
+
+
+async def update(client, application_id):
+    return await client.put(f"/api/applications/{application_id}", json={"status": "offer"})
+
+
+async def delete(client, application_id):
+    return await client.delete(f"/api/applications/{application_id}")
+
+
+async def import_csv(client, application_id):
+    body = b"company_name,position_title,status\nGlobex,Data Engineer,applied\n"
+    return await client.post("/api/applications/import", files={"file": ("applications.csv", io.BytesIO(body))})
+
+
+@pytest.mark.parametrize("write", [create, update, delete, import_csv])
+def test_every_write_invalidates_the_application_list(write):
+    httpx = pytest.importorskip("httpx")
+    mongomock_motor = pytest.importorskip("mongomock_motor")
+    import main
+
+    async def scenario():
+        main.app.mongodb = mongomock_motor.AsyncMongoMockClient()["response_cache_test"]
+        main.response_cache._entries.clear()
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://test") as client:
+            application_id = (await client.post("/api/applications", json=APPLICATION)).json()["_id"]
+            listed = await client.get("/api/applications")
+            etag = listed.headers["etag"]
+            assert (await client.get("/api/applications", headers={"If-None-Match": etag})).status_code == 304
+
+            assert (await write(client, application_id)).status_code == 200
+            after = await client.get("/api/applications", headers={"If-None-Match": etag})
+            assert after.status_code == 200
+            assert after.headers["etag"] != etag
+            assert after.json() != listed.json()
+
+    asyncio.run(scenario())
@@ -0,0 +1,55 @@
+import asyncio
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from services.resume_service import ParserUnavailableError, ResumeParseError, ResumeService, parse_resume_bytes
+
+
+class CrashedPool:
+    def submit(self, *args):
+        future = Future()
+        future.set_exception(BrokenProcessPool("worker died"))
+        return future
+
+    def shutdown(self, **kwargs):
+        pass
+
+
+@pytest.mark.parametrize("filename, content", [("resume.pdf", b"%PDF-1.4 not really a pdf"),
+                                               ("resume.docx", b"not a zip archive"),
+                                               ("resume.txt", b"plain text")])
+def test_unreadable_files_raise_resume_parse_error(filename, content):
+    with pytest.raises(ResumeParseError):
+        parse_resume_bytes(content, filename, max_pages=20)
+
+
+def test_parser_errors_cross_the_process_pool_as_resume_parse_error():
+    async def scenario():
+        service = ResumeService()
+        service.max_workers = 1
+        try:
+            with pytest.raises(ResumeParseError, match="PdfReadError"):
+                await service.parse_resume(b"%PDF-1.4 not really a pdf", "resume.pdf")
+        finally:
+            service.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_crashed_worker_is_a_server_error_and_rebuilds_the_pool():
+    async def scenario():
+        service = ResumeService()
+        service.executor_kind = "thread"
+        crashed = service._executor = CrashedPool()
+        try:
+            with pytest.raises(ParserUnavailableError):
+                await service.parse_resume(b"%PDF-1.4 not really a pdf", "resume.pdf")
+            assert service._executor is not crashed
+            with pytest.raises(ResumeParseError, match="PdfReadError"):
+                await service.parse_resume(b"%PDF-1.4 not really a pdf", "resume.pdf")
+        finally:
+            service.shutdown()
+
+    asyncio.run(scenario())
@@ -0,0 +1,46 @@
+import asyncio
+
+from bson import ObjectId
+
+from services.search_service import SearchService
+
+
+class FakeCursor:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def sort(self, _):
+        return FakeCursor(sorted(self.documents, key=lambda document: document["score"], reverse=True))
+
+    def limit(self, limit):
+        return FakeCursor(self.documents[:limit])
+
+    def max_time_ms(self, _):
+        return self
+
+    async def to_list(self, length):
+        return [dict(document) for document in self.documents[:length]]
+
+
+class FakeCollection:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def find(self, query, projection):
+        return FakeCursor(self.documents)
+
+
+class FakeDatabase:
+    def __init__(self, applications, resumes):
+        self.applications = FakeCollection(applications)
+        self.resumes = FakeCollection(resumes)
+
+
+def test_scores_are_normalized_per_collection_before_merging():
+    applications = [{"_id": ObjectId(), "score": score, "position_title": f"Python role {score}"} for score in
+                    (12.0, 6.0)]
+    resumes = [{"_id": ObjectId(), "score": score, "filename": f"python-{score}.pdf", "content": "Python"} for score in
+               (1.5, 1.2)]
+    result = asyncio.run(SearchService().search(FakeDatabase(applications, resumes), "python"))
+    assert [(hit["kind"], hit["score"]) for hit in result["hits"]] == [
+        ("application", 1.0), ("resume", 1.0), ("resume", 0.8), ("application", 0.5)]
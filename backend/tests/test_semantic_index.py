@@ -0,0 +1,35 @@
+import numpy as np
+
+from services.semantic_index import SemanticIndex
+
+DOCUMENTS = ["Python backend engineer building REST APIs on AWS", "Frontend developer with React and TypeScript",
+             "Data engineer running Spark and Kafka pipelines", "Backend Python services with PostgreSQL and Kafka"]
+
+
+def dense_scores(index: SemanticIndex, query: str, candidates) -> np.ndarray:
+    vectors = np.zeros((len(candidates), index.dim))
+    for row, (_, (idx, val)) in enumerate(candidates):
+        vectors[row, idx] = val
+    q_idx, q_val = index.encode(query)
+    query_vector = np.zeros(index.dim)
+    query_vector[q_idx] = q_val
+    idf = np.log((len(candidates) + 2) / ((vectors > 0).sum(0) + (query_vector > 0) + 1)) + 1
+    vectors, query_vector = vectors * idf, query_vector * idf
+    return vectors @ query_vector / np.linalg.norm(vectors, axis=1) / np.linalg.norm(query_vector)
+
+
+def test_rank_matches_dense_cosine_similarity():
+    index = SemanticIndex()
+    index.dim = 4096
+    candidates = [({"_id": i}, index.encode(text)) for i, text in enumerate(DOCUMENTS)]
+    query = "Senior Python backend engineer, Kafka and Kubernetes"
+    expected = dense_scores(index, query, candidates)
+    ranked = index.rank(query, candidates, limit=3)
+    assert [document["_id"] for document, _ in ranked] == list(np.argsort(-expected, kind="stable")[:3])
+    assert np.allclose([score for _, score in ranked], np.sort(expected)[::-1][:3], atol=1e-5)
+
+
+def test_rank_ignores_candidates_without_shared_terms():
+    index = SemanticIndex()
+    candidates = [({"_id": i}, index.encode(text)) for i, text in enumerate(DOCUMENTS)]
+    assert [document["_id"] for document, _ in index.rank("React TypeScript", candidates, limit=10)] == [1]
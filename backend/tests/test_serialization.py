@@ -0,0 +1,48 @@
+import json
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+
+import main
+from services.serialization import DocumentSerializer
+
+CREATED = datetime(2024, 5, 1, 12, 30, 45, 123456)
+APPLICATION = {"_id": ObjectId(), "company_name": "Acme", "position_title": "Backend Engineer",
+               "application_url": "https://acme.example/jobs/1", "resume_id": None, "cover_letter_id": None,
+               "status": "interview_scheduled", "salary_range": "100k", "location": "Remote",
+               "application_date": CREATED, "interview_date": None, "follow_up_date": None, "created_at": CREATED,
+               "updated_at": CREATED, "job_description": "Python, MongoDB", "notes": "Referred"}
+DOCUMENTS = {
+    "ResumeSummary": {"_id": ObjectId(), "filename": "resume.pdf", "created_at": CREATED},
+    "ResumeResponse": {"_id": ObjectId(), "filename": "resume.pdf", "created_at": CREATED, "content": "Python",
+                       "duplicate": False},
+    "ApplicationSummary": {key: value for key, value in APPLICATION.items() if key not in ("job_description", "notes")},
+    "ApplicationResponse": APPLICATION,
+    "DashboardResponse": {"total_applications": 1, "status_breakdown": [{"status": "applied", "count": 1}],
+                          "recent_applications": [{key: str(value) if key == "_id" else value for key, value in
+                                                   APPLICATION.items() if key not in ("job_description", "notes")}],
+                          "avg_response_time": None, "interview_rate": 12.5,
+                          "success_metrics": {"offer_rate": 0.0}},
+    "SearchResponse": {"query": "python", "hits": [
+        {"id": str(ObjectId()), "kind": "application", "score": 0.5, "title": "Backend Engineer", "subtitle": "Acme",
+         "status": "offer", "location": "Remote", "date": CREATED, "snippets": ["<mark>Python</mark> backend"]}],
+                       "offset": 0, "limit": 20, "next_offset": None},
+}
+SERIALIZERS = {name: value for name, value in vars(main).items() if isinstance(value, DocumentSerializer)}
+
+
+@pytest.mark.parametrize("name", sorted(SERIALIZERS))
+def test_trusted_and_validated_output_are_byte_identical(name):
+    model = SERIALIZERS[name].model
+    document = DOCUMENTS[model.__name__]
+    trusted = DocumentSerializer(model, trusted=True).dump_many([document])
+    validated = DocumentSerializer(model, trusted=False).dump_many([document])
+    assert trusted == validated
+
+
+def test_validated_path_accepts_a_raw_object_id():
+    document = DOCUMENTS["ResumeSummary"]
+    serializer = DocumentSerializer(main.resume_summaries.model, trusted=False)
+    assert json.loads(serializer.dump_many([document]))[0]["_id"] == str(document["_id"])
+    assert json.loads(serializer.dump_one(document))["_id"] == str(document["_id"])
@@ -0,0 +1,46 @@
+import asyncio
+
+from services.single_flight import SingleFlight
+
+
+def test_last_waiter_cancelling_forgets_the_call():
+    async def scenario():
+        flight = SingleFlight()
+        started = asyncio.Event()
+
+        async def slow():
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            finally:
+                await asyncio.sleep(0.05)
+            return "stale"
+
+        async def fast():
+            return "fresh"
+
+        waiter = asyncio.ensure_future(flight.do("key", slow))
+        await started.wait()
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        assert flight.in_flight == 0
+        assert await flight.do("key", fast) == "fresh"
+
+    asyncio.run(scenario())
+
+
+def test_concurrent_callers_share_one_call():
+    async def scenario():
+        flight = SingleFlight()
+        calls = []
+
+        async def work():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return len(calls)
+
+        results = await asyncio.gather(*(flight.do("key", work) for _ in range(5)))
+        assert results == [1] * 5
+        assert (flight.started, flight.coalesced, flight.in_flight) == (1, 4, 0)
+
+    asyncio.run(scenario())
@@ -1,5 +1,6 @@
-import React, {useEffect, useRef, useState} from "react";
+import React, {useRef, useState} from "react";
 import api from "../utils/axios";
+import {PAGE_SIZE, usePaginatedList} from "../utils/pagination";
 import {Resume} from "../types/resume";
 import type {FormData} from "../types/coverLetter";
 import {ClipboardCopy, FileText, Wand2} from "lucide-react";
@@ -10,10 +11,12 @@ const tones = [{label: "professional", emoji: "💼"}, {label: "friendly", emoji
 }, {label: "formal", emoji: "🎩"}, {label: "confident", emoji: "🚀"},];
 
 const CoverLetterForm: React.FC = () => {
-    const [resumes, setResumes] = useState<Resume[]>([]);
+    const {
+        items: resumes, hasMore, loadingMore, loadMore,
+    } = usePaginatedList<Resume>("/resumes", PAGE_SIZE, (err) => console.error("Error loading resumes:", err));
     const [coverLetter, setCoverLetter] = useState<string | null>(null);
     const [copied, setCopied] = useState(false);
-    const [loading, setLoading] = useState(true);
+    const [loading, setLoading] = useState(false);
     const resultRef = useRef<HTMLDivElement>(null);
 
     const {
@@ -22,22 +25,6 @@ const CoverLetterForm: React.FC = () => {
 
     const selectedTone = watch("tone");
 
-    const fetchResumes = async () => {
-        try {
-            setLoading(true);
-            const {data} = await api.get("/resumes");
-            setResumes(data);
-        } catch (err) {
-            console.error("Error loading resumes:", err);
-        } finally {
-            setLoading(false);
-        }
-    };
-
-    useEffect(() => {
-        fetchResumes();
-    }, []);
-
     const onSubmit = async (data: FormData) => {
         try {
             setCoverLetter(null);
@@ -120,6 +107,14 @@ const CoverLetterForm: React.FC = () => {
                             {filename}
                         </option>))}
                     </select>
+                    {hasMore && (<button
+                        type="button"
+                        onClick={loadMore}
+                        disabled={loadingMore}
+                        className="mt-2 text-sm font-medium text-indigo-600 hover:text-indigo-700 disabled:opacity-50"
+                    >
+                        {loadingMore ? "Loading..." : "Load more resumes"}
+                    </button>)}
                 </div>
 
                 <div>
@@ -1,6 +1,8 @@
 import React, {useEffect, useState} from "react";
 import api from "../utils/axios";
+import {PAGE_SIZE, usePaginatedList} from "../utils/pagination";
 import {Application} from "../types/application";
+import type {DashboardMetrics} from "../types/dashboard";
 import ApplicationCard from "../components/ApplicationCard";
 import ApplicationModal from "../components/NewApplicationModal";
 import ApplicationDetailsModal from "../components/ApplicationDetailsModal";
@@ -39,28 +41,28 @@ const STATUS_CONFIG = {
 };
 
 const ApplicationTrackerPage: React.FC = () => {
-    const [applications, setApplications] = useState<Application[]>([]);
-    const [loading, setLoading] = useState(false);
+    const {
+        items, setItems: setApplications, hasMore, loadingMore, reload, loadMore,
+    } = usePaginatedList<Application>("/applications", PAGE_SIZE, () => toast.error("Failed to load applications"));
+    const applications = React.useMemo(() => items.map((app) => ({...app, id: app._id})), [items]);
+    const [totals, setTotals] = useState<Record<string, number>>({});
     const [showModal, setShowModal] = useState(false);
     const [selectedApp, setSelectedApp] = useState<Application | null>(null);
     const [detailsApp, setDetailsApp] = useState<Application | null>(null);
     const [searchQuery, setSearchQuery] = useState("");
     const [downloadLoading, setDownloadLoading] = useState(false);
 
-    const fetchApplications = async () => {
-        setLoading(true);
+    const fetchTotals = async () => {
         try {
-            const {data} = await api.get<Application[]>("/applications");
-            setApplications(data.map((app) => ({...app, id: app._id})));
+            const {data} = await api.get<DashboardMetrics>("/analytics/dashboard");
+            setTotals(Object.fromEntries(data.status_breakdown.map(({status, count}) => [status, count])));
         } catch {
-            toast.error("Failed to load applications");
-        } finally {
-            setLoading(false);
+            setTotals({});
         }
     };
 
     useEffect(() => {
-        fetchApplications();
+        fetchTotals();
     }, []);
 
     const openAddModal = () => {
@@ -68,15 +70,24 @@ const ApplicationTrackerPage: React.FC = () => {
         setShowModal(true);
     };
 
-    const openEditModal = (app: Application) => {
-        setSelectedApp(app);
-        setShowModal(true);
+    const fetchApplicationDetails = async (app: Application) => {
+        const {data} = await api.get<Application>(`/applications/${app.id}`);
+        return {...data, id: data._id};
+    };
+
+    const openEditModal = async (app: Application) => {
+        try {
+            setSelectedApp(await fetchApplicationDetails(app));
+            setShowModal(true);
+        } catch {
+            toast.error("Failed to load application");
+        }
     };
 
     const closeModal = () => setShowModal(false);
 
     const onSuccess = async () => {
-        await fetchApplications();
+        await Promise.all([reload(), fetchTotals()]);
         closeModal();
     };
 
@@ -84,7 +95,8 @@ const ApplicationTrackerPage: React.FC = () => {
         try {
             await api.delete(`/applications/${id}`);
             toast.success("Application deleted");
-            setApplications((apps) => apps.filter((app) => app.id !== id));
+            setApplications((apps) => apps.filter((app) => app._id !== id));
+            fetchTotals();
         } catch {
             toast.error("Failed to delete application");
         }
@@ -118,10 +130,16 @@ const ApplicationTrackerPage: React.FC = () => {
         setApplications(reorderedApps);
     };
 
-    const openDetails = (app: Application) => setDetailsApp(app);
+    const openDetails = async (app: Application) => {
+        try {
+            setDetailsApp(await fetchApplicationDetails(app));
+        } catch {
+            toast.error("Failed to load application");
+        }
+    };
     const closeDetails = () => setDetailsApp(null);
 
-    const counts = React.useMemo(() => Object.fromEntries(STATUSES.map((status) => [status, applications.filter((app) => app.status === status).length,])), [applications]);
+    const counts = React.useMemo(() => Object.fromEntries(STATUSES.map((status) => [status, totals[status] ?? applications.filter((app) => app.status === status).length,])), [applications, totals]);
 
     const downloadExcel = async () => {
         setDownloadLoading(true);
@@ -239,6 +257,16 @@ const ApplicationTrackerPage: React.FC = () => {
             </div>
         </DndContext>
 
+        {hasMore && (<div className="mt-8 flex justify-center">
+            <button
+                onClick={loadMore}
+                disabled={loadingMore}
+                className="px-6 py-3 bg-white dark:bg-gray-800 border-2 border-gray-200 dark:border-gray-700 rounded-xl font-semibold shadow-sm hover:shadow-md transition disabled:opacity-50 disabled:cursor-not-allowed"
+            >
+                {loadingMore ? "Loading..." : "Load more applications"}
+            </button>
+        </div>)}
+
         {showModal && (<ApplicationModal
             app={selectedApp ?? undefined}
             onClose={closeModal}
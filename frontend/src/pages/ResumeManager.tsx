@@ -1,26 +1,19 @@
 import React, {ChangeEvent, useEffect, useState} from "react";
-import api from "../utils/axios";
+import {PAGE_SIZE, usePaginatedList} from "../utils/pagination";
 import {Resume} from "../types/resume";
 import ResumeUploader from "../components/ResumeUploader";
 import ResumeCard from "../components/ResumeCard";
 import {ChevronDown, FileText, Upload} from "lucide-react";
 
 const ResumeManager: React.FC = () => {
-    const [resumes, setResumes] = useState<Resume[]>([]);
+    const {
+        items: resumes, hasMore, loading, loadingMore, reload, loadMore,
+    } = usePaginatedList<Resume>("/resumes", PAGE_SIZE, (error) => console.error("Error loading resumes:", error));
     const [selectedResumeId, setSelectedResumeId] = useState<string | null>(null);
-    const [loading, setLoading] = useState(true);
 
     const fetchResumes = async () => {
-        setLoading(true);
-        try {
-            const {data} = await api.get("/resumes");
-            setResumes(data);
-            setSelectedResumeId(data.length ? data[0]._id : null);
-        } catch (error) {
-            console.error("Error loading resumes:", error);
-        } finally {
-            setLoading(false);
-        }
+        const data = await reload();
+        setSelectedResumeId(data.length ? data[0]._id : null);
     };
 
     const handleSelect = (e: ChangeEvent<HTMLSelectElement>) => {
@@ -28,8 +21,10 @@ const ResumeManager: React.FC = () => {
     };
 
     useEffect(() => {
-        fetchResumes();
-    }, []);
+        if (!resumes.some(r => r._id === selectedResumeId)) {
+            setSelectedResumeId(resumes.length ? resumes[0]._id : null);
+        }
+    }, [resumes, selectedResumeId]);
 
     const selectedResume = resumes.find(r => r._id === selectedResumeId) || null;
 
@@ -75,7 +70,7 @@ const ResumeManager: React.FC = () => {
                     <div className="flex justify-between items-center mb-4">
                         <h2 className="text-xl font-semibold">Choose a Resume</h2>
                         <span className="text-sm text-slate-600 dark:text-slate-400">
-                  {resumes.length} uploaded
+                  {resumes.length}{hasMore ? "+" : ""} uploaded
                 </span>
                     </div>
                     <div className="relative">
@@ -93,6 +88,14 @@ const ResumeManager: React.FC = () => {
                             <ChevronDown className="w-5 h-5"/>
                         </div>
                     </div>
+                    {hasMore && (<button
+                        type="button"
+                        onClick={loadMore}
+                        disabled={loadingMore}
+                        className="mt-3 text-sm font-medium text-indigo-600 hover:text-indigo-700 disabled:opacity-50"
+                    >
+                        {loadingMore ? "Loading..." : "Load more resumes"}
+                    </button>)}
                 </div>
 
                 {selectedResume ? (<ResumeCard resume={selectedResume}/>) : (<div
@@ -2,6 +2,6 @@ export interface Resume {
 
     _id: string;
     filename: string;
-    content: string;
+    content?: string;
     created_at: string;
 }
@@ -0,0 +1,59 @@
+import {useCallback, useEffect, useRef, useState} from "react";
+import api from './axios';
+
+export const PAGE_SIZE = 50;
+
+export interface Page<T> {
+    items: T[];
+    nextCursor: string | null;
+}
+
+export const fetchPage = async <T, >(url: string, cursor: string | null = null, limit: number = PAGE_SIZE,
+                                     params: Record<string, unknown> = {}): Promise<Page<T>> => {
+    const response = await api.get<T[]>(url, {params: {...params, limit, ...(cursor ? {cursor} : {})}});
+    return {items: response.data, nextCursor: response.headers['x-next-cursor'] || null};
+};
+
+export const usePaginatedList = <T, >(url: string, limit: number = PAGE_SIZE, onError?: (error: unknown) => void) => {
+    const [items, setItems] = useState<T[]>([]);
+    const [nextCursor, setNextCursor] = useState<string | null>(null);
+    const [loading, setLoading] = useState(true);
+    const [loadingMore, setLoadingMore] = useState(false);
+    const onErrorRef = useRef(onError);
+    onErrorRef.current = onError;
+
+    const reload = useCallback(async (): Promise<T[]> => {
+        setLoading(true);
+        try {
+            const page = await fetchPage<T>(url, null, limit);
+            setItems(page.items);
+            setNextCursor(page.nextCursor);
+            return page.items;
+        } catch (error) {
+            onErrorRef.current?.(error);
+            return [];
+        } finally {
+            setLoading(false);
+        }
+    }, [url, limit]);
+
+    const loadMore = useCallback(async () => {
+        if (!nextCursor || loadingMore) return;
+        setLoadingMore(true);
+        try {
+            const page = await fetchPage<T>(url, nextCursor, limit);
+            setItems((current) => [...current, ...page.items]);
+            setNextCursor(page.nextCursor);
+        } catch (error) {
+            onErrorRef.current?.(error);
+        } finally {
+            setLoadingMore(false);
+        }
+    }, [url, limit, nextCursor, loadingMore]);
+
+    useEffect(() => {
+        reload();
+    }, [reload]);
+
+    return {items, setItems, hasMore: nextCursor !== null, loading, loadingMore, reload, loadMore};
+};